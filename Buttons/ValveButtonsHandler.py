@@ -45,9 +45,6 @@ class ValveButtonsHandler:
             self.logger.info(f"BUTTONS: Action forbidden because leak detected")
             self.buzzer.control.play_error()
         else:
-            if self.valve.is_in_progress():
-                self.valve.force_stop()
-
             try:
                 self.valve.open()
                 self.buzzer.control.play_confirm() 
@@ -66,9 +63,6 @@ class ValveButtonsHandler:
             self.logger.info(f"BUTTONS: Action forbidden because leak detected")
             self.buzzer.control.play_error()
         else:
-            if self.valve.is_in_progress():
-                self.valve.force_stop()
-                
             try:
                 self.valve.close()
                 self.buzzer.control.play_confirm() 
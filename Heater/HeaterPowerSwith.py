@@ -12,19 +12,30 @@ class HeaterPowerSwith:
         self._device_name = DeviceNames.HEATER_POWER_SWITH_KEY
         self._logger = AppLogger()
         self._states = states   
+        # With the thermostat the ON state only allows heating, the relay follows the temperature
+        self._thermostat = getattr(Settings, 'HEATER_THERMOSTAT', False)
         self._restore_state() 
 
     def is_on(self) -> bool:
         return self._pin.value() == 1
 
+    def is_enabled(self) -> bool:
+        return self._states.get_heater_state(self._device_name) == DeviceStates.ON
+
     def toggle(self):
-        if self._pin.value() == 0:
-            self.power_on()
+        if not self.is_enabled():
+            if not self._thermostat:
+                self.power_on()
             self._states.update_heater_state(self._device_name, DeviceStates.ON)
         else:
             self.power_off()
             self._states.update_heater_state(self._device_name, DeviceStates.OFF)
 
+    def shut_down(self):
+        """Relay off and heater switched off, it stays off until switched on again"""
+        self.power_off()
+        self._states.update_heater_state(self._device_name, DeviceStates.OFF)
+
     def power_on(self):
         self._pin.high()
 
@@ -34,7 +45,7 @@ class HeaterPowerSwith:
     def _restore_state(self):
         last_atate = self._states.get_heater_state(self._device_name)
         if last_atate: 
-            if last_atate == DeviceStates.ON:
+            if last_atate == DeviceStates.ON and not self._thermostat:
                 self.power_on()
             elif last_atate == DeviceStates.OFF:
                 self.power_off()
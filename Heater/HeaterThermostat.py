@@ -0,0 +1,136 @@
+import uasyncio as asyncio
+import utime
+import Resources.Settings as Settings
+from Logging.AppLogger import AppLogger
+
+# Why the relay is held off (or "heating" / "idle" while regulating)
+MODE_HEATING = "heating"
+MODE_IDLE = "idle"
+MODE_DISABLED = "disabled"
+MODE_SCHEDULE_OFF = "schedule off"
+MODE_NO_SENSOR = "no sensor"
+MODE_LEAK = "leak"
+
+
+class HeaterThermostat:
+    """Closed-loop control of the heater relay.
+
+    While the heater is switched on (button or web UI) the relay follows the
+    filtered temperature of HEATER_THERMOSTAT_SENSOR: on at or below the
+    setpoint minus HEATER_HYSTERESIS, off at the setpoint. A relay change
+    waits for HEATER_MIN_ON_S / HEATER_MIN_OFF_S since the previous one. The
+    setpoint comes from HEATER_SCHEDULE by the local RTC time, a None setpoint
+    keeps the water cold (nights). A leak, a switched off heater or a missing
+    reading drop the relay at once, whatever the minimum times.
+    """
+
+    def __init__(self, states, heater, leak_sensors=None):
+        self.logger = AppLogger()
+        self.states = states
+        self.heater = heater
+        self.leak_sensors = leak_sensors
+        self._sensor = getattr(Settings, 'HEATER_THERMOSTAT_SENSOR', 'heater_temp')
+        self._interval_s = getattr(Settings, 'HEATER_THERMOSTAT_INTERVAL', 30)
+        self._setpoint = getattr(Settings, 'HEATER_SETPOINT', 55)
+        self._hysteresis = getattr(Settings, 'HEATER_HYSTERESIS', 5)
+        self._min_on_ms = getattr(Settings, 'HEATER_MIN_ON_S', 300) * 1000
+        self._min_off_ms = getattr(Settings, 'HEATER_MIN_OFF_S', 300) * 1000
+        # (hour, minute, setpoint) by time of day, the last one applies until the first one
+        self._schedule = sorted(getattr(Settings, 'HEATER_SCHEDULE', ()), key=lambda entry: entry[0] * 60 + entry[1])
+        self._switched_at = None  # ticks_ms of the last relay change
+        self._relay_on = None  # Relay state the last step left
+        self._task = None
+        self.mode = MODE_DISABLED
+        self.switches = 0
+
+    # MARK: Public
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._control())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def get_setpoint(self):
+        """Setpoint in force now, None while the schedule keeps the heater off"""
+        if not self._schedule:
+            return self._setpoint
+        now = utime.localtime(utime.time() + Settings.TIME_ZONE_OFFSET * 60 * 60)
+        minute = now[3] * 60 + now[4]
+        setpoint = self._schedule[-1][2]  # Before the first entry of the day the last one still runs
+        for hour, start, entry_setpoint in self._schedule:
+            if hour * 60 + start > minute:
+                break
+            setpoint = entry_setpoint
+        return setpoint
+
+    def get_status(self) -> dict:
+        return {"mode": self.mode, "setpoint": self.get_setpoint(), "relay": self.heater.is_on(), "switches": self.switches}
+
+    # MARK: Helpers
+    async def _control(self):
+        while True:
+            try:
+                self._step()
+            except Exception as e:
+                self.logger.error("HEATER: Thermostat step failed: %s", e)
+            await asyncio.sleep(self._interval_s)
+
+    def _step(self) -> None:
+        relay_on = self.heater.is_on()
+        if self._relay_on is not None and relay_on != self._relay_on:
+            self._switched_at = utime.ticks_ms()  # Switched off by the button, the web UI or the interlock
+        self._relay_on = relay_on
+        setpoint = self.get_setpoint()
+        temp = self.states.get_temperature(self._sensor)
+
+        # Safety first: these drop the relay without waiting for the minimum on time
+        if self.leak_sensors and self.leak_sensors.is_heater_locked():
+            self._set_mode(MODE_LEAK)
+            self._switch(False, relay_on, temp, setpoint, force=True)
+            return
+        if not self.heater.is_enabled():
+            self._set_mode(MODE_DISABLED)
+            self._switch(False, relay_on, temp, setpoint, force=True)
+            return
+        if not isinstance(temp, (int, float)):
+            self._set_mode(MODE_NO_SENSOR)
+            self._switch(False, relay_on, temp, setpoint, force=True)
+            return
+
+        if setpoint is None:
+            want_on = False
+            self._set_mode(MODE_SCHEDULE_OFF)
+        else:
+            want_on = temp < setpoint if relay_on else temp <= setpoint - self._hysteresis
+            self._set_mode(MODE_HEATING if want_on else MODE_IDLE)
+        self._switch(want_on, relay_on, temp, setpoint)
+
+    def _switch(self, want_on: bool, relay_on: bool, temp, setpoint, force: bool = False) -> None:
+        if want_on == relay_on:
+            return
+        now = utime.ticks_ms()
+        if not force and self._switched_at is not None:
+            held_ms = utime.ticks_diff(now, self._switched_at)
+            if held_ms < (self._min_on_ms if relay_on else self._min_off_ms):
+                return  # The relay keeps its state until the minimum time is over
+
+        if want_on:
+            self.heater.power_on()
+        else:
+            self.heater.power_off()
+        self._switched_at = now
+        self._relay_on = want_on
+        self.switches += 1
+        self.logger.info("HEATER: Relay %s at %s C, setpoint %s", "on" if want_on else "off", temp, setpoint)
+
+    def _set_mode(self, mode: str) -> None:
+        if mode == self.mode:
+            return
+        if mode == MODE_NO_SENSOR:
+            self.logger.warning("HEATER: No reading of '%s', heating paused", self._sensor)
+        else:
+            self.logger.info("HEATER: Thermostat %s", mode)
+        self.mode = mode
@@ -17,6 +17,9 @@ HEATER_SECTION_KEY = "heater"
 HEATER_POWER_SWITH_KEY = "heater_power_swith"
 HEATER_TEMP_SENSORS_KEY = "heater_temp"
 
+#Water consumption
+WATER_CONSUMPTION_KEY = "water_consumption"
+
 #Base
 STATE_KEY = "state"
 PREVIEW_STATE_KEY = "preview_state"
@@ -5,5 +5,6 @@ OPENING = "opening"
 ERROR = "error"
 LEAK = "leak"
 NO_LEAK = "no_leak"
+FAULT = "fault"
 ON = "On"
 OFF = "Off"
\ No newline at end of file
@@ -5,6 +5,6 @@ HOT_WATER_SCREEN_NAME = "HotWaterScreen"
 WATER_HEATER_SCREEN_NAME = "WaterHeaterScreen"
 HOT_WATER_VALVE_SCREEN_NAME = "HotWaterValveScreen"
 COLD_WATER_VALVE_SCREEN_NAME = "ColdWaterValveScreen"
-LEAK_ZONE1_SCREEN_NAME = "LeakZone1Screen"
-LEAK_ZONE2_SCREEN_NAME = "LeakZone2Screen"
+LEAK_ZONE_SCREEN_NAME = "LeakZoneScreen"
+CONSUMPTION_SCREEN_NAME = "ConsumptionScreen"
 HEATER_POWER_LOAD_SCREEN_NAME = "HeaterPowerLoad"
\ No newline at end of file
@@ -0,0 +1,14 @@
+from machine import mem32
+
+# RP2040 SIO register with the input level of every GPIO (bit n = GPIO n)
+_SIO_GPIO_IN = 0xd0000004
+
+def read_levels() -> int:
+    """Input levels of all GPIOs with a single register read"""
+    return mem32[_SIO_GPIO_IN]
+
+def pin_mask(pins) -> int:
+    mask = 0
+    for pin in pins:
+        mask |= 1 << pin
+    return mask
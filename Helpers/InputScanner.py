@@ -0,0 +1,117 @@
+import uasyncio as asyncio
+import time
+import Helpers.Gpio as Gpio
+import Resources.Settings as Settings
+from Helpers.Singleton import Singleton
+from Logging.AppLogger import AppLogger
+
+_STATS_WINDOW_MS = 60000
+
+
+class InputScanner(Singleton):
+    """One task that samples every registered digital input.
+
+    All pins are read with a single register read per tick into a bitmask
+    (bit n = GPIO n, set = active) and debounced with 2-bit vertical counters:
+    a pin changes state after 4 consecutive samples at the new level.
+    Debounced edges are dispatched to the callback of the pin as callback(active).
+    """
+
+    def __init__(self):
+        if hasattr(self, '_callbacks'):
+            return
+
+        self.logger = AppLogger()
+        self._interval_ms = getattr(Settings, 'INPUT_SCAN_INTERVAL_MS', 10)
+        self._callbacks = {}  # pin bit -> callback(active)
+        self._mask = 0
+        self._active_low_mask = 0
+        self._state = 0  # Debounced active bits
+        self._cnt0 = 0
+        self._cnt1 = 0
+        self._task = None
+
+        # Load counters of the current window, last completed window in `stats`
+        self._wakeups = 0
+        self._busy_us = 0
+        self._window_start = time.ticks_ms()
+        self.stats = {"wakeups_per_s": 0, "busy_pct": 0.0}
+
+    # MARK: Public
+    def register(self, pin_id: int, callback, active_low: bool = True) -> None:
+        bit = 1 << pin_id
+        self._callbacks[bit] = callback
+        self._mask |= bit
+        if active_low:
+            self._active_low_mask |= bit
+        else:
+            self._active_low_mask &= ~bit
+
+        # Start from the current level without an event, counters idle
+        if self._sample() & bit:
+            self._state |= bit
+        else:
+            self._state &= ~bit
+        self._cnt0 |= bit
+        self._cnt1 |= bit
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._scan())
+
+    def unregister(self, pin_id: int) -> None:
+        bit = 1 << pin_id
+        self._callbacks.pop(bit, None)
+        self._mask &= ~bit
+        if not self._mask and self._task is not None:
+            # Cancelled in its sleep, a register() right after starts the only scan task
+            self._task.cancel()
+            self._task = None
+
+    def is_active(self, pin_id: int) -> bool:
+        return bool(self._state & (1 << pin_id))
+
+    # MARK: Helpers
+    def _sample(self) -> int:
+        return (Gpio.read_levels() ^ self._active_low_mask) & self._mask
+
+    def _debounce(self, sample: int) -> int:
+        """Advance the vertical counters, return the bits that toggled"""
+        mask = self._mask
+        delta = (sample ^ self._state) & mask
+        self._cnt0 = ~(self._cnt0 & delta) & mask
+        self._cnt1 = (self._cnt0 ^ (self._cnt1 & delta)) & mask
+        toggled = delta & self._cnt0 & self._cnt1
+        self._state ^= toggled
+        return toggled
+
+    def _dispatch(self, toggled: int) -> None:
+        for bit, callback in self._callbacks.items():
+            if toggled & bit:
+                try:
+                    callback(bool(self._state & bit))
+                except Exception as e:
+                    self.logger.error("INPUTS: Callback failed: %s", e)
+
+    def _update_stats(self, now: int) -> None:
+        elapsed = time.ticks_diff(now, self._window_start)
+        if elapsed < _STATS_WINDOW_MS:
+            return
+        self.stats = {
+            "wakeups_per_s": self._wakeups * 1000 // elapsed,
+            "busy_pct": round(self._busy_us / (elapsed * 10), 2),
+        }
+        self._wakeups = 0
+        self._busy_us = 0
+        self._window_start = now
+        self.logger.debug("INPUTS: %d wakeups/s, scanner busy %s%%", self.stats["wakeups_per_s"], self.stats["busy_pct"])
+
+    async def _scan(self):
+        while self._task is not None:
+            await asyncio.sleep_ms(self._interval_ms)
+            start = time.ticks_us()
+            toggled = self._debounce(self._sample())
+            if toggled:
+                self._dispatch(toggled)
+            self._wakeups += 1
+            self._busy_us += time.ticks_diff(time.ticks_us(), start)
+            self._update_stats(time.ticks_ms())
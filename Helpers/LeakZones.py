@@ -0,0 +1,43 @@
+import Resources.Settings as Settings
+import Helpers.DeviceNames as DeviceNames
+
+ALL_VALVES = (DeviceNames.HOT_WATER_VALVE_KEY, DeviceNames.COLD_WATER_VALVE_KEY)
+
+_zones = None
+
+def get_leak_zones() -> list:
+    """Leak zones from Settings.LEAK_ZONES with defaults applied.
+
+    Without LEAK_ZONES the two zones on LEAK_ZONE1_PIN / LEAK_ZONE2_PIN are used.
+    """
+    global _zones
+    if _zones is not None:
+        return _zones
+
+    zones = getattr(Settings, 'LEAK_ZONES', None)
+    if zones is None:
+        zones = [
+            {"name": DeviceNames.ZONE_1_LEAK_SENSORS_KEY, "title": "Zone 1", "pin": Settings.LEAK_ZONE1_PIN},
+            {"name": DeviceNames.ZONE_2_LEAK_SENSORS_KEY, "title": "Zone 2", "pin": Settings.LEAK_ZONE2_PIN},
+        ]
+
+    _zones = []
+    for zone in zones:
+        _zones.append({
+            "name": zone["name"],
+            "title": zone.get("title", zone["name"]),
+            "pin": zone["pin"],
+            "pull": zone.get("pull", "up"),
+            "leak_level": zone.get("leak_level", 0),
+            "valves": tuple(zone.get("valves", ALL_VALVES)),
+            "heater": zone.get("heater", True),
+            "mode": zone.get("mode", "digital"),
+            "dry": zone.get("dry", 40000),
+            "wet": zone.get("wet", 30000),
+            "open": zone.get("open", 63000),
+            "short": zone.get("short", 2000),
+        })
+    return _zones
+
+def get_leak_zone_names() -> list:
+    return [zone["name"] for zone in get_leak_zones()]
@@ -0,0 +1,35 @@
+import Resources.Settings as Settings
+import Helpers.DeviceNames as DeviceNames
+
+_sensors = None
+
+def get_temp_sensors() -> list:
+    """Temperature sensors from Settings.TEMP_SENSORS with defaults applied.
+
+    Without TEMP_SENSORS one sensor on HWLT_SE1_PIN and one on HEATER_TEMP_PIN are used.
+    """
+    global _sensors
+    if _sensors is not None:
+        return _sensors
+
+    sensors = getattr(Settings, 'TEMP_SENSORS', None)
+    if sensors is None:
+        sensors = [
+            {"name": DeviceNames.HOT_WATER_TEMP_SENSORS_KEY, "title": "Hot Water line", "pin": Settings.HWLT_SE1_PIN},
+            {"name": DeviceNames.HEATER_TEMP_SENSORS_KEY, "title": "Heater", "pin": Settings.HEATER_TEMP_PIN},
+        ]
+
+    _sensors = []
+    for sensor in sensors:
+        rom = sensor.get("rom")
+        _sensors.append({
+            "name": sensor["name"],
+            "title": sensor.get("title", sensor["name"]),
+            "pin": sensor["pin"],
+            "rom": rom.lower() if rom else None,
+            "resolution": sensor.get("resolution", 12),
+        })
+    return _sensors
+
+def get_temp_sensor_names() -> list:
+    return [sensor["name"] for sensor in get_temp_sensors()]
@@ -77,14 +77,14 @@ class WiFiManager(Singleton):
         time_since_last_attempt = current_time - self.last_connection_attempt
         if time_since_last_attempt < self.retry_interval:
             remaining_time = self.retry_interval - time_since_last_attempt
-            self.logger.debug(f"WiFi retry interval not elapsed, waiting {remaining_time:.1f}s more")
+            self.logger.debug("WiFi retry interval not elapsed, waiting %.1fs more", remaining_time)
             return False
 
         self.last_connection_attempt = current_time
         self.connection_attempts += 1
         
         self.logger.info(f"WiFi connection attempt #{self.connection_attempts} to: {Settings.WIFI_SSID}")
-        self.logger.debug(f"WiFi settings: retry_interval={self.retry_interval}s, max_attempts={retry_count}, attempt_delay={retry_delay}s")
+        self.logger.debug("WiFi settings: retry_interval=%ss, max_attempts=%s, attempt_delay=%ss", self.retry_interval, retry_count, retry_delay)
 
         try:
             # Reset WiFi adapter if many unsuccessful attempts
@@ -113,7 +113,7 @@ class WiFiManager(Singleton):
                     self.retry_interval = self.initial_retry_interval
                     return True
                     
-                self.logger.debug(f"Waiting for connection... ({attempt + 1}/{retry_count})")
+                self.logger.debug("Waiting for connection... (%d/%d)", attempt + 1, retry_count)
                 await asyncio.sleep(retry_delay)
 
             # Connection failed - increase retry interval
@@ -145,14 +145,14 @@ class WiFiManager(Singleton):
                 if ssid == Settings.WIFI_SSID:
                     target_found = True
                     rssi = net[3]
-                    self.logger.debug(f"Target network found: {ssid}, RSSI: {rssi}")
+                    self.logger.debug("Target network found: %s, RSSI: %s", ssid, rssi)
                     break
             
             if not target_found:
                 self.logger.warning(f"Target network '{Settings.WIFI_SSID}' not found in scan")
                 
         except Exception as e:
-            self.logger.debug(f"Network scan failed: {e}")
+            self.logger.debug("Network scan failed: %s", e)
 
     async def monitor_connection(self):
         """Continuous WiFi connection monitoring"""
@@ -207,4 +207,4 @@ class WiFiManager(Singleton):
                     self.logger.warning(f"Weak WiFi signal: {rssi} dBm")
                     
         except Exception as e:
-            self.logger.debug(f"Failed to check signal strength: {e}")
\ No newline at end of file
+            self.logger.debug("Failed to check signal strength: %s", e)
\ No newline at end of file
@@ -5,6 +5,7 @@ import Helpers.Helpers as Helpers
 import Helpers.LcdCustomSymbols as CustomSymbols
 import Helpers.DisplayNames as DisplayNames
 import Resources.Settings as Settings
+from Helpers.LeakZones import get_leak_zones
 
 from State.States import States
 from Logging.AppLogger import AppLogger
@@ -12,8 +13,8 @@ from Logging.AppLogger import AppLogger
 from LCD.Screens.Screen import Screen
 from LCD.Screens.HotWaterValveScreen import HotWaterValveScreen
 from LCD.Screens.ColdWaterValveScreen import ColdWaterValveScreen
-from LCD.Screens.LeakZone1Screen import LeakZone1Screen
-from LCD.Screens.LeakZone2Screen import LeakZone2Screen
+from LCD.Screens.LeakZoneScreen import LeakZoneScreen
+from LCD.Screens.ConsumptionScreen import ConsumptionScreen
 from LCD.Screens.HotWaterScreen import HotWaterScreen
 from LCD.Screens.WaterHeaterScreen import WaterHeaterScreen
 from LCD.Screens.StartingScreen import StartingScreen
@@ -119,11 +120,13 @@ class Display:
             NetworkScreen(self.lcd),
             HotWaterValveScreen(self.lcd, self.states),
             ColdWaterValveScreen(self.lcd, self.states),
-            LeakZone1Screen(self.lcd, self.states),
-            LeakZone2Screen(self.lcd, self.states),
-            HotWaterScreen(self.lcd, self.states),
-            WaterHeaterScreen(self.lcd, self.states),
         ]
+        for zone in get_leak_zones():
+            self._screens.append(LeakZoneScreen(self.lcd, self.states, zone["name"], zone["title"]))
+        self._screens.append(HotWaterScreen(self.lcd, self.states))
+        self._screens.append(WaterHeaterScreen(self.lcd, self.states))
+        if getattr(Settings, 'FLOW_METER_PIN', None) is not None:
+            self._screens.append(ConsumptionScreen(self.lcd))
         if device_name: 
             for i, screen in enumerate(self._screens):
                 if screen.get_device_name() == device_name:
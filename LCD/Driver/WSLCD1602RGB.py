@@ -6,7 +6,25 @@ from time import sleep, sleep_ms, sleep_us
 # custom packages
 from . import const as Const
 
+# Unchanged cells a run of changed ones may span before it is split in two
+_RUN_GAP = 3
+# Compiled texts kept, the cache starts over when full (temperatures make new strings)
+_COMPILED_MAX = 32
+
 class WSLCD1602RGB:
+    """Waveshare LCD1602 RGB module: AiP31068 character controller and PCA9633 backlight.
+
+    Text goes to a 2x16 frame buffer (set_cursor, print_out, clear) and
+    reaches the glass on flush(): only the runs of cells that differ from
+    the shadow of the displayed content are written, each with one cursor
+    set and one multi-byte transfer. Colour, brightness and the custom
+    symbols are written only when they change.
+
+    A text is compiled once into its HD44780 codes, with the `-121-` style
+    symbol tokens replaced by their CGRAM slots, and the symbols it needs.
+    Symbols keep their slot while they are used, so a compiled text stays
+    valid until a slot gets another symbol.
+    """
   
     def __init__(self, _I2C:I2C, custom_symbols:dict, default_brightness:int, _default_color = (144, 249, 15)):
         self._I2C = _I2C
@@ -15,6 +33,15 @@ class WSLCD1602RGB:
         self._default_color = _default_color
         self.available_custom_symbols = custom_symbols
         self.custom_symbols_loaded = {}
+        self._cgram = [None] * 8  # Symbol key held by each CGRAM slot
+        self._cgram_generation = 0  # Bumped when a slot gets another symbol
+        self._compiled = {}  # text -> (CGRAM generation, codes, symbol keys)
+        self._symbol_lengths = sorted({len(key) for key in custom_symbols}, reverse=True)
+        self._symbol_starts = {key[0] for key in custom_symbols}
+        self._frame = bytearray(b" " * 32)  # Next content, row 0 then row 1
+        self._shadow = bytearray(b" " * 32)  # Content on the glass
+        self._cursor = 0
+        self._color = None  # RGB on the backlight, None until set
         self._current_brightness_persent = default_brightness
         self._showfunction = Const.LCD_4BITMODE | Const.LCD_8BITMODE | Const.LCD_2LINE | Const.LCD_5x8DOTS
         self.begin()
@@ -26,11 +53,16 @@ class WSLCD1602RGB:
         # sleep_us(43)
 
     def _write_data(self, data):
-        self._I2C.writeto_mem(Const.LCD_ADDRESS, Const.LCD_SETCGRAMADDR, chr(data))
+        self._I2C.writeto_mem(Const.LCD_ADDRESS, Const.LCD_SETCGRAMADDR, bytes((data,)))
         # sleep_us(43)
 
+    def _write_data_run(self, data):
+        # Control byte 0x40 without the continuation bit: every byte after it is display data
+        self._I2C.writeto_mem(Const.LCD_ADDRESS, Const.LCD_SETCGRAMADDR, data)
+
     def _set_rgb_reg(self, reg, data):
-        self._I2C.writeto_mem(Const.RGB_ADDRESS, reg, chr(data))
+        # bytes, not chr(): a str above 127 would go out as two UTF-8 bytes
+        self._I2C.writeto_mem(Const.RGB_ADDRESS, reg, bytes((data,)))
 
     # MARK: DISPLAY
     def show_cursor(self):
@@ -87,9 +119,13 @@ class WSLCD1602RGB:
         if not (0 <= red <= 255) or not (0 <= green <= 255) or not (0 <= blue <= 255):
             raise ValueError(f"The color value must be between 0 and 255. Red:{red}, Green:{green}, Blue:{blue} ")
         
+        color = (red, green, blue)
+        if color == self._color:
+            return
         self._set_rgb_reg(Const.REG_RED, red)
         self._set_rgb_reg(Const.REG_GREEN, green)
         self._set_rgb_reg(Const.REG_BLUE, blue)
+        self._color = color
 
     def set_colour_white(self):
         self.set_rgb(255, 255, 255)
@@ -105,60 +141,123 @@ class WSLCD1602RGB:
 
     # MARK: TEXT
     def set_cursor(self,col,row):
-        if(row == 0):
-            col|=0x80
-        else:
-            col|=0xc0
-        self._I2C.writeto(Const.LCD_ADDRESS, bytearray([Const.LCD_SETDDRAMADDR,col]))
-        # sleep_us(43)
+        """Position in the frame buffer where print_out continues"""
+        self._cursor = (16 if row else 0) + min(max(col, 0), 16)
+
+    def clear(self, row=None):
+        """Blank the frame buffer (or one row of it), the glass follows on flush()"""
+        start, end = (0, 32) if row is None else (row * 16, row * 16 + 16)
+        for i in range(start, end):
+            self._frame[i] = 32
+        self._cursor = start
 
-    # Modified method to clear display and custom symbols
-    def clear(self):
-        self._write_command(Const.LCD_CLEARDISPLAY)
-        # sleep_ms(153)
-        
     def print_out(self, string: str):
+        """Put the text into the frame buffer at the cursor, cut at the end of the row"""
+        codes = self.compile_text(string)[0]
+        room = (16 if self._cursor < 16 else 32) - self._cursor
+        if len(codes) > room:
+            codes = codes[:room]
+        self._frame[self._cursor:self._cursor + len(codes)] = codes
+        self._cursor += len(codes)
+
+    def compile_text(self, string: str) -> tuple:
+        """(HD44780 codes, custom symbol keys) of the text, cached per text"""
+        entry = self._compiled.get(string)
+        if entry is None or entry[0] != self._cgram_generation:
+            if entry is None and len(self._compiled) >= _COMPILED_MAX:
+                self._compiled.clear()
+            entry = (self._cgram_generation,) + self._compile(string)
+            self._compiled[string] = entry
+        return entry[1], entry[2]
+
+    def _compile(self, string: str) -> tuple:
+        codes = bytearray()
+        keys = []
         i = 0
-        while i < len(string):
-            matched = False
-            # Check any key in the word available_custom_symbols
-            for key in self.available_custom_symbols.keys():
-                key_length = len(key)
-                # Check that you don't have to look at the edge of the previous string
-                if i + key_length <= len(string) and string[i:i+key_length] == key:
-                    symbols_index = self.custom_symbols_loaded.get(key)
-                    if symbols_index is not None:
-                        self._write_data(symbols_index)
-                        i += key_length
-                        matched = True
+        n = len(string)
+        while i < n:
+            char = string[i]
+            if char in self._symbol_starts:
+                key = None
+                for length in self._symbol_lengths:
+                    if string[i:i + length] in self.available_custom_symbols:
+                        key = string[i:i + length]
                         break
-            
-           # If you don't need a special symbol
-            if not matched:
-               # Check Index to get IndexError
-                if i < len(string):
-                    self._write_data(ord(string[i]))
-                    i += 1
+                if key is not None:
+                    if key not in keys:
+                        keys.append(key)
+                    slot = self.custom_symbols_loaded.get(key)
+                    if slot is not None:
+                        codes.append(slot)
+                        i += len(key)
+                        continue
+                    # Not in CGRAM: the token is shown as it is written
+            code = ord(char)
+            codes.append(code if code < 256 else 63)  # '?' outside the character ROM
+            i += 1
+        return bytes(codes), tuple(keys)
+
+    def flush(self):
+        """Write the cells of the frame buffer that differ from the glass"""
+        frame, shadow = self._frame, self._shadow
+        for row in (0, 16):
+            col = row
+            end = row + 16
+            while col < end:
+                if frame[col] == shadow[col]:
+                    col += 1
+                    continue
+                # A run ends after _RUN_GAP equal cells: rewriting fewer is cheaper than a new cursor set
+                start = last = col
+                while col < end and col - last <= _RUN_GAP:
+                    if frame[col] != shadow[col]:
+                        last = col
+                    col += 1
+                self._I2C.writeto(Const.LCD_ADDRESS, bytes((Const.LCD_SETDDRAMADDR, (0xC0 if row else 0x80) | (start - row))))
+                self._write_data_run(frame[start:last + 1])
+                shadow[start:last + 1] = frame[start:last + 1]
 
 
     def load_custom_symbol(self, key:str, symbol_data:list):
-        symbol_index = len(self.custom_symbols_loaded)
-        if symbol_index > 7:
-            raise ValueError("No more space for custom symbols")
-        self._write_command(Const.LCD_SETCGRAMADDR | (symbol_index << 3))
-        for line in symbol_data:
-            self._write_data(line)
-        self.custom_symbols_loaded[key] = symbol_index
+        symbol_index = self.custom_symbols_loaded.get(key)
+        if symbol_index is None:
+            if None not in self._cgram:
+                raise ValueError("No more space for custom symbols")
+            symbol_index = self._cgram.index(None)
+        self._write_symbol(symbol_index, key, symbol_data)
 
     def load_custom_symbols(self, symbols: list):
+        """Bring the symbols into CGRAM; the ones already there keep their slot, the slots of others are reused"""
+        wanted = []
         for key in symbols:
-            if key in self.available_custom_symbols:
-                symbol_data = self.available_custom_symbols[key]
-                self.load_custom_symbol(key, symbol_data)
+            if key in self.available_custom_symbols and key not in wanted:
+                wanted.append(key)
+        if len(wanted) > 8:
+            raise ValueError("No more space for custom symbols")
+        for key in wanted:
+            if key in self.custom_symbols_loaded:
+                continue
+            for symbol_index, loaded in enumerate(self._cgram):
+                if loaded is None or loaded not in wanted:
+                    self._write_symbol(symbol_index, key, self.available_custom_symbols[key])
+                    break
 
     # Method to clear custom symbols from CGRAM
     def clear_custom_symbols(self):
         self.custom_symbols_loaded = {}
+        self._cgram = [None] * 8
+        self._cgram_generation += 1
+
+    def _write_symbol(self, symbol_index: int, key: str, symbol_data) -> None:
+        if self._cgram[symbol_index] == key:
+            return
+        self._write_command(Const.LCD_SETCGRAMADDR | (symbol_index << 3))
+        self._write_data_run(bytes(symbol_data))
+        if self._cgram[symbol_index] is not None:
+            del self.custom_symbols_loaded[self._cgram[symbol_index]]
+        self._cgram[symbol_index] = key
+        self.custom_symbols_loaded[key] = symbol_index
+        self._cgram_generation += 1
 
     def display(self):
         self._showcontrol |= Const.LCD_DISPLAYON 
@@ -186,7 +285,7 @@ class WSLCD1602RGB:
         self._showcontrol = Const.LCD_DISPLAYON | Const.LCD_CURSOROFF | Const.LCD_BLINKOFF 
         self.display()
         # clear it off
-        self.clear()
+        self._write_command(Const.LCD_CLEARDISPLAY)
         # Initialize to default text direction (for romance languages)
         self._showmode = Const.LCD_ENTRYLEFT | Const.LCD_ENTRYSHIFTDECREMENT 
         # set the entry mode
@@ -0,0 +1,30 @@
+import Helpers.DisplayColors as Colors
+import Helpers.DisplayNames as DisplayNames
+import Helpers.DeviceNames as DeviceNames
+import Helpers.LcdCustomSymbols as Symbols
+from ..Driver.WSLCD1602RGB import WSLCD1602RGB
+from .Screen import Screen
+from Sensors.WaterConsumption import WaterConsumption
+
+
+class ConsumptionScreen(Screen):
+
+    def __init__(self, lcd: WSLCD1602RGB):
+        self.consumption = WaterConsumption()
+        super().__init__(
+            lcd = lcd, 
+            screen_name = DisplayNames.CONSUMPTION_SCREEN_NAME,
+            device_name = DeviceNames.WATER_CONSUMPTION_KEY, 
+            screen_title = f"{Symbols.DROPLET}|Water used",
+            color = Colors.BLUE_AND_WHITE
+        )
+
+    def present(self):
+        day = self.consumption.get_liters("day")
+        month = self.consumption.get_liters("month")
+        self.show(f"D:{self.get_volume(day)} M:{self.get_volume(month)}")
+
+    def get_volume(self, liters: float) -> str:
+        if liters >= 10000:
+            return f"{liters / 1000:.1f}m3"
+        return f"{int(liters)}L"
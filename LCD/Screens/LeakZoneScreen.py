@@ -1,6 +1,5 @@
 import Helpers.DisplayColors as Colors
 import Helpers.DisplayNames as DisplayNames
-import Helpers.DeviceNames as DeviceNames
 import Helpers.DeviceStates as DeviceStates
 import Helpers.LcdCustomSymbols as Symbols
 from ..Driver.WSLCD1602RGB import WSLCD1602RGB
@@ -8,17 +7,17 @@ from .Screen import Screen
 from State.States import States
 
 
-class LeakZone1Screen(Screen):
+class LeakZoneScreen(Screen):
     
     _error_color = Colors.RED
 
-    def __init__(self, lcd: WSLCD1602RGB, states:States):
+    def __init__(self, lcd: WSLCD1602RGB, states:States, zone_name: str, zone_title: str):
         self.states = states
         super().__init__(
             lcd = lcd, 
-            screen_name = DisplayNames.LEAK_ZONE1_SCREEN_NAME,
-            device_name = DeviceNames.ZONE_1_LEAK_SENSORS_KEY, 
-            screen_title = f"{Symbols.DROPLET}|Leak zone 1",
+            screen_name = DisplayNames.LEAK_ZONE_SCREEN_NAME,
+            device_name = zone_name, 
+            screen_title = f"{Symbols.DROPLET}|Leak {zone_title}",
             color = Colors.BLUE_AND_WHITE
         )
 
@@ -27,8 +26,12 @@ class LeakZone1Screen(Screen):
         self.show(self.get_text(state), self.get_color(state))
 
     def get_text(self, state) -> str:
+        if state == DeviceStates.FAULT:
+            return "Sensor fault"
         text =  f"Leak {Symbols.CROSS}" if state == DeviceStates.LEAK else f"No leak {Symbols.CHECK}"
         return "State: " + text
         
     def get_color(self, state):
+        if state == DeviceStates.FAULT:
+            return Colors.ORANGE
         return self._error_color if state == DeviceStates.LEAK else self.get_default_color()
\ No newline at end of file
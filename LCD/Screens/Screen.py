@@ -23,10 +23,13 @@ class Screen:
         self._config_lcd(message, color)
         self._show_title()
         self._show_description(message)
+        self.lcd.flush()
         gc.collect()
 
     def update_description(self, message):
+        self.lcd.clear(row=1)
         self._show_description(message)
+        self.lcd.flush()
 
     # Setter
     def set_screen_title(self, title) -> None:
@@ -54,6 +57,7 @@ class Screen:
     # Helpers
     def _config_lcd(self, message: str, color = None):
         self._load_screan_symbols(message)
+        # Only the frame buffer is cleared, flush() rewrites just the cells that change
         self.lcd.clear()
         color = color if color else self._default_screan_color
         self.lcd.set_color(color)
@@ -68,28 +72,17 @@ class Screen:
         message = text if text is not None else self._default_text
         self.lcd.print_out(message)
 
-    # Finds special characters by the pattern -intintint- in the text and adds them as an array for downloading
+    # Custom symbols of the title and the message, from their compiled text
     def _find_screen_symbols(self, title: str, message: str) -> list:
-        combined_str = title + message
-        pos = 0
-        out = []
-        n = len(combined_str)
-        while pos < n:
-            start = combined_str.find('-', pos)
-            if start == -1:
-                break
-            if start + 5 <= n and combined_str[start + 1:start + 4].isdigit() and combined_str[start + 4] == '-':
-                symbol = combined_str[start:start + 5]
+        out = list(self.lcd.compile_text(title)[1])
+        for symbol in self.lcd.compile_text(message)[1]:
+            if symbol not in out:
                 out.append(symbol)
-                pos = start + 5
-            else:
-                pos = start + 1
         return out
 
     def _load_screan_symbols(self, message:str) -> None:
         screan_symbols = self._find_screen_symbols(self.screen_title, message)
         if screan_symbols:
-            self.lcd.clear_custom_symbols()
             self.lcd.load_custom_symbols(screan_symbols)
 
 
@@ -1,14 +1,16 @@
 from Helpers.Singleton import Singleton
 from Logging.Logger import *
+import Resources.Settings as Settings
 
 class AppLogger(Singleton):
-    
+
     def __init__(self):
         if hasattr(self, 'log'):
             return
-        
+
         self.log = Logger("AppLogger")
-        self.log.setLevel(DEBUG)
+        self.level = NOTSET
+        self.setLevel(getattr(Settings, 'LOG_LEVEL', DEBUG))
         formatter = Formatter("%(levelname)s:%(name)s: %(message)s")
 
         # Handler for console
@@ -16,20 +18,65 @@ class AppLogger(Singleton):
         console_handler.setFormatter(formatter)
         self.log.addHandler(console_handler)
 
+        # Buffered handler for the log file on flash
+        self.file_handler = None
+        if getattr(Settings, 'LOG_FILE_ENABLED', False):
+            self._add_file_handler(formatter)
+
+    def _add_file_handler(self, formatter):
+        from Logging.RotatingFileHandler import RotatingFileHandler
+        from Logging.AsyncBufferedHandler import AsyncBufferedHandler
+
+        rotating_handler = RotatingFileHandler(
+            getattr(Settings, 'LOG_FILE_NAME', 'app.log'),
+            maxBytes=getattr(Settings, 'LOG_FILE_MAX_BYTES', 16384),
+            backupCount=getattr(Settings, 'LOG_FILE_BACKUP_COUNT', 2)
+        )
+        self.file_handler = AsyncBufferedHandler(
+            rotating_handler,
+            capacity=getattr(Settings, 'LOG_BUFFER_SIZE', 2048),
+            flush_threshold=getattr(Settings, 'LOG_FLUSH_THRESHOLD', 1536),
+            flush_interval_ms=getattr(Settings, 'LOG_FLUSH_INTERVAL_MS', 5000)
+        )
+        if getattr(Settings, 'LOG_FILE_BINARY', False):
+            from Logging.BinaryFormatter import BinaryFormatter
+            self.file_handler.setFormatter(BinaryFormatter())
+        else:
+            self.file_handler.setFormatter(formatter)
+        self.file_handler.start()
+        self.log.addHandler(self.file_handler)
+
+    def flush(self):
+        """Write buffered log records to flash (call before reset/shutdown)"""
+        if self.file_handler:
+            self.file_handler.flush()
+
+    def setLevel(self, level):
+        self.log.setLevel(level)
+        # Cached copy of the effective level for the fast path below
+        self.level = self.log.getEffectiveLevel()
 
+    def isEnabledFor(self, level) -> bool:
+        """Guard for call sites whose arguments are expensive to build"""
+        return level >= self.level
+
+    # Messages take deferred %-style arguments: "ZONE 1: %s", state.
+    # The string is only built if the level is enabled.
     def debug(self, msg, *args):
-        self.log.debug(msg, *args)
-    
+        if DEBUG >= self.level:
+            self.log.log(DEBUG, msg, *args)
+
     def info(self, msg, *args):
-        self.log.info(msg, *args)
-    
+        if INFO >= self.level:
+            self.log.log(INFO, msg, *args)
+
     def warning(self, msg, *args):
-        self.log.warning(msg, *args)
-    
+        if WARNING >= self.level:
+            self.log.log(WARNING, msg, *args)
+
     def error(self, msg, *args):
-        self.log.error(msg, *args)
-    
-    def critical(self, msg, *args):
-        self.log.critical(msg, *args)
-    
+        if ERROR >= self.level:
+            self.log.log(ERROR, msg, *args)
 
+    def critical(self, msg, *args):
+        self.log.log(CRITICAL, msg, *args)
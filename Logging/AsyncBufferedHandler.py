@@ -0,0 +1,116 @@
+import utime
+import uasyncio as asyncio
+from Logging.Logger import *
+
+
+class AsyncBufferedHandler(Handler):
+    """Collects formatted records in a preallocated RAM ring and writes them
+    to the target handler in blocks from a background task.
+
+    The target must provide `write_block(data)` (see RotatingFileHandler).
+    Text formatters get a line terminator appended; binary formatters
+    (BinaryFormatter) are stored as returned.
+    Records that do not fit into the ring are dropped and counted instead of
+    blocking the caller. CRITICAL records are flushed immediately.
+    """
+
+    def __init__(self, target, capacity=2048, flush_threshold=1536, flush_interval_ms=5000):
+        super().__init__()
+        self.target = target
+        self.capacity = capacity
+        self.flush_threshold = min(flush_threshold, capacity)
+        self.flush_interval_ms = flush_interval_ms
+        self.terminator = b"\n"
+        self.dropped = 0
+
+        self._buf = bytearray(capacity)
+        self._mv = memoryview(self._buf)
+        self._start = 0
+        self._used = 0
+        self._reported_dropped = 0
+        self._last_flush = utime.ticks_ms()
+        self._flush_event = asyncio.Event()
+        self._task = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.flush()
+
+    def close(self) -> None:
+        self.stop()
+
+    def emit(self, record):
+        if not self._put(self._encode(record)):
+            self.dropped += 1
+
+        if record.levelno >= CRITICAL:
+            self.flush()
+        elif self._used >= self.flush_threshold:
+            self._flush_event.set()
+
+    def flush(self) -> None:
+        """Write everything collected so far to the target handler."""
+        if self._used:
+            end = self._start + self._used
+            try:
+                if end <= self.capacity:
+                    self.target.write_block(self._mv[self._start:end])
+                else:
+                    self.target.write_block(self._mv[self._start:self.capacity])
+                    self.target.write_block(self._mv[0:end - self.capacity])
+            except Exception as e:
+                print("LOGGING: Buffered flush failed: {0}".format(e))
+            self._start = 0
+            self._used = 0
+        self._report_dropped()
+        self._last_flush = utime.ticks_ms()
+
+    def get_stats(self) -> dict:
+        return {"used": self._used, "capacity": self.capacity, "dropped": self.dropped}
+
+    # MARK: Helpers
+    def _encode(self, record):
+        data = self.formatter.format(record)
+        if isinstance(data, str):
+            data = data.encode() + self.terminator
+        return data
+
+    def _put(self, data) -> bool:
+        size = len(data)
+        if size > self.capacity - self._used:
+            return False
+
+        pos = (self._start + self._used) % self.capacity
+        first = min(size, self.capacity - pos)
+        self._buf[pos:pos + first] = data[:first]
+        if first < size:
+            self._buf[0:size - first] = data[first:]
+        self._used += size
+        return True
+
+    def _report_dropped(self) -> None:
+        lost = self.dropped - self._reported_dropped
+        if lost:
+            notice = LogRecord("Logging", WARNING, None, None, "LOGGING: %d log records dropped (buffer overflow)", (lost,), None)
+            try:
+                self.target.write_block(self._encode(notice))
+                self._reported_dropped = self.dropped
+            except Exception:
+                pass
+
+    async def _flush_loop(self):
+        while self._task is not None:
+            try:
+                await asyncio.wait_for_ms(self._flush_event.wait(), self.flush_interval_ms)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_event.clear()
+
+            if self._used >= self.flush_threshold or utime.ticks_diff(utime.ticks_ms(), self._last_flush) >= self.flush_interval_ms:
+                self.flush()
@@ -0,0 +1,91 @@
+import ustruct
+from Logging.Logger import Formatter
+
+# Binary record layout (little endian):
+#   magic:u8  timestamp:u32  level:u8  message_id:u16  nargs:u8  args...
+# Every argument is a one byte type tag followed by its payload:
+#   'i' int32, 'f' float32, 's' u8 length + utf-8 bytes, 'T' True, 'F' False, 'N' None
+# Messages missing from the catalog are stored with RAW_MESSAGE_ID and the
+# already formatted text as their only argument.
+# Tools/log_decode.py turns these records back into text.
+RECORD_MAGIC = 0xA5
+RAW_MESSAGE_ID = 0xFFFF
+HEADER_FORMAT = "<BIBHB"
+HEADER_SIZE = 9
+
+TAG_INT = 0x69    # 'i'
+TAG_FLOAT = 0x66  # 'f'
+TAG_STR = 0x73    # 's'
+TAG_TRUE = 0x54   # 'T'
+TAG_FALSE = 0x46  # 'F'
+TAG_NONE = 0x4E   # 'N'
+
+
+class BinaryFormatter(Formatter):
+    """Packs a record as (timestamp, level, message ID, arguments) instead of text.
+
+    The returned memoryview points into a reusable scratch buffer, so the
+    caller has to copy it before formatting the next record.
+    """
+
+    def __init__(self, catalog=None, max_record_size=255):
+        super().__init__()
+        if catalog is None:
+            from Logging.LogCatalog import MESSAGES as catalog
+        self._catalog = catalog
+        self._buf = bytearray(max_record_size)
+        self._mv = memoryview(self._buf)
+
+    def format(self, record):
+        msg_id = self._catalog.get(record.msg, RAW_MESSAGE_ID)
+        if msg_id == RAW_MESSAGE_ID:
+            args = (record.msg % record.args if record.args else str(record.msg),)
+        else:
+            args = record.args
+
+        pos = HEADER_SIZE
+        nargs = 0
+        for arg in args:
+            end = self._pack_arg(arg, pos)
+            if end < 0:
+                break
+            pos = end
+            nargs += 1
+
+        ustruct.pack_into(HEADER_FORMAT, self._buf, 0, RECORD_MAGIC, int(record.created) & 0xFFFFFFFF, record.levelno, msg_id, nargs)
+        return self._mv[:pos]
+
+    # MARK: Helpers
+    def _pack_arg(self, arg, pos) -> int:
+        """Pack one argument at pos, return the new position or -1 if it does not fit"""
+        buf = self._buf
+        free = len(buf) - pos
+
+        if arg is True or arg is False or arg is None:
+            if free < 1:
+                return -1
+            buf[pos] = TAG_TRUE if arg is True else TAG_FALSE if arg is False else TAG_NONE
+            return pos + 1
+
+        if isinstance(arg, int) and -0x80000000 <= arg <= 0x7FFFFFFF:
+            if free < 5:
+                return -1
+            buf[pos] = TAG_INT
+            ustruct.pack_into("<i", buf, pos + 1, arg)
+            return pos + 5
+
+        if isinstance(arg, float):
+            if free < 5:
+                return -1
+            buf[pos] = TAG_FLOAT
+            ustruct.pack_into("<f", buf, pos + 1, arg)
+            return pos + 5
+
+        data = (arg if isinstance(arg, str) else str(arg)).encode()
+        if free < 3:
+            return -1
+        size = min(len(data), free - 2, 255)
+        buf[pos] = TAG_STR
+        buf[pos + 1] = size
+        buf[pos + 2:pos + 2 + size] = data[:size]
+        return pos + 2 + size
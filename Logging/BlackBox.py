@@ -0,0 +1,118 @@
+import gc
+import os
+import utime
+import ustruct
+from Helpers.Singleton import Singleton
+import Resources.Settings as Settings
+
+EVENT_INFO = 0
+EVENT_STATE = 1
+EVENT_HEAP = 2
+EVENT_TASK = 3
+EVENT_EXCEPTION = 4
+EVENT_RESET = 5
+
+EVENT_NAMES = ("INFO", "STATE", "HEAP", "TASK", "EXCEPTION", "RESET")
+
+# File image layout: magic(4) slots:u8 slot_size:u8 next:u8 count:u8, then the slots.
+# Slot layout: timestamp:u32 kind:u8 length:u8 text[_SLOT_TEXT]
+_MAGIC = b"BBX1"
+_HEADER_SIZE = 8
+_SLOT_SIZE = 48
+_SLOT_TEXT = _SLOT_SIZE - 6
+
+
+class BlackBox(Singleton):
+    """Crash-persistent recorder of the last events before a reset.
+
+    Events are kept in a preallocated ring that is written to flash with a
+    single write by commit() - right before an intentional machine.reset()
+    and on uncaught exceptions. The events of the previous session are
+    loaded once at boot into `previous`.
+    """
+
+    def __init__(self):
+        if hasattr(self, '_image'):
+            return
+
+        self.filename = getattr(Settings, 'BLACKBOX_FILE', 'blackbox.bin')
+        self.slots = min(getattr(Settings, 'BLACKBOX_EVENTS', 32), 255)
+        self._image = bytearray(_HEADER_SIZE + self.slots * _SLOT_SIZE)
+        self._image[0:4] = _MAGIC
+        self._image[4] = self.slots
+        self._image[5] = _SLOT_SIZE
+        self._next = 0
+        self._count = 0
+        self.previous = self._load_previous()
+
+    # MARK: Public
+    def record(self, kind: int, text) -> None:
+        image = self._image
+        offset = _HEADER_SIZE + self._next * _SLOT_SIZE
+        data = text.encode() if isinstance(text, str) else str(text).encode()
+        size = min(len(data), _SLOT_TEXT)
+
+        ustruct.pack_into("<IBB", image, offset, utime.time() & 0xFFFFFFFF, kind, size)
+        image[offset + 6:offset + 6 + size] = data[:size]
+
+        self._next = (self._next + 1) % self.slots
+        self._count = min(self._count + 1, self.slots)
+        image[6] = self._next
+        image[7] = self._count
+
+    def record_exception(self, where: str, e) -> None:
+        self.record(EVENT_EXCEPTION, where + ": " + e.__class__.__name__ + " " + str(e))
+
+    def commit(self, reason=None) -> bool:
+        """Persist the ring with a single flash write"""
+        if reason:
+            self.record(EVENT_RESET, reason)
+        self.record(EVENT_HEAP, "free " + str(gc.mem_free()))
+        try:
+            with open(self.filename, "wb") as f:
+                f.write(self._image)
+            return True
+        except Exception as e:
+            print("BLACKBOX: Commit failed: {0}".format(e))
+            return False
+
+    def get_events(self) -> list:
+        """Events of the running session, oldest first"""
+        return self._parse(self._image)
+
+    # MARK: Helpers
+    def _load_previous(self) -> list:
+        try:
+            with open(self.filename, "rb") as f:
+                image = f.read()
+        except OSError:
+            return []
+
+        # One-shot: the file only describes the session that committed it
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+        return self._parse(image)
+
+    def _parse(self, image) -> list:
+        if len(image) < _HEADER_SIZE or image[0:4] != _MAGIC or image[5] != _SLOT_SIZE:
+            return []
+
+        slots, next_index, count = image[4], image[6], image[7]
+        if len(image) < _HEADER_SIZE + slots * _SLOT_SIZE or next_index >= slots or count > slots:
+            return []
+
+        events = []
+        first = (next_index - count) % slots
+        for i in range(count):
+            offset = _HEADER_SIZE + ((first + i) % slots) * _SLOT_SIZE
+            timestamp, kind, size = ustruct.unpack_from("<IBB", image, offset)
+            data = bytes(image[offset + 6:offset + 6 + min(size, _SLOT_TEXT)])
+            try:
+                text = data.decode()
+            except UnicodeError:
+                text = str(data)
+            name = EVENT_NAMES[kind] if kind < len(EVENT_NAMES) else str(kind)
+            events.append((timestamp, name, text))
+        return events
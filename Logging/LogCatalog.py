@@ -0,0 +1,158 @@
+# Generated by Tools/log_catalog.py - do not edit by hand.
+# Maps log format strings to the message IDs of the binary log format
+# (see Logging/BinaryFormatter.py). IDs must never be reused.
+MESSAGES = {
+    'Main: Initializing core components...': 0,
+    'Main: Connecting to WiFi...': 1,
+    'Main: Updating time...': 2,
+    'Main: Starting leak sensors...': 3,
+    'Main: Starting cleanup process...': 4,
+    'Preparing memory for web server...': 5,
+    'Main: Temperature sensors initialized': 6,
+    'Main: Starting temperature sensors...': 7,
+    'Main: Starting heater control button...': 8,
+    'Main: WiFi not connected, skipping web server': 9,
+    'Main: Starting display...': 10,
+    'Main: Display not available, continuing without display': 11,
+    'Main: LEAKS DETECTED AT STARTUP - Skipping startup sounds due to emergency condition': 12,
+    'Main: Testing alarm buzzer...': 13,
+    'Main: Playing startup melody...': 14,
+    'Main: Not enough memory for web server, continuing without it': 15,
+    'Main: Forcing save of pending state changes...': 16,
+    'Main: Starting web server...': 17,
+    'WiFi disconnected, attempting reconnect...': 18,
+    'Critical memory, aggressive GC': 19,
+    'Emergency memory shortage, preparing reboot...': 20,
+    'Main: Web server started successfully': 21,
+    'Main: Web server failed to start': 22,
+    'ALARM_BUZZER: Starting alarm sequence': 23,
+    'ALARM_BUZZER: Playing test beep': 24,
+    'ALARM_BUZZER: Alarm buzzer is not working, cannot cancel': 25,
+    'ALARM_BUZZER: Alarm sequence started': 26,
+    'ALARM_BUZZER: Alarm sequence ended': 27,
+    'ALARM_BUZZER: Playing first test beep': 28,
+    'ALARM_BUZZER: Alarm stopped': 29,
+    'ALARM_BUZZER: Alarm cancelled': 30,
+    'ALARM_BUZZER: Test beep cancelled': 31,
+    'CONTROL_BUZZER: Task stopped': 32,
+    'CONTROL_BUZZER: Start tone cancelled': 33,
+    'CONTROL_BUZZER: Error tone cancelled': 34,
+    'CONTROL_BUZZER: Confirm tone cancelled': 35,
+    'CONTROL_BUZZER: Done tone cancelled': 36,
+    'WiFi settings: retry_interval=%ss, max_attempts=%s, attempt_delay=%ss': 37,
+    'WiFi retry interval not elapsed, waiting %.1fs more': 38,
+    'Resetting WiFi adapter': 39,
+    'Waiting for connection... (%d/%d)': 40,
+    'Network scan failed: %s': 41,
+    'Failed to check signal strength: %s': 42,
+    'Target network found: %s, RSSI: %s': 43,
+    'WiFi disconnected, attempting reconnection...': 44,
+    'DISPLAY: Restarting screen presentation': 45,
+    'DISPLAY: Start screen presentation': 46,
+    'DISPLAY: Stop screen presentation': 47,
+    'DISPLAY: No screens to present.': 48,
+    'DSRTC: Failed to connect to WiFi for NTP sync': 49,
+    'LEAK SENSORS: Leak sensor monitoring has stoped': 50,
+    'LEAK SENSORS: Continuing to monitor sensors for dry state': 51,
+    'LEAK SENSOR: Update leak sensor state: ZONE 1: %s, ZONE 2: %s': 52,
+    'LEAK SENSORS: Leaks detected during system startup - initiating emergency sequence': 53,
+    'LEAK SENSORS: Zone 1 sensor recovered (became dry)': 54,
+    'LEAK SENSORS: Zone 2 sensor recovered (became dry)': 55,
+    'LEAK SENSORS: All sensors recovered - fully resetting alarm state': 56,
+    'LEAK SENSORS: Emergency valve closure initiated during startup': 57,
+    'LEAK SENSORS: Heater powered off during startup': 58,
+    'LEAK SENSORS: Alarm buzzer started during startup': 59,
+    'LEAK SENSORS: Startup leak check passed - sensors became dry during stabilization': 60,
+    'LEAK SENSOR: Starting emergency sequence - closing valves and starting alarm': 61,
+    'TEMP SENSORS: Temperature sensor monitoring has stopped': 62,
+    'Attempting to reinitialize hot water temp sensor...': 63,
+    'TEMP SENSORS: No working temperature sensors found, all using stubs': 64,
+    'TEMP SENSORS: Updated %s: %s°C (significant change: %s)': 65,
+    'TEMP SENSORS: Memory-only update %s: %s°C': 66,
+    'Hot water temp sensor successfully reinitialized': 67,
+    'Hot water temperature sensor marked as FAILED, switching to stub': 68,
+    'Heater temperature sensor marked as FAILED, switching to stub': 69,
+    'All state files corrupted, creating new state file': 70,
+    'STATES: Loaded status data from file': 71,
+    'STATES: Created new state file %s with None states of all devices.': 72,
+    'STATES: Scheduled write for %s (critical: %s)': 73,
+    'STATES: Force writing all pending changes': 74,
+    'State file successfully written: %s': 75,
+    'Emergency backup created in memory': 76,
+    'STATES: Write scheduler stopped and pending writes flushed': 77,
+    'STATES: Batched write completed for %d devices': 78,
+    'STATES: State changed %s: %s -> %s': 79,
+    'Too many write failures, filesystem may be corrupted': 80,
+    'STATES: Batched write for %s:%s': 81,
+    'VALVES: Activated emergency valve closure': 82,
+    "VALVE: Start closing valve '%s', %s sec remaining": 83,
+    "VALVE: Finished closing valve '%s'": 84,
+    "VALVE: Closing task for valve '%s' was canceled": 85,
+    "VALVE: Start opening valve '%s', %s sec remaining": 86,
+    "VALVE: Finished opening valve '%s'": 87,
+    "VALVE: Opening task for valve '%s' was canceled": 88,
+    'SERVER: Loop starting': 89,
+    'SERVER: Client from %s': 90,
+    'SERVER: Rebooting device by user request': 91,
+    'SERVER: WiFi not connected': 92,
+    'SERVER: Socket not initialized': 93,
+    'BLACKBOX: %s %s %s': 94,
+    'LEAK SENSOR: Emergency closure issued %d ms after the %s edge': 95,
+    'LEAK SENSOR: Starting emergency sequence - valves closing, starting alarm': 96,
+    'LEAK SENSORS: %d leak zones have start monitoring': 97,
+    'LEAK SENSOR: Update leak sensor state: triggered zones 0x%x': 98,
+    'LEAK SENSOR: NEW leak detected in %s': 99,
+    'LEAK SENSORS: %s sensor recovered (became dry)': 100,
+    'LEAK SENSOR: %s sensor recovered (became dry)': 101,
+    'INPUTS: %d wakeups/s, scanner busy %s%%': 102,
+    'TEMP SENSORS: Conversion cycle of %d sensors took %d ms': 103,
+    'TEMP SENSORS: Unassigned sensor %s on pin %d': 104,
+    'TEMP SENSORS: %s bound to ROM %s on pin %d': 105,
+    'TEMP SENSORS: %s marked as FAILED, switching to stub': 106,
+    'TEMP SENSORS: %s not found on pin %d': 107,
+    'TEMP SENSORS: Next poll in %d s': 108,
+    'TEMP SENSORS: %s bound to ROM %s on pin %d (%d ms conversion)': 109,
+    'TEMP SENSORS: %s reading %s rejected by the filter': 110,
+    'FLOW METER: Counting pulses on pin %d': 111,
+    'FLOW METER: Flow stopped after %d s': 112,
+    'FLOW METER: Continuous flow of %.2f l/min for %d min': 113,
+    'LEAK SENSORS: External leak alarms released by the user': 114,
+    'CONSUMPTION: Unknown file layout, starting from zero': 115,
+    'LEAK SENSOR: %s probe fault (open or shorted, level %d)': 116,
+    "VALVE: '%s' overcurrent while %s (level %d), motor cut": 117,
+    "VALVE: '%s' did not reach the end stop within %d s while %s": 118,
+    "VALVE: '%s' reached the end stop after %d ms %s": 119,
+    "VALVES: '%s' %s coalesced": 120,
+    "VALVES: Emergency close of '%s' dropped %d queued command(s)": 121,
+    "VALVES: Failed to %s '%s': %s": 122,
+    'VALVE: Failed to write %s: %s': 123,
+    "VALVES: '%s' exercise %s, breakaway %d ms, peak current %d": 124,
+    'VALVES: Exercise started': 125,
+    "VALVES: '%s' flagged: exercise %s, breakaway %d ms, peak current %d": 126,
+    'VALVES: Unknown exercise history layout, starting over': 127,
+    'VALVES: Exercise skipped, %s': 128,
+    'VALVES: Exercise failed: %s': 129,
+    'VALVES: Failed to write %s: %s': 130,
+    'VALVES: Exercise stopped, %s': 131,
+    'HEATER: Relay %s at %s C, setpoint %s': 132,
+    "HEATER: No reading of '%s', heating paused": 133,
+    'HEATER: Thermostat %s': 134,
+    'HEATER: Thermostat step failed: %s': 135,
+    'TEMP SENSORS: %s lost its resolution, set %d bits again': 136,
+    'TEMP SENSORS: Failed to check resolution of %s: %s': 137,
+    'Main: Black box of the previous session (%d events):': 138,
+    'Main: Uncaught task exception: %s': 139,
+    'Main: Failed to initialize Heater Thermostat: %s': 140,
+    'Main: Failed to initialize Flow Meter: %s': 141,
+    'Main: Failed to initialize Valve Exercise: %s': 142,
+    'Main: Failed to schedule the valve exercise: %s': 143,
+    'INPUTS: Callback failed: %s': 144,
+    'LEAK SENSOR: Emergency shutdown failed: %s': 145,
+    'TEMP SENSORS: Failed to save ROM registry: %s': 146,
+    'TEMP SENSORS: %s error #%d: %s': 147,
+    'TEMP SENSORS: Failed to update memory-only for %s: %s': 148,
+    'TEMP SENSORS: Failed to scan bus on pin %d: %s': 149,
+    'TEMP SENSORS: Failed to start conversion on pin %d: %s': 150,
+    'TEMP SENSORS: Failed to set resolution of %s: %s': 151,
+    'CONSUMPTION: Failed to write %s: %s': 152,
+}
@@ -34,6 +34,11 @@ class Logger:
         self.handlers = ()
         self.parent = None
         self.propagate = True
+        self._dest = None
+        # Single pooled record: handlers format synchronously in emit(), so
+        # it can be reused once they return. Nested log() calls made while
+        # it is in use get a fresh record.
+        self._record = None
 
     def _level_str(self, level):
         l = _level_dict.get(level)
@@ -43,36 +48,61 @@ class Logger:
 
     def setLevel(self, level):
         self.level = level
+        self._dest = None
+
+    def _get_dest(self):
+        # The logger that owns the effective level and the handlers is
+        # resolved once and cached until setLevel() is called again.
+        dest = self._dest
+        if dest is None:
+            dest = self
+            while dest.level == NOTSET and dest.parent:
+                dest = dest.parent
+            self._dest = dest
+        return dest
+
+    def getEffectiveLevel(self):
+        return self._get_dest().level
 
     def isEnabledFor(self, level):
-        return level >= self.level
+        return level >= self._get_dest().level
 
     def log(self, level, msg, *args):
-        dest = self
-        while dest.level == NOTSET and dest.parent:
-            dest = dest.parent
-        if level >= dest.level:
-            record = LogRecord(
-                self.name, level, None, None, msg, args, None, None, None
-            )
-
-            if dest.handlers:
+        dest = self._get_dest()
+        if level >= dest.level and dest.handlers:
+            record = self._record
+            if record is None:
+                record = LogRecord(
+                    self.name, level, None, None, msg, args, None, None, None
+                )
+            else:
+                self._record = None
+                record.reset(self.name, level, msg, args)
+
+            try:
                 for hdlr in dest.handlers:
                     hdlr.emit(record)
+            finally:
+                record.args = record.message = None
+                self._record = record
 
     def debug(self, msg, *args):
-        self.log(DEBUG, msg, *args)
+        if self.isEnabledFor(DEBUG):
+            self.log(DEBUG, msg, *args)
 
     def info(self, msg, *args):
-        self.log(INFO, msg, *args)
+        if self.isEnabledFor(INFO):
+            self.log(INFO, msg, *args)
 
     def warning(self, msg, *args):
-        self.log(WARNING, msg, *args)
+        if self.isEnabledFor(WARNING):
+            self.log(WARNING, msg, *args)
 
     warn = warning
 
     def error(self, msg, *args):
-        self.log(ERROR, msg, *args)
+        if self.isEnabledFor(ERROR):
+            self.log(ERROR, msg, *args)
 
     def critical(self, msg, *args):
         self.log(CRITICAL, msg, *args)
@@ -152,20 +182,64 @@ class Formatter:
             raise ValueError("Style must be one of: %, {")
 
         self.style = style
+        self._template, self._fields = self._compile()
+        self._uses_time = "asctime" in self._fields
 
     def usesTime(self):
+        return self._uses_time
+
+    def _compile(self):
+        """Parse the format string once into a positional template and the
+        list of record attributes that fill it."""
+        fmt = self.fmt
+        n = len(fmt)
+        template = ""
+        fields = []
+        i = 0
+
         if self.style == "%":
-            return "%(asctime)" in self.fmt
-        elif self.style == "{":
-            return "{asctime" in self.fmt
+            while i < n:
+                start = fmt.find("%(", i)
+                if start == -1:
+                    template += fmt[i:]
+                    break
+                end = fmt.find(")", start)
+                if end == -1:
+                    raise ValueError("Invalid format string: " + fmt)
+                fields.append(fmt[start + 2:end])
+                # Conversion flags, width and precision followed by the type
+                j = end + 1
+                while j < n and fmt[j] in "#0- +.123456789":
+                    j += 1
+                template += fmt[i:start] + "%" + fmt[end + 1:j + 1]
+                i = j + 1
+        else:
+            while i < n:
+                start = fmt.find("{", i)
+                if start == -1:
+                    template += fmt[i:]
+                    break
+                if fmt[start + 1:start + 2] == "{":
+                    template += fmt[i:start + 2]
+                    i = start + 2
+                    continue
+                j = start + 1
+                while j < n and fmt[j] not in "}:!":
+                    j += 1
+                template += fmt[i:start] + "{" + str(len(fields))
+                fields.append(fmt[start + 1:j])
+                i = j
+
+        return template, tuple(fields)
 
     def format(self, record):
         # The message attribute of the record is computed using msg % args.
-        record.message = record.msg % record.args
+        # Arguments are applied here, only for records that passed the level check.
+        record.message = record.msg % record.args if record.args else record.msg
 
         # If the formatting string contains '(asctime)', formatTime() is called to
         # format the event time.
-        if self.usesTime():
+        if self._uses_time:
             record.asctime = self.formatTime(record, self.datefmt)
 
         # If there is exception information, it is formatted using formatException()
@@ -175,16 +249,11 @@ class Formatter:
             record.exc_text += self.formatException(record.exc_info)
             record.message += "\n" + record.exc_text
 
-        # The record’s attribute dictionary is used as the operand to a string
-        # formatting operation.
+        # The precompiled template is filled with the record attributes in order.
+        values = tuple([getattr(record, field, None) for field in self._fields])
         if self.style == "%":
-            return self.fmt % record.__dict__
-        elif self.style == "{":
-            return self.fmt.format(**record.__dict__)
-        else:
-            raise ValueError(
-                "Style {0} is not supported by logging.".format(self.style)
-            )
+            return self._template % values
+        return self._template.format(*values)
 
     def formatTime(self, record, datefmt=None):
         assert datefmt is None  # datefmt is not supported
@@ -199,22 +268,37 @@ class Formatter:
 
 
 class LogRecord:
+
+    __slots__ = (
+        "created", "name", "levelno", "levelname", "pathname", "lineno", "msg",
+        "args", "exc_info", "exc_text", "func", "sinfo", "message", "asctime",
+    )
+
     def __init__(
         self, name, level, pathname, lineno, msg, args, exc_info, func=None, sinfo=None
     ):
-        ct = utime.time()
-        self.created = ct
-        self.msecs = (ct - int(ct)) * 1000
-        self.name = name
-        self.levelno = level
-        self.levelname = _level_dict.get(level, None)
         self.pathname = pathname
         self.lineno = lineno
-        self.msg = msg
-        self.args = args
         self.exc_info = exc_info
+        self.exc_text = ""
         self.func = func
         self.sinfo = sinfo
+        self.reset(name, level, msg, args)
+
+    def reset(self, name, level, msg, args):
+        """Reinitialise a pooled record for a new event"""
+        self.created = utime.time()
+        self.name = name
+        self.levelno = level
+        self.levelname = _level_dict.get(level, None)
+        self.msg = msg
+        self.args = args
+        self.message = None
+        self.asctime = None
+
+    @property
+    def msecs(self):
+        return (self.created - int(self.created)) * 1000
 
 
 # root = Logger("root")
@@ -35,6 +35,27 @@ class RotatingFileHandler(Handler):
         msg = self.formatter.format(record)
         s_len = len(msg)
 
+        self._rotate_if_needed(s_len)
+
+        with open(self.filename, "a") as f:
+            f.write(msg + "\n")
+
+        self._counter += s_len
+
+    def write_block(self, data) -> None:
+        """Append an already formatted block of lines with a single open/close."""
+        s_len = len(data)
+        if not s_len:
+            return
+
+        self._rotate_if_needed(s_len)
+
+        with open(self.filename, "ab") as f:
+            f.write(data)
+
+        self._counter += s_len
+
+    def _rotate_if_needed(self, s_len: int) -> None:
         if self.maxBytes and self.backupCount and self._counter + s_len > self.maxBytes:
             # remove the last backup file if it is there
             try_remove(self.filename + ".{0}".format(self.backupCount))
@@ -53,9 +74,4 @@ class RotatingFileHandler(Handler):
                 os.rename(self.filename, self.filename + ".1")
             except OSError:
                 pass
-            self._counter = 0
-
-        with open(self.filename, "a") as f:
-            f.write(msg + "\n")
-
-        self._counter += s_len
\ No newline at end of file
+            self._counter = 0
\ No newline at end of file
@@ -88,5 +88,7 @@ class DsRTC(Singleton):
                 
     def alarm_triggered(self, pin):
         self._logger.info(f'DSRTC: Timer ALARM tgriggered')
+        # Clearing the flag releases the INT pin for the next alarm
+        self._ds.check_alarm(1)
         if self._action_handler:
             self._action_handler()
@@ -33,9 +33,31 @@ STATE_WRITE_INTERVAL: int = 30
 STATE_MAX_WRITE_DELAY: int = 300
 
 # Temperature update frequency optimization
-# How often to actually write temperature changes to disk (in update cycles)
-# E.g., value of 3 means write every 3rd temperature update
-TEMP_WRITE_FREQUENCY: int = 2
+# How often to write a temperature to disk when it changed less than 0.5°C (seconds),
+# independent of the polling interval
+TEMP_WRITE_INTERVAL: int = 60
+
+# LOGGING
+# Minimum level of log records: 10 - DEBUG, 20 - INFO, 30 - WARNING, 40 - ERROR, 50 - CRITICAL
+LOG_LEVEL: int = 10
+# Write log records to a rotating file on flash in addition to the console
+LOG_FILE_ENABLED: bool = False
+# Log file name and rotation limits
+LOG_FILE_NAME: str = 'app.log'
+LOG_FILE_MAX_BYTES: int = 16384
+LOG_FILE_BACKUP_COUNT: int = 2
+# Store the log file as compact binary records (decode with Tools/log_decode.py)
+LOG_FILE_BINARY: bool = False
+# Size of the in-RAM log ring buffer in bytes (records that do not fit are dropped and counted)
+LOG_BUFFER_SIZE: int = 2048
+# Flush the log buffer to flash once it holds this many bytes
+LOG_FLUSH_THRESHOLD: int = 1536
+# Maximum time a record stays in the buffer before being flushed (milliseconds)
+LOG_FLUSH_INTERVAL_MS: int = 5000
+# Black box: file with the last events written right before a reset
+BLACKBOX_FILE: str = 'blackbox.bin'
+# Number of events kept in the black box (max 255)
+BLACKBOX_EVENTS: int = 32
 
 # WIFI MANAGEMENT SETTINGS
 # Initial retry interval for WiFi connection attempts (seconds)
@@ -76,10 +98,39 @@ SDA_PIN = 18
 # HEATER
 # Pin to switch the water heater on/off
 POWER_HEATER_PIN = 11
+# Thermostat: while the heater is switched on the relay follows HEATER_THERMOSTAT_SENSOR,
+# on at or below SETPOINT - HYSTERESIS (C), off at SETPOINT. The relay stays at least
+# MIN_ON_S / MIN_OFF_S in a state. HEATER_SCHEDULE sets the setpoint by local time:
+# (hour, minute, setpoint), None keeps the heater off (no heating at night).
+# Empty schedule: HEATER_SETPOINT all day. False: the relay follows the switch only
+HEATER_THERMOSTAT = True
+HEATER_THERMOSTAT_SENSOR = 'heater_temp'
+HEATER_THERMOSTAT_INTERVAL = 30
+HEATER_SETPOINT = 55
+HEATER_HYSTERESIS = 5
+HEATER_MIN_ON_S = 300
+HEATER_MIN_OFF_S = 300
+HEATER_SCHEDULE = ((6, 0, 55), (23, 0, None))
 
 # VALVES
 # Valve opening/closing duration in seconds
 VALVES_OPERATION_TIME = 21
+# Minimum interval between valve progress updates (display redraws) in ms
+VALVES_PROGRESS_INTERVAL_MS = 2000
+# Minimum gap between two valve motor starts in ms, keeps the inrush currents apart
+VALVES_START_STAGGER_MS = 200
+# Valve position estimate (percent open) from the motor-on time, saved every STEP percent.
+# Fixed-time runs cover the remaining travel plus MARGIN percent instead of the full time
+VALVES_POSITION_STEP = 10
+VALVES_POSITION_MARGIN = 20
+# Anti-seize exercise of the open valves: every DAYS days (0 = off), checked daily at
+# TIME (local hour, minute), close by TRAVEL percent and reopen. A run with a breakaway
+# time or peak current above DEGRADED percent of the earlier runs flags the valve
+VALVES_EXERCISE_DAYS = 7
+VALVES_EXERCISE_TIME = (3, 30)
+VALVES_EXERCISE_TRAVEL = 25
+VALVES_EXERCISE_DEGRADED = 150
+VALVES_EXERCISE_FILE = 'valve_exercise.bin'
 # Pin to open hot water valve
 OPEN_HOT_W_PIN = 0
 # Pin to close hot water valve
@@ -96,19 +147,96 @@ ERROR_COLD_W_PIN = 5
 OPEN_HEATER_W_PIN = 6
 # Pin to close heater valve
 CLOSE_HEATER_W_PIN = 7
+# End-of-travel detection: None runs the motor for VALVES_OPERATION_TIME,
+# "limit" stops when the limit switch on ERROR_*_W_PIN closes (low),
+# "current" stops on the motor current read on VALVES_CURRENT_PINS.
+# Without the end stop within VALVES_OPERATION_TIME the valve state is "error"
+VALVES_FEEDBACK = None
+# ADC pin of the motor current shunt per valve ("current" mode)
+VALVES_CURRENT_PINS = {}
+# Stop signals are ignored this long after the motor starts (inrush, switch release)
+VALVES_MIN_TRAVEL_MS = 2000
+# Current levels (read_u16): idle = actuator limit switch opened, stall = against the stop,
+# overcurrent = jammed or shorted, the motor is cut and the valve reports "error"
+VALVES_IDLE_CURRENT = 2000
+VALVES_STALL_CURRENT = 30000
+VALVES_OVERCURRENT = 55000
+# Feedback sampling interval while the motor runs
+VALVES_FEEDBACK_POLL_MS = 20
 
 # Pin for alarm signal from RTC
 DSDTC_ALARM_PIN = 10
 
 # SENSORS
-# Polling interval for temperature sensors in seconds
-TEMP_SENSOR_POLLING_TIME = 30
+# Longest polling interval for temperature sensors in seconds, reached by
+# doubling the interval while all readings stay within TEMP_POLL_DEADBAND
+TEMP_SENSOR_POLLING_TIME = 240
+# Polling interval while temperatures change or the heater is on, in seconds
+TEMP_POLL_FAST_INTERVAL = 5
+# Temperature change (°C) between two polls that counts as "changing";
+# keep it above one resolution step (0.25 °C at 10 bits) to ignore LSB jitter
+TEMP_POLL_DEADBAND = 0.3
+# Temperature filter: median window (samples), EMA weight of a new median and
+# the fastest plausible change in °C per second (over at most three fast polls,
+# so a slow poll does not widen it); faster jumps and the DS18B20 85.0
+# power-on value are dropped until they persist for a whole window
+TEMP_FILTER_WINDOW = 5
+TEMP_FILTER_ALPHA = 0.5
+TEMP_FILTER_MAX_RATE = 0.5
 # Pin for hot water temperature sensor
 HWLT_SE1_PIN = 12
 # Pin for heater temperature sensor
 HEATER_TEMP_PIN = 13
+# Temperature sensors: name (state key), title (web), pin (OneWire bus),
+# resolution (9-12 bits: 94/188/375/750 ms conversion, default 12) and an
+# optional rom (16 hex digits) to pin the name to one DS18B20. Any number of
+# sensors can share a pin; sensors without rom are bound to the ROMs found on
+# the bus and the binding is remembered in TEMP_ROMS_FILE.
+TEMP_SENSORS = [
+    {"name": "hot_water_temp", "title": "Hot Water line", "pin": HWLT_SE1_PIN, "resolution": 10},
+    {"name": "heater_temp", "title": "Heater", "pin": HEATER_TEMP_PIN, "resolution": 10},
+]
+# File with the ROM-to-name bindings of the temperature sensors
+TEMP_ROMS_FILE = 'temp_roms.json'
+# Interval of the OneWire bus rescans for hot-plugged sensors in seconds
+TEMP_RESCAN_INTERVAL = 600
 
 # Pin for water leak sensor in zone #1
 LEAK_ZONE1_PIN = 14
 # Pin for water leak sensor in zone #2
-LEAK_ZONE2_PIN = 15
\ No newline at end of file
+LEAK_ZONE2_PIN = 15
+# Leak zones: name (state key), title (LCD/web), pin, pull ("up"/"down"/None),
+# leak_level (pin level that means leak) and the actuators shut off by the zone
+# ("valves" - valve keys to close, "heater" - power off the heater).
+# "mode": "analog" reads a resistive probe on an ADC pin (GP26-GP28) instead:
+# wet below "wet", dry again above "dry", probe fault above "open" or below
+# "short" (read_u16 levels; the level is logged on every change for calibration).
+# Zone pins must be distinct GPIOs.
+LEAK_ZONES = [
+    {"name": "zone_1", "title": "Zone 1", "pin": LEAK_ZONE1_PIN, "pull": "up", "leak_level": 0,
+     "valves": ("hot_water_valve", "cold_water_valve"), "heater": True},
+    {"name": "zone_2", "title": "Zone 2", "pin": LEAK_ZONE2_PIN, "pull": "up", "leak_level": 0,
+     "valves": ("hot_water_valve", "cold_water_valve"), "heater": True},
+]
+# Leak pin edges must be stable this long before they are handled (milliseconds)
+LEAK_DEBOUNCE_MS = 30
+# Sampling period of the input scanner for buttons and leak pins (milliseconds);
+# a pin changes state after 4 consecutive samples at the new level
+INPUT_SCAN_INTERVAL_MS = 10
+# Analog leak probes: samples per burst (trimmed mean) and sampling period (milliseconds)
+LEAK_ANALOG_SAMPLES = 16
+LEAK_ANALOG_INTERVAL_MS = 500
+
+# Pin of the hall-effect flow meter on the main supply (None - no flow meter)
+FLOW_METER_PIN = None
+# Flow meter pulses per liter (YF-S201: 450, i.e. 7.5 Hz per l/min)
+FLOW_PULSES_PER_LITER = 450
+# Window of the flow rate calculation in seconds
+FLOW_WINDOW = 5
+# Flow above this rate (l/min) for longer than FLOW_LEAK_MAX_MINUTES raises a leak alarm
+FLOW_LEAK_MIN_LPM = 0.3
+FLOW_LEAK_MAX_MINUTES = 30
+# Water consumption totals (24 hours, 31 days, 24 months) and how often the
+# changed totals are written to it in seconds
+CONSUMPTION_FILE = 'consumption.bin'
+CONSUMPTION_SAVE_INTERVAL = 300
\ No newline at end of file
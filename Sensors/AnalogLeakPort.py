@@ -0,0 +1,82 @@
+from machine import ADC
+from array import array
+import Helpers.DeviceStates as DeviceStates
+import Resources.Settings as Settings
+import time
+
+class AnalogLeakPort:
+    """Resistive leak probe on an ADC pin (GP26-GP28).
+
+    Every read is a burst of samples into a preallocated array('H'), reduced
+    to a trimmed mean. The probe is wet below `wet` and dry again above `dry`
+    (hysteresis); readings above `open_level` or below `short_level` mean an
+    open or shorted probe and are reported as a sensor fault.
+    """
+
+    def __init__(self, name: str, pin_id: int, handler, dry: int, wet: int, open_level: int, short_level: int) -> None:
+        self.adc = ADC(pin_id)
+        self.pin_id = pin_id
+        self.bit = 1 << pin_id
+        self.name = name
+        self.handler = handler  # handler(port, state)
+        self._dry = dry
+        self._wet = wet
+        self._open_level = open_level
+        self._short_level = short_level
+        self._samples = array('H', bytes(2 * getattr(Settings, 'LEAK_ANALOG_SAMPLES', 16)))
+        self._is_wet = False
+        self._last_state = None  # Track last reported state to avoid duplicate calls
+        self.last_edge_ms = None  # When the last change was sampled, for latency reports
+        self.level = 0  # Last trimmed mean, logged on every change for calibration
+
+    def stop(self) -> None:
+        pass
+
+    def start(self) -> None:
+        self._last_state = self.get_leak_state()
+
+    def get_leak_state(self) -> str:
+        level = self.read_level()
+        if level >= self._open_level or level <= self._short_level:
+            return DeviceStates.FAULT
+
+        if self._is_wet:
+            self._is_wet = level < self._dry
+        else:
+            self._is_wet = level <= self._wet
+        return DeviceStates.LEAK if self._is_wet else DeviceStates.NO_LEAK
+
+    def is_detected_leak(self) -> bool:
+        return self.get_leak_state() == DeviceStates.LEAK
+
+    def read_level(self) -> int:
+        samples = self._samples
+        read = self.adc.read_u16
+        count = len(samples)
+        for i in range(count):
+            samples[i] = read()
+
+        # Insertion sort in place, then average without the lowest and highest quarter
+        for i in range(1, count):
+            value = samples[i]
+            j = i - 1
+            while j >= 0 and samples[j] > value:
+                samples[j + 1] = samples[j]
+                j -= 1
+            samples[j + 1] = value
+        cut = count // 4
+        total = 0
+        for i in range(cut, count - cut):
+            total += samples[i]
+        self.level = total // (count - 2 * cut)
+        return self.level
+
+    def leak_handler(self) -> None:
+        sampled_ms = time.ticks_ms()
+        current_state = self.get_leak_state()
+
+        # Only call handler if state actually changed
+        if current_state != self._last_state:
+            self._last_state = current_state
+            self.last_edge_ms = sampled_ms
+            self.handler(self, current_state)
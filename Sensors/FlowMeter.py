@@ -0,0 +1,89 @@
+from machine import Pin
+import Resources.Settings as Settings
+from Logging.AppLogger import AppLogger
+from Sensors.WaterConsumption import WaterConsumption
+import uasyncio as asyncio
+import time
+
+class FlowMeter:
+    """Hall-effect flow meter on Settings.FLOW_METER_PIN.
+
+    Pulses are counted by a hard IRQ into an integer; a task turns the count
+    into flow rate and volume once per window. Flow that stays above
+    FLOW_LEAK_MIN_LPM for FLOW_LEAK_MAX_MINUTES is raised as a leak through
+    the LeakSensors alarm path.
+    """
+
+    def __init__(self, leak_sensors=None):
+        self.logger = AppLogger()
+        self.leak_sensors = leak_sensors
+        self.pin_id = Settings.FLOW_METER_PIN
+        self.pin = Pin(self.pin_id, Pin.IN, Pin.PULL_UP)
+        self.bit = 1 << self.pin_id
+        self.pulses_per_liter = getattr(Settings, 'FLOW_PULSES_PER_LITER', 450)
+        self._window_s = getattr(Settings, 'FLOW_WINDOW', 5)
+        self._leak_lpm = getattr(Settings, 'FLOW_LEAK_MIN_LPM', 0.3)
+        self._leak_after_ms = getattr(Settings, 'FLOW_LEAK_MAX_MINUTES', 30) * 60000
+        self._task = None
+        self.consumption = WaterConsumption()
+
+        self._pulses = 0  # Written by the IRQ only
+        self._last_pulses = 0
+        self._last_ms = time.ticks_ms()
+        self.flow_lpm = 0.0
+        self._flow_since = None  # Start of the current continuous flow
+        self._leak_reported = False
+
+        if leak_sensors:
+            leak_sensors.register_external_leak(self.bit, "flow", "Flow")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._last_pulses = self._pulses
+            self._last_ms = time.ticks_ms()
+            self.pin.irq(trigger=Pin.IRQ_FALLING, handler=self._on_pulse, hard=True)
+            self._task = asyncio.create_task(self._monitor_flow())
+            self.logger.info("FLOW METER: Counting pulses on pin %d", self.pin_id)
+
+    def stop(self) -> None:
+        self.pin.irq(handler=None)
+        self._task = None
+        self.consumption.save()
+
+    def get_total_pulses(self) -> int:
+        return self._pulses
+
+    def get_total_liters(self) -> float:
+        return self._pulses / self.pulses_per_liter
+
+    # MARK: Helpers
+    def _on_pulse(self, pin) -> None:
+        self._pulses += 1
+
+    async def _monitor_flow(self):
+        while self._task is not None:
+            await asyncio.sleep(self._window_s)
+            now = time.ticks_ms()
+            pulses = self._pulses
+            elapsed_ms = max(time.ticks_diff(now, self._last_ms), 1)
+            self.flow_lpm = (pulses - self._last_pulses) * 60000 / (self.pulses_per_liter * elapsed_ms)
+            self.consumption.add_pulses(pulses - self._last_pulses)
+            self._last_pulses = pulses
+            self._last_ms = now
+            self._check_continuous_flow(now)
+
+    def _check_continuous_flow(self, now: int) -> None:
+        if self.flow_lpm < self._leak_lpm:
+            if self._flow_since is not None:
+                self.logger.debug("FLOW METER: Flow stopped after %d s", time.ticks_diff(now, self._flow_since) // 1000)
+            self._flow_since = None
+            self._leak_reported = False
+            return
+
+        if self._flow_since is None:
+            self._flow_since = now
+        elif not self._leak_reported and time.ticks_diff(now, self._flow_since) >= self._leak_after_ms:
+            self._leak_reported = True
+            self.logger.critical("FLOW METER: Continuous flow of %.2f l/min for %d min", self.flow_lpm, self._leak_after_ms // 60000)
+            if self.leak_sensors:
+                self.leak_sensors.report_external_leak(self.bit)
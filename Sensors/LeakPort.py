@@ -1,22 +1,43 @@
-from machine import Pin
+from machine import Pin, Timer
 import Helpers.DeviceStates as DeviceStates
-import uasyncio as asyncio
+import Resources.Settings as Settings
+from Helpers.InputScanner import InputScanner
+import time
 
 class LeakPort:
-    def __init__(self, name: str, pin_id: int, handler) -> None:
-        self.pin: Pin = Pin(pin_id, Pin.IN, Pin.PULL_UP)  # Added pull-up for better reliability
+
+    # Spacing of the 2-of-3 vote samples, so they do not sample the same instant
+    _VOTE_SPACING_US = 200
+
+    def __init__(self, name: str, pin_id: int, handler, pull=Pin.PULL_UP, leak_level: int = 0) -> None:
+        self.pin: Pin = Pin(pin_id, Pin.IN, pull)
+        self.pin_id = pin_id
+        self.bit = 1 << pin_id
         self.name = name
-        self.handler = handler
-        self._task = None
+        self.handler = handler  # handler(port, state)
+        self._leak_level = leak_level
+        self._active = False
         self._last_state = None  # Track last reported state to avoid duplicate calls
+        self._debounce_ms = getattr(Settings, 'LEAK_DEBOUNCE_MS', 30)
+        self._debounce_timer = Timer()
+        self._scanner = InputScanner()
+        self._edge_pending = False
+        self.last_edge_ms = None  # First edge of the last debounced change, for latency reports
 
     def stop(self) -> None:
-       if self._task is not None:
-            self._task = None
+        self.pin.irq(handler=None)
+        self._debounce_timer.deinit()
+        if self._active:
+            self._scanner.unregister(self.pin_id)
+        self._active = False
 
     def start(self) -> None:
-       if self._task is None:
-            self._task = asyncio.create_task(self._monitor_leak())
+        if not self._active:
+            self._active = True
+            self._last_state = self.get_leak_state()
+            self.pin.irq(trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING, handler=self._on_edge)
+            # Scanned as well, as a safety net in case an edge was missed
+            self._scanner.register(self.pin_id, self._on_scanned, self._leak_level == 0)
 
     def get_leak_state(self) -> str:
         return DeviceStates.LEAK if self.is_detected_leak() else DeviceStates.NO_LEAK
@@ -24,24 +45,34 @@ class LeakPort:
     def is_detected_leak(self) -> bool:
         # Check pin state multiple times for debouncing
         readings = []
-        for _ in range(3):
-            readings.append(self.pin.value() == 0)
-        
+        for i in range(3):
+            if i:
+                time.sleep_us(self._VOTE_SPACING_US)
+            readings.append(self.pin.value() == self._leak_level)
+
         # Return True only if at least 2 out of 3 readings indicate leak
         return sum(readings) >= 2
-    
+
     def leak_handler(self) -> None:
         current_state = self.get_leak_state()
-        
+
         # Only call handler if state actually changed
         if current_state != self._last_state:
             self._last_state = current_state
-            self.handler(current_state)
-
-    async def _monitor_leak(self):
-        # Initialize last state
-        self._last_state = self.get_leak_state()
-        
-        while self._task is not None:
-            self.leak_handler()
-            await asyncio.sleep(1)  # Check every second for better responsiveness
\ No newline at end of file
+            self.handler(self, current_state)
+
+    # Edge IRQ: every bounce restarts the one-shot debounce timer
+    def _on_edge(self, pin) -> None:
+        if not self._edge_pending:
+            self._edge_pending = True
+            self.last_edge_ms = time.ticks_ms()
+        self._debounce_timer.init(mode=Timer.ONE_SHOT, period=self._debounce_ms, callback=self._on_debounced, hard=False)
+
+    # Scheduled timer callback: the level has been stable for the debounce window
+    def _on_debounced(self, timer) -> None:
+        self._edge_pending = False
+        self.leak_handler()
+
+    # Debounced change seen by the input scanner
+    def _on_scanned(self, leak: bool) -> None:
+        self.leak_handler()
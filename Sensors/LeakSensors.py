@@ -1,14 +1,19 @@
+from machine import Pin
 from Sensors.LeakPort import LeakPort
+from Sensors.AnalogLeakPort import AnalogLeakPort
 import Resources.Settings as Settings
 from State.States import States
-import Helpers.DeviceNames as DeviceNames
 from Buzzers.Buzzers import Buzzers
 from Logging.AppLogger import AppLogger
 import Helpers.DeviceStates as DeviceStates
+from Helpers.LeakZones import get_leak_zones, ALL_VALVES
 from LCD.Display import Display
 from Valves.WaterLineValves import WaterLineValves
 from Heater.HeaterPowerSwith import HeaterPowerSwith
 import uasyncio as asyncio
+import time
+
+_PULLS = {"up": Pin.PULL_UP, "down": Pin.PULL_DOWN, None: None}
 
 class LeakSensors:
 
@@ -21,30 +26,71 @@ class LeakSensors:
         self._heater = heater
         self.logger = AppLogger()
         self.buzzers = Buzzers()
-        self.zone_1_leak = LeakPort(DeviceNames.ZONE_1_LEAK_SENSORS_KEY, Settings.LEAK_ZONE1_PIN, self._zone_1_leak_handler)
-        self.zone_2_leak = LeakPort(DeviceNames.ZONE_2_LEAK_SENSORS_KEY, Settings.LEAK_ZONE2_PIN, self._zone_2_leak_handler)
-        self._zone_1_leak_triggered = self.zone_1_leak.is_detected_leak()
-        self._zone_2_leak_triggered = self.zone_2_leak.is_detected_leak()
+
+        # One port per zone of Settings.LEAK_ZONES; zone bits are the GPIO bits of the pins
+        self.ports = []
+        self.analog_ports = []
+        self._zones = {}
+        for zone in get_leak_zones():
+            if zone["mode"] == "analog":
+                port = AnalogLeakPort(zone["name"], zone["pin"], self._leak_handler, zone["dry"], zone["wet"], zone["open"], zone["short"])
+                self.analog_ports.append(port)
+            else:
+                port = LeakPort(zone["name"], zone["pin"], self._leak_handler, _PULLS[zone["pull"]], zone["leak_level"])
+            self.ports.append(port)
+            self._zones[port.bit] = zone
+        self._analog_interval_ms = getattr(Settings, 'LEAK_ANALOG_INTERVAL_MS', 500)
+        self._analog_task = None
+
+        self._triggered_mask = 0  # Bits of the zones with a confirmed leak
+        self._external_mask = 0  # Triggered bits raised by other detectors (no sensor to dry out)
+        for port in self.ports:
+            if port.is_detected_leak():
+                self._triggered_mask |= port.bit
+        self._shut_valves = set()  # Valves already closed by the current alarm
+        self._heater_shut = False
         self._alarm_acknowledged = False  # Flag to track if user acknowledged the alarm
         self._update_leaks_sensor_state()
 
     def is_detected_leaks(self) -> bool:
-        return self._zone_1_leak_triggered == True or self._zone_2_leak_triggered == True
+        return self._triggered_mask != 0
+
+    def is_heater_locked(self) -> bool:
+        """The current alarm shut the heater off, it must not heat until the alarm is over"""
+        return self._heater_shut
+
+    def register_external_leak(self, bit: int, name: str, title: str, valves=ALL_VALVES, heater: bool = True) -> None:
+        """Add a leak source that is not a LeakPort, e.g. the flow meter (bit = its GPIO bit)"""
+        self._zones[bit] = {"name": name, "title": title, "valves": tuple(valves), "heater": heater}
+
+    def report_external_leak(self, bit: int) -> None:
+        """Raise a leak from a registered external source through the regular alarm path"""
+        if self._triggered_mask & bit:
+            return
+        self._triggered_mask |= bit
+        self._external_mask |= bit
+        self._alarm_acknowledged = False
+        self._emergency_shutdown(bit)
+        self.logger.warning("LEAK SENSOR: NEW leak detected in %s", self._zones[bit]["title"])
+        asyncio.create_task(self._handle_leak_alarm_async())
     
     def start(self):
-        self.zone_1_leak.start()
-        self.zone_2_leak.start()
+        for port in self.ports:
+            port.start()
+        if self.analog_ports and self._analog_task is None:
+            self._analog_task = asyncio.create_task(self._monitor_analog_ports())
         
         # Check for leaks detected during initialization and handle them
         if self.is_detected_leaks():
             self.logger.warning("LEAK SENSORS: Leaks detected during system startup - initiating emergency sequence")
             asyncio.create_task(self._handle_startup_leak_detection())
     
-        self.logger.info(f"LEAK SENSORS: Leak sensor [{self.zone_1_leak.name} and {self.zone_2_leak.name}] has start monitoring")
+        self.logger.info("LEAK SENSORS: %d leak zones have start monitoring", len(self.ports))
         
     def stop(self):
-        self.zone_1_leak.stop()
-        self.zone_2_leak.stop()
+        for port in self.ports:
+            port.stop()
+        self._analog_task = None
         self.logger.info("LEAK SENSORS: Leak sensor monitoring has stoped")
 
     def clear(self):
@@ -53,7 +99,11 @@ class LeakSensors:
 
         """Clear alarm sound and display, but keep sensor states until sensors are physically dry"""
         if self.is_detected_leaks(): 
-            self._alarm_acknowledged = True
+            # External leaks have no sensor that dries out: a second clear releases them
+            if self._alarm_acknowledged and self._external_mask:
+                self._release_external_leaks()
+            if self.is_detected_leaks():
+                self._alarm_acknowledged = True
             # Return display to normal state
             if self.display: 
                 self.display.reset_alarm()
@@ -64,41 +114,43 @@ class LeakSensors:
 
     # MARK: HELPERS
     def _update_leaks_sensor_state(self):
-        zone1 = self.zone_1_leak.get_leak_state()
-        zone2 = self.zone_2_leak.get_leak_state()
-       
         # Update states in memory
-        self.states.update_leak_sensor_state(self.zone_1_leak.name, zone1)
-        self.states.update_leak_sensor_state(self.zone_2_leak.name, zone2)
+        for port in self.ports:
+            self.states.update_leak_sensor_state(port.name, port.get_leak_state())
         
         # Check if sensors became dry after leak was detected
         self._check_sensor_recovery()
         
-        self.logger.debug(f"LEAK SENSOR: Update leak sensor state: ZONE 1: {zone1}, ZONE 2: {zone2}")
+        self.logger.debug("LEAK SENSOR: Update leak sensor state: triggered zones 0x%x", self._triggered_mask)
 
     def _check_sensor_recovery(self):
         """Check if sensors recovered (became dry) and reset triggers accordingly"""
-        zone1_is_dry = not self.zone_1_leak.is_detected_leak()
-        zone2_is_dry = not self.zone_2_leak.is_detected_leak()
-        
-        # Reset zone 1 trigger if sensor became dry
-        if self._zone_1_leak_triggered and zone1_is_dry:
-            self._zone_1_leak_triggered = False
-            self.logger.info("LEAK SENSORS: Zone 1 sensor recovered (became dry)")
-        
-        # Reset zone 2 trigger if sensor became dry
-        if self._zone_2_leak_triggered and zone2_is_dry:
-            self._zone_2_leak_triggered = False
-            self.logger.info("LEAK SENSORS: Zone 2 sensor recovered (became dry)")
+        for port in self.ports:
+            if self._triggered_mask & port.bit and not port.is_detected_leak():
+                self._triggered_mask &= ~port.bit
+                self.logger.info("LEAK SENSORS: %s sensor recovered (became dry)", self._zones[port.bit]["title"])
         
         # If all sensors recovered, reset alarm acknowledgment and zones
         if not self.is_detected_leaks():
             self.logger.info("LEAK SENSORS: All sensors recovered - fully resetting alarm state")
-            self._alarm_acknowledged = False
-            self.alarm_zones = None
+            self._reset_alarm_state()
             if self.display: 
                 self.display.reset_alarm()
 
+    async def _monitor_analog_ports(self):
+        # Analog probes have no edges: sample them all from one task
+        while self._analog_task is not None:
+            await asyncio.sleep_ms(self._analog_interval_ms)
+            for port in self.analog_ports:
+                port.leak_handler()
+
+    def _release_external_leaks(self):
+        self._triggered_mask &= ~self._external_mask
+        self._external_mask = 0
+        self.logger.info("LEAK SENSORS: External leak alarms released by the user")
+        if not self.is_detected_leaks():
+            self._reset_alarm_state()
+
     async def _handle_startup_leak_detection(self):
         """Handle leaks detected during system startup with the same algorithm as runtime detection"""
         try:
@@ -110,20 +162,16 @@ class LeakSensors:
                 zones = self._get_alarm_zones()
                 self.logger.critical(f"LEAK SENSORS: STARTUP LEAK DETECTION - Emergency sequence initiated for {zones}")
                 
-                # Step 1: Close valves immediately (same as runtime detection)
-                self.water_line_valves.leak_detected()
+                # Step 1: Close the valves and power off the heater mapped to the flooded zones
+                self._emergency_shutdown(self._triggered_mask)
                 self.logger.warning("LEAK SENSORS: Emergency valve closure initiated during startup")
                 
-                # Step 2: Power off heater (same as runtime detection)
-                self._heater.power_off()
-                self.logger.warning("LEAK SENSORS: Heater powered off during startup")
-                
-                # Step 3: Start alarm buzzer
+                # Step 2: Start alarm buzzer
                 self.buzzers.alarm.play_alarm()
                 self.logger.warning("LEAK SENSORS: Alarm buzzer started during startup")
                 await asyncio.sleep(0.1)  # Give alarm time to start
                 
-                # Step 4: Set zones and show alarm on display
+                # Step 3: Set zones and show alarm on display
                 self.alarm_zones = zones
                 if self.display:
                     self.logger.warning(f"LEAK SENSORS: Showing startup leak alarm on display: {zones}")
@@ -134,43 +182,34 @@ class LeakSensors:
         except Exception as e:
             self.logger.error(f"LEAK SENSORS: Error in startup leak detection handler: {e}")
 
-    def _zone_1_leak_handler(self, state:str) -> None:
+    def _leak_handler(self, port: LeakPort, state: str) -> None:
         current_leak_detected = (state == DeviceStates.LEAK)
+        title = self._zones[port.bit]["title"]
         
         # Update state in memory always
-        self.states.update_leak_sensor_state(self.zone_1_leak.name, state)
-        
-        # If leak is detected and wasn't triggered before
-        if current_leak_detected and not self._zone_1_leak_triggered:
-            self._zone_1_leak_triggered = True
-            self._alarm_acknowledged = False  # Reset acknowledgment on new leak
-            self.logger.warning(f"LEAK SENSOR: NEW leak detected in ZONE 1")
-            # Create async task to handle alarm sequence
-            asyncio.create_task(self._handle_leak_alarm_async())
-        
-        # If no leak detected and was triggered before, sensor recovered
-        elif not current_leak_detected and self._zone_1_leak_triggered:
-            self._zone_1_leak_triggered = False
-            self.logger.info(f"LEAK SENSOR: ZONE 1 sensor recovered (became dry)")
-            
-    def _zone_2_leak_handler(self, state:str) -> None:
-        current_leak_detected = (state == DeviceStates.LEAK)
-        
-        # Update state in memory always
-        self.states.update_leak_sensor_state(self.zone_2_leak.name, state)
+        self.states.update_leak_sensor_state(port.name, state)
+
+        # A faulty probe neither raises nor clears a leak
+        if state == DeviceStates.FAULT:
+            self.logger.error("LEAK SENSOR: %s probe fault (open or shorted, level %d)", title, port.level)
+            return
         
         # If leak is detected and wasn't triggered before
-        if current_leak_detected and not self._zone_2_leak_triggered:
-            self._zone_2_leak_triggered = True
+        if current_leak_detected and not self._triggered_mask & port.bit:
+            self._triggered_mask |= port.bit
             self._alarm_acknowledged = False  # Reset acknowledgment on new leak
-            self.logger.warning(f"LEAK SENSOR: NEW leak detected in ZONE 2")
+            # Shut water and heater off right from the debounced event
+            self._emergency_shutdown(port.bit, port)
+            self.logger.warning("LEAK SENSOR: NEW leak detected in %s", title)
             # Create async task to handle alarm sequence
             asyncio.create_task(self._handle_leak_alarm_async())
         
         # If no leak detected and was triggered before, sensor recovered
-        elif not current_leak_detected and self._zone_2_leak_triggered:
-            self._zone_2_leak_triggered = False
-            self.logger.info(f"LEAK SENSOR: ZONE 2 sensor recovered (became dry)")
+        elif not current_leak_detected and self._triggered_mask & port.bit:
+            self._triggered_mask &= ~port.bit
+            self.logger.info("LEAK SENSOR: %s sensor recovered (became dry)", title)
+            if not self.is_detected_leaks():
+                self._reset_alarm_state()
 
     async def _handle_leak_alarm_async(self):
         """Handle leak alarm sequence asynchronously to ensure proper timing"""
@@ -180,19 +219,15 @@ class LeakSensors:
             # Only trigger full alarm sequence if alarm wasn't acknowledged yet
             if zones != self.alarm_zones and not self._alarm_acknowledged:
                 if self.alarm_zones is None:
-                    # Step 1: Close valves immediately
-                    self.water_line_valves.leak_detected()
-                    # Step 2: Power off heater
-                    self._heater.power_off()
-                    
-                    # Step 3: Start alarm buzzer and give it time to initialize
-                    self.logger.warning("LEAK SENSOR: Starting emergency sequence - closing valves and starting alarm")
+                    # Valves and heater were already shut off by _emergency_shutdown
+                    # Start alarm buzzer and give it time to initialize
+                    self.logger.warning("LEAK SENSOR: Starting emergency sequence - valves closing, starting alarm")
                     self.buzzers.alarm.play_alarm()
                     await asyncio.sleep(0.1)  # Give alarm time to start
                     
                 self.alarm_zones = zones
                 
-                # Step 4: Show alarm on display (only if not acknowledged)
+                # Show alarm on display (only if not acknowledged)
                 if self.display:  
                     self.logger.warning(f"LEAK SENSOR: Showing alarm on display: {zones}")
                     self.display.show_alarm("LEAK DETECTED", zones)
@@ -200,13 +235,40 @@ class LeakSensors:
         except Exception as e:
             self.logger.error(f"LEAK SENSOR: Error in alarm handler: {e}")
 
+    def _emergency_shutdown(self, zones_mask: int, port: LeakPort = None) -> None:
+        """Close the valves and power off the heater mapped to the zones, without waiting for a task"""
+        try:
+            valves = set()
+            heater = False
+            for bit, zone in self._zones.items():
+                if zones_mask & bit:
+                    valves.update(zone["valves"])
+                    heater = heater or zone["heater"]
+
+            # Actuators already shut by an earlier zone of the same alarm are skipped
+            valves.difference_update(self._shut_valves)
+            if valves:
+                self.water_line_valves.leak_detected(valves)
+                self._shut_valves.update(valves)
+            if heater and not self._heater_shut:
+                self._heater.shut_down()
+                self._heater_shut = True
+
+            if port is not None and port.last_edge_ms is not None:
+                self.logger.warning("LEAK SENSOR: Emergency closure issued %d ms after the %s edge", time.ticks_diff(time.ticks_ms(), port.last_edge_ms), port.name)
+        except Exception as e:
+            self.logger.error("LEAK SENSOR: Emergency shutdown failed: %s", e)
+
+    def _reset_alarm_state(self):
+        self._alarm_acknowledged = False
+        self.alarm_zones = None
+        self._shut_valves = set()
+        self._heater_shut = False
+
     def _get_alarm_zones(self):
         """Get current alarm zones based on triggered sensors"""
-        if self._zone_1_leak_triggered and self._zone_2_leak_triggered:
-            return "Zone 1 & Zone 2"
-        elif self._zone_1_leak_triggered:
-            return "Zone 1"
-        elif self._zone_2_leak_triggered:
-            return "Zone 2"
-        else:
-            return None
\ No newline at end of file
+        titles = [self._zones[port.bit]["title"] for port in self.ports if self._triggered_mask & port.bit]
+        for bit, zone in self._zones.items():
+            if self._external_mask & bit:
+                titles.append(zone["title"])
+        return " & ".join(titles) if titles else None
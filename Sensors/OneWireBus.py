@@ -0,0 +1,48 @@
+import machine
+import onewire
+import ds18x20
+import ubinascii
+import time
+
+# DS18B20 Copy Scratchpad: TH, TL and the configuration register to EEPROM
+_COPY_SCRATCH = 0x48
+_EEPROM_WRITE_MS = 10
+
+
+def rom_to_hex(rom) -> str:
+    return ubinascii.hexlify(rom).decode()
+
+
+class OneWireBus:
+    """All DS18B20 sensors wired to one pin"""
+
+    def __init__(self, pin_id: int):
+        self.pin_id = pin_id
+        self.ds = ds18x20.DS18X20(onewire.OneWire(machine.Pin(pin_id)))
+        self.roms = []
+
+    def scan(self) -> list:
+        self.roms = self.ds.scan()
+        return self.roms
+
+    def start_conversion(self) -> None:
+        """Start the conversion on every device of the bus with one Skip-ROM command"""
+        self.ds.convert_temp()
+
+    def read_temp(self, rom) -> float:
+        return self.ds.read_temp(rom)
+
+    def get_resolution(self, rom) -> int:
+        """Resolution in bits from the DS18B20 configuration register"""
+        return ((self.ds.read_scratch(rom)[4] >> 5) & 3) + 9
+
+    def set_resolution(self, rom, bits: int) -> None:
+        """Write the DS18B20 configuration register, keeping the TH/TL alarm bytes,
+        and copy it to EEPROM so that it survives a power-on reset"""
+        scratch = self.ds.read_scratch(rom)
+        self.ds.write_scratch(rom, bytearray((scratch[2], scratch[3], ((bits - 9) << 5) | 0x1F)))
+        ow = self.ds.ow
+        ow.reset(True)
+        ow.select_rom(rom)
+        ow.writebyte(_COPY_SCRATCH)
+        time.sleep_ms(_EEPROM_WRITE_MS)
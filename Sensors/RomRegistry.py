@@ -0,0 +1,77 @@
+import ujson
+from Logging.AppLogger import AppLogger
+import Resources.Settings as Settings
+from Sensors.OneWireBus import rom_to_hex
+
+
+class RomRegistry:
+    """Persistent ROM-to-name mapping of the temperature sensors.
+
+    A sensor keeps its name across reboots and rewiring as long as its ROM
+    is found on its bus. The file maps ROM hex strings to sensor names.
+    """
+
+    def __init__(self):
+        self.logger = AppLogger()
+        self.filename = getattr(Settings, 'TEMP_ROMS_FILE', 'temp_roms.json')
+        self._names = self._load()
+
+    def assign(self, bus, sensors: list) -> dict:
+        """Bind the configured sensors of a bus to the ROMs found on it.
+
+        Returns {sensor name: rom} for the sensors that were found.
+        Pinned ROMs from the settings win, then ROMs remembered in the
+        registry, then the remaining ROMs in scan order.
+        """
+        found = {}
+        order = []
+        for rom in bus.roms:
+            rom_hex = rom_to_hex(rom)
+            found[rom_hex] = rom
+            order.append(rom_hex)
+
+        assigned = {}  # sensor name -> rom hex
+        for sensor in sensors:
+            if sensor["rom"] in found:
+                assigned[sensor["name"]] = sensor["rom"]
+        taken = set(assigned.values())
+
+        bindable = [sensor["name"] for sensor in sensors if not sensor["rom"]]
+        for rom_hex in order:
+            name = self._names.get(rom_hex)
+            if rom_hex not in taken and name in bindable and name not in assigned:
+                assigned[name] = rom_hex
+                taken.add(rom_hex)
+
+        free = [rom_hex for rom_hex in order if rom_hex not in taken]
+        for name in bindable:
+            if name not in assigned and free:
+                assigned[name] = free.pop(0)
+
+        for rom_hex in free:
+            self.logger.warning("TEMP SENSORS: Unassigned sensor %s on pin %d", rom_hex, bus.pin_id)
+
+        changed = False
+        for name, rom_hex in assigned.items():
+            if self._names.get(rom_hex) != name:
+                self._names[rom_hex] = name
+                changed = True
+        if changed:
+            self._save()
+
+        return {name: found[rom_hex] for name, rom_hex in assigned.items()}
+
+    # MARK: Helpers
+    def _load(self) -> dict:
+        try:
+            with open(self.filename, "r") as f:
+                return ujson.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        try:
+            with open(self.filename, "w") as f:
+                ujson.dump(self._names, f)
+        except Exception as e:
+            self.logger.error("TEMP SENSORS: Failed to save ROM registry: %s", e)
@@ -0,0 +1,89 @@
+from array import array
+import time
+
+# DS18B20 power-on reset value; -127 (disconnected) never gets here, TempSensors
+# counts it as a read error with every value outside -10..100
+POWER_ON_RESET_TEMP = 85.0
+
+
+class TempFilter:
+    """Per-sensor filter: sentinel and spike rejection, median of N, then EMA.
+
+    update() returns the filtered temperature or None when the sample was
+    rejected. All state lives in fixed-size arrays allocated once.
+    """
+
+    def __init__(self, window: int = 5, alpha: float = 0.5, max_rate: float = 0.5, step: float = 0.5, max_elapsed_s: float = 15):
+        self.window = window
+        self.alpha = alpha
+        self.max_rate = max_rate  # °C per second accepted between two samples
+        self.step = step          # Change always accepted, whatever the interval
+        # Longest interval the rate applies to: after a slow poll a jump is still bounded
+        self.max_elapsed_s = max_elapsed_s
+        self._samples = array('f', [0.0] * window)
+        self._sorted = array('f', [0.0] * window)
+        self._count = 0
+        self._index = 0
+        self._ema = None
+        self._last_value = None
+        self._last_ms = None
+        self._rejected_in_row = 0
+        self.rejected = 0
+
+    def reset(self) -> None:
+        self._count = 0
+        self._index = 0
+        self._ema = None
+        self._last_value = None
+        self._last_ms = None
+        self._rejected_in_row = 0
+
+    def update(self, value: float, now_ms: int = None):
+        if now_ms is None:
+            now_ms = time.ticks_ms()
+
+        if self._is_sentinel(value) or self._is_spike(value, now_ms):
+            self.rejected += 1
+            self._rejected_in_row += 1
+            # A step that persists for a whole window is real: start over from it
+            if self._rejected_in_row < self.window:
+                return None
+            self.reset()
+
+        self._rejected_in_row = 0
+        self._last_value = value
+        self._last_ms = now_ms
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+        median = self._median()
+        if self._ema is None:
+            self._ema = median
+        else:
+            self._ema += self.alpha * (median - self._ema)
+        return self._ema
+
+    # MARK: Helpers
+    def _is_sentinel(self, value: float) -> bool:
+        # 85.0 is a real reading only when the sensor was already close to it
+        return value == POWER_ON_RESET_TEMP and (self._last_value is None or abs(self._last_value - value) > 1.0)
+
+    def _is_spike(self, value: float, now_ms: int) -> bool:
+        if self._last_value is None:
+            return False
+        elapsed_s = min(time.ticks_diff(now_ms, self._last_ms) / 1000, self.max_elapsed_s)
+        return abs(value - self._last_value) > self.step + self.max_rate * elapsed_s
+
+    def _median(self) -> float:
+        # Insertion sort of the filled part of the window into the scratch array
+        count = self._count
+        ordered = self._sorted
+        for i in range(count):
+            value = self._samples[i]
+            j = i - 1
+            while j >= 0 and ordered[j] > value:
+                ordered[j + 1] = ordered[j]
+                j -= 1
+            ordered[j + 1] = value
+        return ordered[count // 2]
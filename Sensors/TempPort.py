@@ -1,32 +1,49 @@
-
-import machine
-import onewire
-import ds18x20
 import uasyncio as asyncio
+from Sensors.OneWireBus import OneWireBus
+
+# Maximum conversion time per resolution in bits (DS18B20 datasheet)
+_CONVERSION_MS = {9: 94, 10: 188, 11: 375, 12: 750}
 
 class TempPort:
 
-    def __init__(self, name:str, pin_id:int):
+    # Power-on default resolution is 12 bits
+    conversion_ms = 750
 
-        pin = machine.Pin(pin_id)
+    def __init__(self, name: str, bus: OneWireBus, rom):
         self.name = name
-        self.ds_sensor = ds18x20.DS18X20(onewire.OneWire(pin))
-        self.rom = None
+        self.bus = bus
+        self.rom = rom
+        self.resolution = None  # Bits set by set_resolution()
 
-        roms = self.ds_sensor.scan()
-        if roms:
-            self.rom = roms[0] 
-        else:
-            raise Exception(f"Temp sensor: [{self.name}] not found on pin: {pin_id}. Roms: {roms}")
-        
+    def set_resolution(self, bits: int) -> None:
+        if bits not in _CONVERSION_MS:
+            raise ValueError(f"Unsupported resolution: {bits} bits")
+        self.bus.set_resolution(self.rom, bits)
+        self.resolution = bits
+        self.conversion_ms = _CONVERSION_MS[bits]
 
-    async def read_temperature(self) -> float:
+    def check_resolution(self) -> bool:
+        """Set the resolution again if the sensor lost it, return True if it had"""
+        if self.resolution is None or self.bus.get_resolution(self.rom) == self.resolution:
+            return False
+        self.bus.set_resolution(self.rom, self.resolution)
+        return True
+
+    def start_conversion(self) -> None:
+        """Start a conversion on the whole bus and return without waiting for it"""
+        self.bus.start_conversion()
+
+    def read_converted(self) -> float:
+        """Read the result of a conversion started conversion_ms ago"""
         if self.rom:
-            self.ds_sensor.convert_temp()
-            await asyncio.sleep(0.9)
-            return self.ds_sensor.read_temp(self.rom)
+            return self.bus.read_temp(self.rom)
         else:
             raise Exception(f"Temp sensor {self.name} not found")
+
+    async def read_temperature(self) -> float:
+        self.start_conversion()
+        await asyncio.sleep_ms(self.conversion_ms)
+        return self.read_converted()
         
     def get_name(self) ->str:
-        return self.name
\ No newline at end of file
+        return self.name
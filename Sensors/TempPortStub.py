@@ -3,12 +3,20 @@ from Logging.AppLogger import AppLogger
 
 class TempPortStub:
     """Stub for temperature sensor when sensor is not connected"""
+
+    conversion_ms = 0
     
     def __init__(self, name: str, pin_id: int, reason: str = "Sensor not found"):
         self.name = name
         self.pin_id = pin_id
         self.reason = reason
 
+    def start_conversion(self) -> None:
+        pass
+
+    def read_converted(self) -> str:
+        return "No temp sensor"
+
     async def read_temperature(self) -> str:
         """Always returns special value indicating sensor absence"""
         return "No temp sensor"
@@ -1,10 +1,16 @@
 from Sensors.TempPort import TempPort
 from Sensors.TempPortStub import TempPortStub
+from Sensors.OneWireBus import OneWireBus, rom_to_hex
+from Sensors.RomRegistry import RomRegistry
+from Sensors.TempFilter import TempFilter
 import Resources.Settings as Settings
 from State.States import States
 import uasyncio as asyncio
+import time
 from Logging.AppLogger import AppLogger
 import Helpers.DeviceNames as DeviceNames
+import Helpers.DeviceStates as DeviceStates
+from Helpers.TempSensorConfig import get_temp_sensors
 
 class TempSensors:
 
@@ -14,49 +20,40 @@ class TempSensors:
         self.states = states
         self.logger = AppLogger()
         
-        # Error counters for each sensor
-        self.hot_water_error_count = 0
-        self.heater_error_count = 0
+        # Consecutive read errors per sensor name
+        self.error_counts = {}
         self.max_consecutive_errors = 5
         
-        # Sensor failure flags
-        self.hot_water_sensor_failed = False
-        self.heater_sensor_failed = False
-        
-        # Optimization: Temperature write frequency control
-        self.hot_water_write_counter = 0
-        self.heater_write_counter = 0
-        self.temp_write_frequency = getattr(Settings, 'TEMP_WRITE_FREQUENCY', 2)
+        # Optimization: Temperature write frequency control, by time since the last write
+        self.last_write_ticks = {}
+        self.temp_write_interval_ms = getattr(Settings, 'TEMP_WRITE_INTERVAL', 60) * 1000
         
         # Temperature change threshold to avoid writing minor fluctuations
         self.temp_change_threshold = 0.5  # Only write if temp changed by at least 0.5°C
         self.last_written_temps = {}
-        
-        # Try to initialize heater temperature sensor
-        try:
-            self.heater_temp_sensor = TempPort(DeviceNames.HEATER_TEMP_SENSORS_KEY, Settings.HEATER_TEMP_PIN)
-            self.logger.info(f"Heater temperature sensor initialized successfully on pin {Settings.HEATER_TEMP_PIN}")
-        except Exception as e:
-            self.logger.warning(f"Failed to initialize heater temp sensor on pin {Settings.HEATER_TEMP_PIN}: {e}")
-            self.heater_sensor_failed = True
-            self.heater_temp_sensor = TempPortStub(
-                DeviceNames.HEATER_TEMP_SENSORS_KEY, 
-                Settings.HEATER_TEMP_PIN, 
-                f"Init failed: {e}"
-            )
-            
-        # Try to initialize hot water line sensor
-        try:
-            self.hot_water_line_sensor = TempPort(DeviceNames.HOT_WATER_TEMP_SENSORS_KEY, Settings.HWLT_SE1_PIN)
-            self.logger.info(f"Hot water temperature sensor initialized successfully on pin {Settings.HWLT_SE1_PIN}")
-        except Exception as e:
-            self.logger.warning(f"Failed to initialize hot water temp sensor on pin {Settings.HWLT_SE1_PIN}: {e}")
-            self.hot_water_sensor_failed = True
-            self.hot_water_line_sensor = TempPortStub(
-                DeviceNames.HOT_WATER_TEMP_SENSORS_KEY, 
-                Settings.HWLT_SE1_PIN, 
-                f"Init failed: {e}"
-            )
+
+        # Adaptive polling: fast while temperatures move or the heater is on,
+        # exponential back-off while every reading stays within the deadband
+        self._fast_interval = getattr(Settings, 'TEMP_POLL_FAST_INTERVAL', 5)
+        self._slow_interval = getattr(Settings, 'TEMP_SENSOR_POLLING_TIME', 240)
+        self._deadband = getattr(Settings, 'TEMP_POLL_DEADBAND', 0.3)
+        self._poll_interval = self._fast_interval
+        self._last_readings = {}
+
+        # Only filtered readings reach the states
+        self.filters = {}
+        self._filter_window = getattr(Settings, 'TEMP_FILTER_WINDOW', 5)
+        self._filter_alpha = getattr(Settings, 'TEMP_FILTER_ALPHA', 0.5)
+        self._filter_max_rate = getattr(Settings, 'TEMP_FILTER_MAX_RATE', 0.5)
+
+        # OneWire buses by pin, sensors by name (TempPort or TempPortStub)
+        self._configs = get_temp_sensors()
+        self.buses = {}
+        self.sensors = {}
+        self._registry = RomRegistry()
+        self._rescan_interval_ms = getattr(Settings, 'TEMP_RESCAN_INTERVAL', 600) * 1000
+        self._last_rescan = time.ticks_ms()
+        self._scan_buses()
        
     def start(self) -> None:
         if self._task is None:
@@ -65,16 +62,12 @@ class TempSensors:
             # Count working sensors and stubs
             working_sensors = []
             stub_sensors = []
-            
-            if not self.hot_water_sensor_failed:
-                working_sensors.append(f"{self.hot_water_line_sensor.name} (pin {Settings.HWLT_SE1_PIN})")
-            else:
-                stub_sensors.append(f"{self.hot_water_line_sensor.name} (pin {Settings.HWLT_SE1_PIN})")
-                
-            if not self.heater_sensor_failed:
-                working_sensors.append(f"{self.heater_temp_sensor.name} (pin {Settings.HEATER_TEMP_PIN})")
-            else:
-                stub_sensors.append(f"{self.heater_temp_sensor.name} (pin {Settings.HEATER_TEMP_PIN})")
+            for config in self._configs:
+                description = f"{config['name']} (pin {config['pin']})"
+                if isinstance(self.sensors[config["name"]], TempPort):
+                    working_sensors.append(description)
+                else:
+                    stub_sensors.append(description)
             
             if working_sensors:
                 self.logger.info(f"TEMP SENSORS: Working temperature sensors: {working_sensors}")
@@ -91,85 +84,144 @@ class TempSensors:
 
     async def _update_temperature(self) -> None:
         while self._task is not None:
-            await self._update_hot_water_line_temp_sensor()
-            await self._update_heater_temp_sensor()
-            await asyncio.sleep(Settings.TEMP_SENSOR_POLLING_TIME)
+            # Low frequency rescan picks up hot-plugged and recovered sensors
+            if time.ticks_diff(time.ticks_ms(), self._last_rescan) >= self._rescan_interval_ms:
+                self._last_rescan = time.ticks_ms()
+                self._scan_buses()
 
-    async def _update_hot_water_line_temp_sensor(self) -> None:
-        sensor_name = self.hot_water_line_sensor.get_name()
-        
-        # If sensor initially failed (using stub), just update state
-        if self.hot_water_sensor_failed:
-            temp_value = await self.hot_water_line_sensor.read_temperature()
-            self._update_temperature_with_optimization(sensor_name, temp_value, 'hot_water')
-            return
-            
-        # Attempt to read from real sensor
-        try:
-            temp = await self.hot_water_line_sensor.read_temperature()
-            
-            # Check for reasonable temperature values
-            if isinstance(temp, (int, float)) and -10 <= temp <= 100: 
-                rounded_temp = round(temp, 1)
-                self._update_temperature_with_optimization(sensor_name, rounded_temp, 'hot_water')
-                self.hot_water_error_count = 0
-            else:
-                raise ValueError(f"Temperature out of range or invalid: {temp}")
-                
-        except Exception as e:
-            self.hot_water_error_count += 1
-            self.logger.error(f"Hot water temp sensor error #{self.hot_water_error_count}: {e}")
-            
-            if self.hot_water_error_count >= self.max_consecutive_errors:
-                self.hot_water_sensor_failed = True
-                self.logger.critical("Hot water temperature sensor marked as FAILED, switching to stub")
-                self.states.update_temperature(sensor_name, "ERROR")
-                # Replace with stub
-                self.hot_water_line_sensor = TempPortStub(
-                    sensor_name, 
-                    Settings.HWLT_SE1_PIN, 
-                    "Sensor failed during operation"
-                )
-            
-            if self.hot_water_error_count == 10:
-                await self._try_reinitialize_hot_water_sensor()
+            await self._convert_all()
+            changing = False
+            for config in self._configs:
+                if self._update_sensor(config["name"]):
+                    changing = True
+            await self._sleep_until_next_poll(changing)
+
+    async def _sleep_until_next_poll(self, changing: bool) -> None:
+        if changing or self._is_heater_on():
+            self._poll_interval = self._fast_interval
+        else:
+            self._poll_interval = min(self._poll_interval * 2, self._slow_interval)
+        self.logger.debug("TEMP SENSORS: Next poll in %d s", self._poll_interval)
+
+        # Sleep in fast steps so that switching the heater on ends a long back-off
+        waited = 0
+        while waited < self._poll_interval and self._task is not None:
+            await asyncio.sleep(self._fast_interval)
+            waited += self._fast_interval
+            if self._poll_interval > self._fast_interval and self._is_heater_on():
+                return
+
+    def _is_heater_on(self) -> bool:
+        return self.states.get_heater_state(DeviceNames.HEATER_POWER_SWITH_KEY) == DeviceStates.ON
+
+    def _scan_buses(self) -> None:
+        """Enumerate the ROMs of every bus and bind the configured sensors that are not working"""
+        for pin in self._get_pins():
+            configs = [config for config in self._configs if config["pin"] == pin]
+            try:
+                bus = self.buses.get(pin)
+                if bus is None:
+                    bus = OneWireBus(pin)
+                    self.buses[pin] = bus
+                bus.scan()
+                roms = self._registry.assign(bus, configs)
+            except Exception as e:
+                self.logger.warning("TEMP SENSORS: Failed to scan bus on pin %d: %s", pin, e)
+                roms = {}
+
+            for config in configs:
+                name = config["name"]
+                sensor = self.sensors.get(name)
+                if isinstance(sensor, TempPort):
+                    # A power-on reset (hot-plug, brown-out) may have brought back the 12-bit default
+                    try:
+                        if sensor.check_resolution():
+                            self.logger.warning("TEMP SENSORS: %s lost its resolution, set %d bits again", name, sensor.resolution)
+                    except Exception as e:
+                        self.logger.warning("TEMP SENSORS: Failed to check resolution of %s: %s", name, e)
+                    continue
+                rom = roms.get(name)
+                if rom is not None:
+                    port = TempPort(name, bus, rom)
+                    try:
+                        port.set_resolution(config["resolution"])
+                    except Exception as e:
+                        self.logger.warning("TEMP SENSORS: Failed to set resolution of %s: %s", name, e)
+                    self.sensors[name] = port
+                    self.error_counts[name] = 0
+                    self.filters[name] = TempFilter(self._filter_window, self._filter_alpha, self._filter_max_rate,
+                                                   max_elapsed_s=3 * self._fast_interval)
+                    self.logger.info("TEMP SENSORS: %s bound to ROM %s on pin %d (%d ms conversion)", name, rom_to_hex(rom), pin, port.conversion_ms)
+                elif name not in self.sensors:
+                    self.sensors[name] = TempPortStub(name, pin, "Sensor not found")
+                    self.logger.warning("TEMP SENSORS: %s not found on pin %d", name, pin)
 
-    async def _update_heater_temp_sensor(self) -> None:
-        sensor_name = self.heater_temp_sensor.get_name()
+    async def _convert_all(self) -> None:
+        """Start the conversion on every bus at once and wait once for the slowest sensor"""
+        start = time.ticks_ms()
+        wait_ms = 0
+        for bus in self.buses.values():
+            ports = [sensor for sensor in self.sensors.values() if isinstance(sensor, TempPort) and sensor.bus is bus]
+            if not ports:
+                continue
+            try:
+                # One Skip-ROM command converts every device of the bus
+                bus.start_conversion()
+                wait_ms = max(wait_ms, max(port.conversion_ms for port in ports))
+            except Exception as e:
+                # The reads that follow fail as well and are counted as sensor errors
+                self.logger.error("TEMP SENSORS: Failed to start conversion on pin %d: %s", bus.pin_id, e)
+        if wait_ms:
+            await asyncio.sleep_ms(wait_ms)
+        self.logger.debug("TEMP SENSORS: Conversion cycle of %d sensors took %d ms", len(self.sensors), time.ticks_diff(time.ticks_ms(), start))
+
+    def _update_sensor(self, sensor_name: str) -> bool:
+        """Read one sensor, return True if it moved beyond the polling deadband or was rejected"""
+        sensor = self.sensors[sensor_name]
         
-        # If the sensor was not working initially (a stub is used), simply update the state
-        if self.heater_sensor_failed:
-            temp_value = await self.heater_temp_sensor.read_temperature()
-            self._update_temperature_with_optimization(sensor_name, temp_value, 'heater')
-            return
+        # If the sensor is not working (a stub is used), simply update the state
+        if isinstance(sensor, TempPortStub):
+            self._update_temperature_with_optimization(sensor_name, sensor.read_converted())
+            return False
             
         try:
-            temp = await self.heater_temp_sensor.read_temperature()
+            temp = sensor.read_converted()
             
             # Check for reasonable temperature values
             if isinstance(temp, (int, float)) and -10 <= temp <= 100:
-                rounded_temp = round(temp, 1)
-                self._update_temperature_with_optimization(sensor_name, rounded_temp, 'heater')
-                self.heater_error_count = 0
+                filtered = self.filters[sensor_name].update(temp, time.ticks_ms())
+                self.error_counts[sensor_name] = 0
+                if filtered is None:
+                    self.logger.warning("TEMP SENSORS: %s reading %s rejected by the filter", sensor_name, temp)
+                    # Unsettled: poll fast so a step that persists is confirmed within a few polls
+                    return True
+
+                rounded_temp = round(filtered, 1)
+                self._update_temperature_with_optimization(sensor_name, rounded_temp)
+
+                last_reading = self._last_readings.get(sensor_name)
+                self._last_readings[sensor_name] = rounded_temp
+                return last_reading is None or abs(rounded_temp - last_reading) > self._deadband
             else:
                 raise ValueError(f"Temperature out of range or invalid: {temp}")
                 
         except Exception as e:
-            self.heater_error_count += 1
-            self.logger.error(f"Heater temp sensor error #{self.heater_error_count}: {e}")
+            error_count = self.error_counts.get(sensor_name, 0) + 1
+            self.error_counts[sensor_name] = error_count
+            self.logger.error("TEMP SENSORS: %s error #%d: %s", sensor_name, error_count, e)
             
-            if self.heater_error_count >= self.max_consecutive_errors:
-                self.heater_sensor_failed = True
-                self.logger.critical("Heater temperature sensor marked as FAILED, switching to stub")
+            if error_count >= self.max_consecutive_errors:
+                self.logger.critical("TEMP SENSORS: %s marked as FAILED, switching to stub", sensor_name)
                 self.states.update_temperature(sensor_name, "ERROR")
-               
-                self.heater_temp_sensor = TempPortStub(
+                # The next rescan binds it again once the ROM answers
+                self.sensors[sensor_name] = TempPortStub(
                     sensor_name, 
-                    Settings.HEATER_TEMP_PIN, 
+                    sensor.bus.pin_id, 
                     "Sensor failed during operation"
                 )
+            return False
 
-    def _update_temperature_with_optimization(self, sensor_name: str, temp_value, sensor_type: str):
+    def _update_temperature_with_optimization(self, sensor_name: str, temp_value):
         """Update temperature with write frequency optimization and change threshold"""
         
         # Handle error states - always update immediately
@@ -186,17 +238,13 @@ class TempSensors:
                 abs(temp_value - last_temp) >= self.temp_change_threshold
             )
             
-            # Update write counter
-            if sensor_type == 'hot_water':
-                self.hot_water_write_counter += 1
-                should_write_by_frequency = (self.hot_water_write_counter >= self.temp_write_frequency)
-                if should_write_by_frequency:
-                    self.hot_water_write_counter = 0
-            else:  # heater
-                self.heater_write_counter += 1
-                should_write_by_frequency = (self.heater_write_counter >= self.temp_write_frequency)
-                if should_write_by_frequency:
-                    self.heater_write_counter = 0
+            # Periodic write by elapsed time, whatever the polling interval is now
+            now = time.ticks_ms()
+            last_write = self.last_write_ticks.get(sensor_name)
+            should_write_by_frequency = (
+                last_write is None or
+                time.ticks_diff(now, last_write) >= self.temp_write_interval_ms
+            )
             
             # Decide whether to write
             should_write = temp_changed_significantly or should_write_by_frequency
@@ -204,12 +252,13 @@ class TempSensors:
             if should_write:
                 self.states.update_temperature(sensor_name, temp_value)
                 self.last_written_temps[sensor_name] = temp_value
-                self.logger.debug(f"TEMP SENSORS: Updated {sensor_name}: {temp_value}°C (significant change: {temp_changed_significantly})")
+                self.last_write_ticks[sensor_name] = now
+                self.logger.debug("TEMP SENSORS: Updated %s: %s°C (significant change: %s)", sensor_name, temp_value, temp_changed_significantly)
             else:
                 # Update in-memory state without writing to disk
                 # This requires a new method in states that updates without scheduling write
                 self._update_memory_only(sensor_name, temp_value)
-                self.logger.debug(f"TEMP SENSORS: Memory-only update {sensor_name}: {temp_value}°C")
+                self.logger.debug("TEMP SENSORS: Memory-only update %s: %s°C", sensor_name, temp_value)
         else:
             # For non-numeric values, update normally
             self.states.update_temperature(sensor_name, temp_value)
@@ -225,33 +274,15 @@ class TempSensors:
                     device.set_state(new_value=temp_value, can_notify=False)
                     
         except Exception as e:
-            self.logger.error(f"TEMP SENSORS: Failed to update memory-only for {sensor_name}: {e}")
+            self.logger.error("TEMP SENSORS: Failed to update memory-only for %s: %s", sensor_name, e)
 
-    async def _try_reinitialize_hot_water_sensor(self):
-        """Attempt to reinitialize hot water sensor"""
-        try:
-            self.logger.info("Attempting to reinitialize hot water temp sensor...")
-            test_sensor = TempPort(DeviceNames.HOT_WATER_TEMP_SENSORS_KEY, Settings.HWLT_SE1_PIN)
-            
-            # Test reading
-            test_temp = await test_sensor.read_temperature()
-            if isinstance(test_temp, (int, float)) and -10 <= test_temp <= 100:
-                self.hot_water_line_sensor = test_sensor
-                self.hot_water_sensor_failed = False
-                self.hot_water_error_count = 0
-                self.logger.info("Hot water temp sensor successfully reinitialized")
-            else:
-                raise ValueError(f"Test reading failed: {test_temp}")
-                
-        except Exception as e:
-            self.logger.error(f"Failed to reinitialize hot water temp sensor: {e}")
-            
-            self.hot_water_line_sensor = TempPortStub(
-                DeviceNames.HOT_WATER_TEMP_SENSORS_KEY, 
-                Settings.HWLT_SE1_PIN, 
-                f"Reinit failed: {e}"
-            )
+    def _get_pins(self) -> list:
+        pins = []
+        for config in self._configs:
+            if config["pin"] not in pins:
+                pins.append(config["pin"])
+        return pins
     
     def has_working_sensors(self) -> bool:
         """Check if there is at least one working sensor"""
-        return not self.heater_sensor_failed or not self.hot_water_sensor_failed
\ No newline at end of file
+        return any(isinstance(sensor, TempPort) for sensor in self.sensors.values())
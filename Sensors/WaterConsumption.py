@@ -0,0 +1,137 @@
+import ustruct
+import utime
+from Helpers.Singleton import Singleton
+from Logging.AppLogger import AppLogger
+import Resources.Settings as Settings
+
+# File layout: magic(4) hours:u8 days:u8 months:u8 pad:u8, then the hour, day
+# and month slots. Slot layout: period key:u32 pulses:u32.
+# Keys: local hours and days since the epoch, months as year * 12 + month - 1.
+_MAGIC = b"WCN1"
+_HEADER_SIZE = 8
+_SLOT_SIZE = 8
+HOURS = 24
+DAYS = 31
+MONTHS = 24
+
+
+class WaterConsumption(Singleton):
+    """Hourly, daily and monthly water consumption in a fixed-size binary file.
+
+    Every period has one slot addressed by key % slots, so adding a window of
+    pulses is O(1) and the file never grows. Only the slots that changed are
+    written back, in place, every CONSUMPTION_SAVE_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        if hasattr(self, '_image'):
+            return
+
+        self.logger = AppLogger()
+        self.filename = getattr(Settings, 'CONSUMPTION_FILE', 'consumption.bin')
+        self.pulses_per_liter = getattr(Settings, 'FLOW_PULSES_PER_LITER', 450)
+        self._save_interval_ms = getattr(Settings, 'CONSUMPTION_SAVE_INTERVAL', 300) * 1000
+        self._image = bytearray(_HEADER_SIZE + (HOURS + DAYS + MONTHS) * _SLOT_SIZE)
+        self._dirty = set()  # Offsets of the slots changed since the last save
+        self._last_save = utime.ticks_ms()
+        self._load()
+
+    # MARK: Public
+    def add_pulses(self, pulses: int, now=None) -> None:
+        if pulses > 0:
+            hour_key, day_key, month_key = self._keys(now)
+            self._add(_HEADER_SIZE, HOURS, hour_key, pulses)
+            self._add(_HEADER_SIZE + HOURS * _SLOT_SIZE, DAYS, day_key, pulses)
+            self._add(_HEADER_SIZE + (HOURS + DAYS) * _SLOT_SIZE, MONTHS, month_key, pulses)
+
+        # Windows without pulses save too, or the end of a session waits for the next flow
+        if self._dirty and utime.ticks_diff(utime.ticks_ms(), self._last_save) >= self._save_interval_ms:
+            self.save()
+
+    def save(self) -> None:
+        """Write the changed slots in place"""
+        self._last_save = utime.ticks_ms()
+        if not self._dirty:
+            return
+        try:
+            with open(self.filename, "r+b") as f:
+                for offset in sorted(self._dirty):
+                    f.seek(offset)
+                    f.write(self._image[offset:offset + _SLOT_SIZE])
+            self._dirty.clear()
+        except OSError:
+            self._write_all()
+
+    def get_liters(self, period: str, now=None) -> float:
+        """Liters of the current local "hour", "day" or "month" """
+        hour_key, day_key, month_key = self._keys(now)
+        if period == "hour":
+            pulses = self._get(_HEADER_SIZE, HOURS, hour_key)
+        elif period == "day":
+            pulses = self._get(_HEADER_SIZE + HOURS * _SLOT_SIZE, DAYS, day_key)
+        else:
+            pulses = self._get(_HEADER_SIZE + (HOURS + DAYS) * _SLOT_SIZE, MONTHS, month_key)
+        return pulses / self.pulses_per_liter
+
+    def get_history(self) -> dict:
+        """All stored periods as [key, liters] pairs, oldest first.
+
+        Keys: local hours and days since the epoch, months as year * 12 + month - 1.
+        """
+        return {
+            "hours": self._history(_HEADER_SIZE, HOURS),
+            "days": self._history(_HEADER_SIZE + HOURS * _SLOT_SIZE, DAYS),
+            "months": self._history(_HEADER_SIZE + (HOURS + DAYS) * _SLOT_SIZE, MONTHS),
+        }
+
+    # MARK: Helpers
+    def _keys(self, now=None) -> tuple:
+        if now is None:
+            now = utime.time()
+        # The RTC runs in UTC: periods roll over at local midnight, like the rest of the UI
+        now += Settings.TIME_ZONE_OFFSET * 60 * 60
+        year, month = utime.localtime(now)[0:2]
+        return now // 3600, now // 86400, year * 12 + month - 1
+
+    def _add(self, base: int, slots: int, key: int, pulses: int) -> None:
+        offset = base + (key % slots) * _SLOT_SIZE
+        stored_key, stored = ustruct.unpack_from("<II", self._image, offset)
+        if stored_key != key:
+            stored = 0  # The slot still holds the same period of an earlier cycle
+        ustruct.pack_into("<II", self._image, offset, key, min(stored + pulses, 0xFFFFFFFF))
+        self._dirty.add(offset)
+
+    def _get(self, base: int, slots: int, key: int) -> int:
+        stored_key, pulses = ustruct.unpack_from("<II", self._image, base + (key % slots) * _SLOT_SIZE)
+        return pulses if stored_key == key else 0
+
+    def _history(self, base: int, slots: int) -> list:
+        history = []
+        for i in range(slots):
+            key, pulses = ustruct.unpack_from("<II", self._image, base + i * _SLOT_SIZE)
+            if pulses:
+                history.append([key, round(pulses / self.pulses_per_liter, 1)])
+        history.sort()
+        return history
+
+    def _load(self) -> None:
+        try:
+            with open(self.filename, "rb") as f:
+                image = f.read()
+            if len(image) == len(self._image) and image[0:4] == _MAGIC and image[4:7] == bytes((HOURS, DAYS, MONTHS)):
+                self._image[:] = image
+                return
+            self.logger.warning("CONSUMPTION: Unknown file layout, starting from zero")
+        except OSError:
+            pass
+        self._image[0:4] = _MAGIC
+        self._image[4:7] = bytes((HOURS, DAYS, MONTHS))
+        self._write_all()
+
+    def _write_all(self) -> None:
+        try:
+            with open(self.filename, "wb") as f:
+                f.write(self._image)
+            self._dirty.clear()
+        except OSError as e:
+            self.logger.error("CONSUMPTION: Failed to write %s: %s", self.filename, e)
@@ -9,7 +9,11 @@ from State.WaterLeakSensorState import WaterLeakSensorState
 from State.HeaterSwithState import HeaterSwithState
 from Resources.Errors import *
 import Helpers.DeviceNames as DeviceNames
+from Helpers.LeakZones import get_leak_zone_names
+from Helpers.TempSensorConfig import get_temp_sensor_names
 from Logging.AppLogger import AppLogger
+from Logging.Logger import DEBUG
+from Logging.BlackBox import BlackBox, EVENT_STATE
 
 class States:
    
@@ -18,6 +22,7 @@ class States:
         self.backup_file = "State/state_backup.json"
         self.temp_file = "State/state_temp.json"
         self.logger = AppLogger()
+        self.black_box = BlackBox()
         self.states: dict = {}
         self.write_failures = 0
         self.max_write_failures = 5
@@ -97,12 +102,12 @@ class States:
                         data[device_type][device_name] = new_data
                         self._last_written_states[device_key] = new_data.copy()
                         changes_made = True
-                        self.logger.debug(f"STATES: Batched write for {device_type}:{device_name}")
+                        self.logger.debug("STATES: Batched write for %s:%s", device_type, device_name)
             
             # Only write if there were actual changes
             if changes_made:
                 self._write_file(data)
-                self.logger.info(f"STATES: Batched write completed for {len(self._pending_writes)} devices")
+                self.logger.info("STATES: Batched write completed for %d devices", len(self._pending_writes))
             
             # Clear pending writes
             self._pending_writes.clear()
@@ -175,8 +180,13 @@ class States:
         current_state = device.get_state()
         if current_state != new_state:
             device.set_state(new_value=new_state, can_notify=True)
-            self.logger.debug(f"STATES: State changed {device_name}: {current_state} -> {new_state}")
+            if self.logger.isEnabledFor(DEBUG):
+                self.logger.debug("STATES: State changed %s: %s -> %s", device_name, current_state, new_state)
             
+            # Critical transitions (valves, leaks, heater) go to the black box
+            if is_critical:
+                self.black_box.record(EVENT_STATE, device_name + "=" + str(new_state))
+
             # Schedule write instead of immediate write
             self._schedule_write(device_type, device_name, is_critical)
 
@@ -188,7 +198,8 @@ class States:
         if is_critical:
             self._critical_write_pending = True
             
-        self.logger.debug(f"STATES: Scheduled write for {device_key} (critical: {is_critical})")
+        if self.logger.isEnabledFor(DEBUG):
+            self.logger.debug("STATES: Scheduled write for %s (critical: %s)", device_key, is_critical)
 
     async def force_write(self):
         """Force immediate write of all pending changes - useful for shutdown"""
@@ -300,7 +311,7 @@ class States:
             self._rename_file(self.temp_file, self.state_file)
             
             self.write_failures = 0
-            self.logger.debug(f"State file successfully written: {self.state_file}")
+            self.logger.debug("State file successfully written: %s", self.state_file)
             
         except Exception as e:
             self.write_failures += 1
@@ -322,7 +333,7 @@ class States:
             data[section_key] = {}
             for device_key, device in devices.items():
                 data[section_key][device_key] = device.get_data()
-        self.logger.debug(f"STATES: Created new state file {self.state_file} with None states of all devices.")
+        self.logger.debug("STATES: Created new state file %s with None states of all devices.", self.state_file)
         self._write_file(data)
         gc.collect()
         
@@ -333,14 +344,8 @@ class States:
                 DeviceNames.HOT_WATER_VALVE_KEY: ValveState(DeviceNames.HOT_WATER_VALVE_KEY),
                 DeviceNames.COLD_WATER_VALVE_KEY: ValveState(DeviceNames.COLD_WATER_VALVE_KEY),
             },
-            DeviceNames.LEAK_SECTION_KEY: {
-                DeviceNames.ZONE_1_LEAK_SENSORS_KEY: WaterLeakSensorState(DeviceNames.ZONE_1_LEAK_SENSORS_KEY),
-                DeviceNames.ZONE_2_LEAK_SENSORS_KEY: WaterLeakSensorState(DeviceNames.ZONE_2_LEAK_SENSORS_KEY)
-            },
-            DeviceNames.TEMP_SECTION_KEY: {
-                DeviceNames.HOT_WATER_TEMP_SENSORS_KEY: TemperatureSensorState(DeviceNames.HOT_WATER_TEMP_SENSORS_KEY),
-                DeviceNames.HEATER_TEMP_SENSORS_KEY: TemperatureSensorState(DeviceNames.HEATER_TEMP_SENSORS_KEY)
-            },
+            DeviceNames.LEAK_SECTION_KEY: {name: WaterLeakSensorState(name) for name in get_leak_zone_names()},
+            DeviceNames.TEMP_SECTION_KEY: {name: TemperatureSensorState(name) for name in get_temp_sensor_names()},
             DeviceNames.HEATER_SECTION_KEY:{
                  DeviceNames.HEATER_POWER_SWITH_KEY: HeaterSwithState(DeviceNames.HEATER_POWER_SWITH_KEY),
             }
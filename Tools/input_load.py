@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# Measures the event loop load of the button and leak pin inputs.
+#
+# Runs on the host (CPython 3.8+) from the repository root:
+#   python3 Tools/input_load.py
+#   python3 Tools/input_load.py --seconds 600
+#
+# The whole controller (main.py) runs on the simulated board of Tools/sim in
+# two configurations, measured the same way:
+#   scanner  the tree as it is: one InputScanner task samples every input
+#   legacy   the inputs before the scanner: a 10 ms polling task per button
+#            (the former ButtonPort, copied below) and the 5 s leak poll
+# Every handle the loop runs is counted and timed with the host clock; task
+# steps are the wakeups of the firmware tasks. The host time is only a proxy
+# of the CPU load: the idle time of the RP2040 itself is not measured here.
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sim
+
+CONFIGS = ("legacy", "scanner")
+
+# Tasks that serve the inputs, by the qualified name of their coroutine
+_INPUT_TASKS = ("InputScanner._scan", "LegacyButtonPort._monitor_button", "_legacy_leak_poll")
+
+
+def _legacy_button_port():
+    from machine import Pin
+    import uasyncio
+    import utime
+
+    class LegacyButtonPort:
+        """ButtonPort before the input scanner: one polling task per button"""
+
+        _PIN_SCAN_DELAY_MS = 10
+        _PIN_DEBOUNCE_MS = 50
+        _LONG_TIMEOUT_MS = 5000
+
+        SHORT_EVENT_ID = "short"
+        LONG_EVENT_ID = "long"
+
+        def __init__(self, pin, callback):
+            self.pin = Pin(pin, Pin.IN, Pin.PULL_UP)
+            self.callback = callback
+            self._task = None
+            self._press_time = None
+
+        def start(self):
+            if self._task is None:
+                self._task = uasyncio.create_task(self._monitor_button())
+
+        def stop(self):
+            if self._task:
+                self._task = None
+
+        async def _monitor_button(self):
+            while self._task is not None:
+                await uasyncio.sleep_ms(self._PIN_SCAN_DELAY_MS)
+                pin_state = self.pin.value()
+                current_time = utime.ticks_ms()
+
+                if pin_state == 0:
+                    if self._press_time is None:
+                        await uasyncio.sleep_ms(self._PIN_DEBOUNCE_MS)
+                        if self.pin.value() == 0:
+                            self._press_time = current_time
+                else:
+                    if self._press_time is not None:
+                        press_duration = utime.ticks_diff(current_time, self._press_time)
+                        self._press_time = None
+                        if press_duration >= self._LONG_TIMEOUT_MS:
+                            self.callback(self.LONG_EVENT_ID)
+                        else:
+                            self.callback(self.SHORT_EVENT_ID)
+
+    return LegacyButtonPort
+
+
+def _install_legacy_inputs() -> None:
+    """Buttons on their own polling tasks, leak pins on the IRQ plus the former 5 s poll"""
+    import uasyncio
+    from machine import Pin
+    import Helpers.Gpio as Gpio
+    import Buttons.ButtonPort
+    from Sensors.LeakPort import LeakPort
+    from Sensors.LeakSensors import LeakSensors
+
+    Buttons.ButtonPort.ButtonPort = _legacy_button_port()
+
+    def start_port(port):
+        if not port._active:
+            port._active = True
+            port._last_state = port.get_leak_state()
+            port.pin.irq(trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING, handler=port._on_edge)
+
+    async def _legacy_leak_poll(sensors):
+        zones_mask = 0
+        active_low_mask = 0
+        for port in sensors.ports:
+            zones_mask |= port.bit
+            if port._leak_level == 0:
+                active_low_mask |= port.bit
+        while True:
+            await uasyncio.sleep(5)
+            leaks = (Gpio.read_levels() ^ active_low_mask) & zones_mask
+            changed = leaks ^ sensors._triggered_mask
+            if changed:
+                for port in sensors.ports:
+                    if changed & port.bit:
+                        port.leak_handler()
+
+    start_sensors = LeakSensors.start
+
+    def start_sensors_with_poll(sensors):
+        start_sensors(sensors)
+        uasyncio.create_task(_legacy_leak_poll(sensors))
+
+    LeakPort.start = start_port
+    LeakSensors.start = start_sensors_with_poll
+
+
+def _count_handles(loop, counts: dict):
+    """Count and time every handle the loop runs; task steps by their coroutine"""
+    handle_run = asyncio.events.Handle._run
+
+    def run(handle):
+        start = time.perf_counter()
+        handle_run(handle)
+        elapsed = time.perf_counter() - start
+        if not counts["on"]:
+            return
+        counts["handles"] += 1
+        counts["host_s"] += elapsed
+        task = getattr(handle._callback, "__self__", None)
+        if isinstance(task, asyncio.tasks._PyTask):
+            counts["steps"] += 1
+            if task.get_coro().__qualname__.endswith(_INPUT_TASKS):
+                counts["input_steps"] += 1
+                counts["input_host_s"] += elapsed
+
+    # Python tasks: the C tasks hide the task behind their step callback
+    loop.set_task_factory(lambda loop, coro: asyncio.tasks._PyTask(coro, loop=loop))
+    asyncio.events.Handle._run = run
+    return handle_run
+
+
+def measure(config: str, warmup_s: float, seconds: float) -> dict:
+    """Loop load of the inputs over `seconds` of virtual time after the boot"""
+    runtime = sim.install()
+    loop = runtime.loop
+    cwd = os.getcwd()
+    workdir = tempfile.TemporaryDirectory(prefix="input_load_")
+    os.chdir(workdir.name)
+    os.makedirs("State")
+    counts = {"on": False, "handles": 0, "steps": 0, "input_steps": 0, "host_s": 0.0, "input_host_s": 0.0}
+    handle_run = _count_handles(loop, counts)
+    try:
+        import Resources.Settings as Settings
+        from Helpers.TempSensorConfig import get_temp_sensors
+        from Logging.AppLogger import AppLogger
+        from sim import devices, inputs
+
+        devices.attach(Settings)
+        runtime.board.wifi["ssid"] = Settings.WIFI_SSID
+        runtime.board.http_port = 0  # Any free host port, the runs do not share one
+        inputs.add_temp_probes(get_temp_sensors())
+        AppLogger().setLevel(40)
+        if config == "legacy":
+            _install_legacy_inputs()
+
+        from main import Main
+        from Helpers.InputScanner import InputScanner
+
+        app = Main()
+        task = loop.create_task(app.run())
+        loop.call_at(warmup_s, counts.__setitem__, "on", True)
+        try:
+            loop.run_until_complete(asyncio.wait_for(asyncio.shield(task), warmup_s + seconds))
+        except asyncio.TimeoutError:
+            pass
+        counts["on"] = False
+        counts["scanner"] = dict(InputScanner().stats)
+        loop.run_until_complete(app.cleanup())
+        sim.drain()
+        return counts
+    finally:
+        asyncio.events.Handle._run = handle_run
+        os.chdir(cwd)
+        workdir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event loop wakeups and host time of the input handling")
+    parser.add_argument("--warmup", type=float, default=60.0, help="virtual seconds of boot left out")
+    parser.add_argument("--seconds", type=float, default=300.0, help="virtual seconds measured")
+    args = parser.parse_args()
+
+    print("%-8s %12s %12s %12s %14s %14s  %s" % (
+        "config", "wakeups/s", "input w/s", "handles/s", "host ms/s", "input ms/s", "InputScanner.stats"))
+    for config in CONFIGS:
+        counts = measure(config, args.warmup, args.seconds)
+        seconds = args.seconds
+        print("%-8s %12.1f %12.1f %12.1f %14.2f %14.2f  %s" % (
+            config, counts["steps"] / seconds, counts["input_steps"] / seconds, counts["handles"] / seconds,
+            counts["host_s"] * 1000 / seconds, counts["input_host_s"] * 1000 / seconds,
+            counts["scanner"] if config == "scanner" else "-"))
+    print("wakeups = task steps; host ms/s = host CPU per virtual second, a proxy: device idle time is not measured")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# Counts the I2C traffic of the LCD screens.
+#
+# Runs on the host (CPython 3.8+) from the repository root:
+#   python3 Tools/lcd_benchmark.py
+#   python3 Tools/lcd_benchmark.py --cycles 20
+#
+# The real Display and screens run on the LCD1602 and PCA9633 models of
+# Tools/sim, which count every transfer and byte. A carousel cycle presents
+# each carousel screen once while the temperatures move by a tenth of a
+# degree; a valve run redraws the progress screen at every progress update.
+# The render rate is the host time print_out takes for the text of a cycle.
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sim
+
+
+def _counters(board, devices) -> tuple:
+    lcd = board.i2c[devices.LCD1602.ADDRESS]
+    backlight = board.i2c[devices.PCA9633.ADDRESS]
+    return lcd.transfers, lcd.bytes, backlight.transfers, backlight.bytes
+
+
+def _render_rate(display, screens, repeats: int) -> float:
+    """Characters print_out puts into the LCD per millisecond of host time"""
+    lcd = display.lcd
+    texts = []
+    print_out = lcd.print_out
+    lcd.print_out = lambda string: (texts.append(string), print_out(string))
+    for screen in screens:
+        screen.present()
+    del lcd.print_out
+
+    symbols = []
+    for text in texts:
+        symbols += [key for key in lcd.available_custom_symbols if key in text and key not in symbols]
+    lcd.clear_custom_symbols()
+    lcd.load_custom_symbols(symbols[:8])
+    chars = 0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            lcd.set_cursor(0, 0)
+            lcd.print_out(text)
+            chars += len(text)
+    return chars / ((time.perf_counter() - start) * 1000)
+
+
+def measure(cycles: int, steps: int, repeats: int) -> dict:
+    """({scenario: (LCD transfers, LCD bytes, backlight transfers, backlight bytes) per redraw}, render rate)"""
+    runtime = sim.install()
+    cwd = os.getcwd()
+    workdir = tempfile.TemporaryDirectory(prefix="lcd_benchmark_")
+    os.chdir(workdir.name)
+    os.makedirs("State")
+    try:
+        import Resources.Settings as Settings
+        from Logging.AppLogger import AppLogger
+        from sim import devices
+
+        devices.attach(Settings)
+        AppLogger().setLevel(40)
+        from State.States import States
+        from Helpers.TempSensorConfig import get_temp_sensor_names
+        from LCD.Display import Display
+        from LCD.Screens.ProgressScreen import ProgressScreen
+
+        states = States()
+        display = Display(states)
+        display.show_carusel()
+        display.stop()
+        screens = list(display._screens)
+        names = get_temp_sensor_names()
+        board = runtime.board
+        results = {}
+
+        # The first cycle draws over the starting screen, the next ones are steady state
+        for screen in screens:
+            screen.present()
+        start = _counters(board, devices)
+        for cycle in range(cycles):
+            for name in names:
+                states.update_temperature(name, round(40.0 + (cycle + 1) / 10, 1))
+            for screen in screens:
+                screen.present()
+        end = _counters(board, devices)
+        results["carousel cycle (%d screens)" % len(screens)] = tuple((b - a) / cycles for a, b in zip(start, end))
+
+        progress = ProgressScreen(display.lcd, "Open hot valve", "hot_water_valve")
+        progress.present()
+        start = _counters(board, devices)
+        for step in range(steps):
+            progress.update_progress((step + 1) / steps, True)
+            progress.present()
+        end = _counters(board, devices)
+        results["progress update"] = tuple((b - a) / steps for a, b in zip(start, end))
+        return results, _render_rate(display, screens, repeats)
+    finally:
+        os.chdir(cwd)
+        workdir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="I2C transfers and bytes of the LCD screen updates")
+    parser.add_argument("--cycles", type=int, default=10, help="carousel cycles measured")
+    parser.add_argument("--steps", type=int, default=16, help="progress updates of a valve run")
+    parser.add_argument("--repeats", type=int, default=2000, help="carousel texts rendered for the render rate")
+    args = parser.parse_args()
+
+    results, rate = measure(args.cycles, args.steps, args.repeats)
+    print("%-28s %10s %10s %10s %10s" % ("per", "LCD xfers", "LCD bytes", "RGB xfers", "RGB bytes"))
+    for scenario, (lcd_transfers, lcd_bytes, rgb_transfers, rgb_bytes) in results.items():
+        print("%-28s %10.1f %10.1f %10.1f %10.1f" % (scenario, lcd_transfers, lcd_bytes, rgb_transfers, rgb_bytes))
+    print("render: %.0f characters/ms (host)" % rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# Logging throughput / allocation benchmark.
+#
+# Runs on the MicroPython unix port from the repository root:
+#   micropython Tools/log_benchmark.py
+#
+# For every call style it prints records per second and bytes allocated per
+# call with the logger at INFO (debug records filtered) and at DEBUG.
+# The second table compares the emit pipeline of Logging/Logger.py with the
+# previous one (new record per call, usesTime() per record, __dict__ formatting).
+import sys
+sys.path.insert(0, ".")
+
+import gc
+import time
+from Logging.Logger import DEBUG, INFO, StreamHandler, Formatter, _level_dict
+from Logging.AppLogger import AppLogger
+
+CALLS = 2000
+
+
+class _NullStream:
+    def write(self, data):
+        pass
+
+
+def _f_string(logger, zone1, zone2):
+    logger.debug(f"LEAK SENSOR: Update leak sensor state: ZONE 1: {zone1}, ZONE 2: {zone2}")
+
+
+def _deferred(logger, zone1, zone2):
+    logger.debug("LEAK SENSOR: Update leak sensor state: ZONE 1: %s, ZONE 2: %s", zone1, zone2)
+
+
+def _guarded(logger, zone1, zone2):
+    if logger.isEnabledFor(DEBUG):
+        logger.debug("LEAK SENSOR: Update leak sensor state: ZONE 1: %s, ZONE 2: %s", zone1, zone2)
+
+
+class _LegacyRecord:
+    def __init__(self, name, level, msg, args):
+        ct = time.time()
+        self.created = ct
+        self.msecs = (ct - int(ct)) * 1000
+        self.name = name
+        self.levelno = level
+        self.levelname = _level_dict.get(level, None)
+        self.msg = msg
+        self.args = args
+        self.exc_info = None
+
+
+class _LegacyFormatter:
+    def __init__(self, fmt):
+        self.fmt = fmt
+
+    def format(self, record):
+        record.message = record.msg % record.args
+        if "%(asctime)" in self.fmt:
+            record.asctime = str(record.created)
+        return self.fmt % record.__dict__
+
+
+def _legacy_pipeline(logger, zone1, zone2):
+    record = _LegacyRecord("AppLogger", DEBUG, "LEAK SENSOR: Update leak sensor state: ZONE 1: %s, ZONE 2: %s", (zone1, zone2))
+    handler = logger.legacy_handler
+    handler._stream.write(handler.legacy_formatter.format(record) + handler.terminator)
+
+
+def _compiled_pipeline(logger, zone1, zone2):
+    logger.log.log(DEBUG, "LEAK SENSOR: Update leak sensor state: ZONE 1: %s, ZONE 2: %s", zone1, zone2)
+
+
+def _run(logger, level, fn):
+    logger.setLevel(level)
+    zone1, zone2 = "no_leak", "leak"
+    gc.collect()
+    gc.disable()
+    alloc_before = gc.mem_alloc()
+    start = time.ticks_us()
+    for _ in range(CALLS):
+        fn(logger, zone1, zone2)
+    elapsed = max(time.ticks_diff(time.ticks_us(), start), 1)
+    alloc_after = gc.mem_alloc()
+    gc.enable()
+    return CALLS * 1000000 // elapsed, (alloc_after - alloc_before) // CALLS
+
+
+def main():
+    logger = AppLogger()
+    handler = StreamHandler(_NullStream())
+    handler.setFormatter(Formatter("%(levelname)s:%(name)s: %(message)s"))
+    logger.log.handlers = [handler]
+
+    print("{:<10} {:<6} {:>12} {:>12}".format("style", "level", "records/s", "bytes/call"))
+    for name, fn in (("f-string", _f_string), ("deferred", _deferred), ("guarded", _guarded)):
+        for level_name, level in (("INFO", INFO), ("DEBUG", DEBUG)):
+            rate, alloc = _run(logger, level, fn)
+            print("{:<10} {:<6} {:>12} {:>12}".format(name, level_name, rate, alloc))
+
+    handler.legacy_formatter = _LegacyFormatter("%(levelname)s:%(name)s: %(message)s")
+    logger.legacy_handler = handler
+    print()
+    print("{:<10} {:>12} {:>12}".format("pipeline", "records/s", "bytes/call"))
+    for name, fn in (("legacy", _legacy_pipeline), ("compiled", _compiled_pipeline)):
+        rate, alloc = _run(logger, DEBUG, fn)
+        print("{:<10} {:>12} {:>12}".format(name, rate, alloc))
+
+
+main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Generates Logging/LogCatalog.py - the message ID catalog of the binary log format.
+#
+# Runs on the host (CPython 3.8+) from the repository root:
+#   python3 Tools/log_catalog.py
+#
+# Every logger call whose first argument is a string literal gets an ID.
+# IDs already present in the catalog are kept, new messages are appended,
+# so binary logs written by older firmware still decode correctly.
+import ast
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_PATH = os.path.join(ROOT, "Logging", "LogCatalog.py")
+LEVEL_METHODS = ("debug", "info", "warning", "warn", "error", "critical", "exc", "exception")
+SKIP_DIRS = ("Tools", ".git", "__pycache__")
+
+
+def load_catalog(path=CATALOG_PATH) -> dict:
+    """Return {format string: message ID} from an existing catalog file"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "MESSAGES" for t in node.targets):
+            return ast.literal_eval(node.value)
+    return {}
+
+
+def _is_logger(node) -> bool:
+    name = node.attr if isinstance(node, ast.Attribute) else getattr(node, "id", "")
+    return "log" in name.lower()
+
+
+def find_messages(root=ROOT) -> list:
+    messages = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            if not filename.endswith(".py") or filename == "LogCatalog.py":
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, encoding="utf-8") as f:
+                tree = ast.parse(f.read(), path)
+            for node in ast.walk(tree):
+                if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+                    continue
+                if node.func.attr not in LEVEL_METHODS or not _is_logger(node.func.value):
+                    continue
+                args = node.args[1:] if node.func.attr in ("exc", "exception") else node.args
+                if args and isinstance(args[0], ast.Constant) and isinstance(args[0].value, str):
+                    messages.append(args[0].value)
+    return messages
+
+
+def write_catalog(catalog: dict, path=CATALOG_PATH) -> None:
+    lines = [
+        "# Generated by Tools/log_catalog.py - do not edit by hand.",
+        "# Maps log format strings to the message IDs of the binary log format",
+        "# (see Logging/BinaryFormatter.py). IDs must never be reused.",
+        "MESSAGES = {",
+    ]
+    for message, msg_id in sorted(catalog.items(), key=lambda item: item[1]):
+        lines.append("    {0!r}: {1},".format(message, msg_id))
+    lines.append("}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main() -> int:
+    catalog = load_catalog()
+    next_id = max(catalog.values(), default=-1) + 1
+    added = 0
+    for message in find_messages():
+        if message not in catalog:
+            catalog[message] = next_id
+            next_id += 1
+            added += 1
+    if next_id >= 0xFFFF:
+        print("Catalog is full: message IDs must stay below 0xFFFF", file=sys.stderr)
+        return 1
+    write_catalog(catalog)
+    print("{0}: {1} messages ({2} new)".format(os.path.relpath(CATALOG_PATH, ROOT), len(catalog), added))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# Decodes binary log files (LOG_FILE_BINARY = True) back into text.
+#
+# Runs on the host (CPython 3.8+) from the repository root:
+#   python3 Tools/log_decode.py app.log.2 app.log.1 app.log
+#
+# Pass rotated files oldest first to get one continuous log.
+import argparse
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from log_catalog import CATALOG_PATH, load_catalog
+
+RECORD_MAGIC = 0xA5
+RAW_MESSAGE_ID = 0xFFFF
+HEADER_FORMAT = "<BIBHB"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+LEVEL_NAMES = {50: "CRITICAL", 40: "ERROR", 30: "WARNING", 20: "INFO", 10: "DEBUG"}
+
+# Seconds between the Unix epoch and the MicroPython epoch of the firmware
+EPOCH_OFFSETS = {1970: 0, 2000: 946684800}
+
+
+class DecodeError(ValueError):
+    pass
+
+
+def _read_arg(data: bytes, pos: int):
+    tag = chr(data[pos])
+    pos += 1
+    if tag == "i":
+        return struct.unpack_from("<i", data, pos)[0], pos + 4
+    if tag == "f":
+        return round(struct.unpack_from("<f", data, pos)[0], 3), pos + 4
+    if tag == "s":
+        size = data[pos]
+        return data[pos + 1:pos + 1 + size].decode("utf-8", "replace"), pos + 1 + size
+    if tag == "T":
+        return True, pos
+    if tag == "F":
+        return False, pos
+    if tag == "N":
+        return None, pos
+    raise DecodeError("unknown argument tag {0!r}".format(tag))
+
+
+def iter_records(data: bytes):
+    """Yield (timestamp, level, message_id, args); skips damaged bytes up to the next record"""
+    pos = 0
+    while pos + HEADER_SIZE <= len(data):
+        if data[pos] != RECORD_MAGIC:
+            pos += 1
+            continue
+        try:
+            _, timestamp, level, msg_id, nargs = struct.unpack_from(HEADER_FORMAT, data, pos)
+            end = pos + HEADER_SIZE
+            args = []
+            for _ in range(nargs):
+                arg, end = _read_arg(data, end)
+                args.append(arg)
+            if end > len(data):
+                raise DecodeError("truncated record")
+        except (DecodeError, struct.error, IndexError):
+            pos += 1
+            continue
+        yield timestamp, level, msg_id, tuple(args)
+        pos = end
+
+
+def format_record(record, messages: dict, epoch: int, tz_offset: int) -> str:
+    timestamp, level, msg_id, args = record
+    if msg_id == RAW_MESSAGE_ID:
+        text = args[0] if args else ""
+    elif msg_id in messages:
+        fmt = messages[msg_id]
+        try:
+            text = fmt % args if args else fmt
+        except (TypeError, ValueError):
+            text = "{0} {1!r}".format(fmt, args)
+    else:
+        text = "<unknown message #{0}> {1!r}".format(msg_id, args)
+
+    ct = time.gmtime(timestamp + EPOCH_OFFSETS[epoch] + tz_offset * 3600)
+    return "{0} {1}:AppLogger: {2}".format(
+        time.strftime("%Y-%m-%d %H:%M:%S", ct), LEVEL_NAMES.get(level, "LVL%d" % level), text
+    )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Decode binary WaterLeak log files to text")
+    parser.add_argument("files", nargs="+", help="binary log files, oldest first")
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="path to Logging/LogCatalog.py")
+    parser.add_argument("--epoch", type=int, choices=sorted(EPOCH_OFFSETS), default=1970,
+                        help="epoch of the firmware time.time() (MicroPython < 1.22 on rp2 uses 2000)")
+    parser.add_argument("--tz-offset", type=int, default=0, help="hours added to the timestamps")
+    args = parser.parse_args(argv)
+
+    messages = {msg_id: fmt for fmt, msg_id in load_catalog(args.catalog).items()}
+    for path in args.files:
+        with open(path, "rb") as f:
+            data = f.read()
+        for record in iter_records(data):
+            print(format_record(record, messages, args.epoch, args.tz_offset))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
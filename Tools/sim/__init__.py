@@ -0,0 +1,103 @@
+# Host-side simulator of the controller.
+#
+# install() puts host ports of the MicroPython modules (machine, onewire,
+# ds18x20, utime, uasyncio, gc, micropython...) in sys.modules and creates a
+# virtual-time event loop, so the firmware modules import and run unchanged
+# under CPython 3.8+. The simulated hardware is sim.runtime.board.
+import __future__
+import asyncio
+import binascii
+import importlib.machinery
+import io
+import json
+import os
+import struct
+import sys
+import warnings
+
+from sim import runtime
+from sim.board import Board
+from sim.clock import DEFAULT_EPOCH, VirtualClock, VirtualTimeLoop
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT = os.path.dirname(TOOLS_DIR)
+PORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ports")
+
+_ALIASES = {
+    "ujson": json,
+    "ustruct": struct,
+    "uio": io,
+    "ubinascii": binascii,
+    "uos": os,
+}
+
+
+class _FirmwareLoader(importlib.machinery.SourceFileLoader):
+    """MicroPython ignores annotations, CPython evaluates them at definition
+    time (circular imports between LCD modules fail). Compile firmware modules
+    with postponed annotations instead, bypassing the bytecode cache."""
+
+    def get_code(self, fullname):
+        path = self.get_filename(fullname)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", SyntaxWarning)
+            return compile(self.get_data(path), path, "exec", flags=__future__.annotations.compiler_flag, dont_inherit=True)
+
+
+class _FirmwareFinder:
+
+    @staticmethod
+    def find_spec(fullname, path=None, target=None):
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is not None and _is_firmware(spec.origin) and spec.origin.endswith(".py"):
+            spec.loader = _FirmwareLoader(fullname, spec.origin)
+        return spec
+
+
+def _is_firmware(path) -> bool:
+    return bool(path) and path.startswith(ROOT + os.sep) and not path.startswith(TOOLS_DIR + os.sep)
+
+
+def install(speed: float = 0.0, epoch: int = DEFAULT_EPOCH):
+    """Install the ports and a fresh board, clock and loop; returns runtime"""
+    if PORTS_DIR not in sys.path:
+        sys.path.insert(0, PORTS_DIR)
+    if ROOT not in sys.path:
+        sys.path.insert(1, ROOT)
+    if _FirmwareFinder not in sys.meta_path:
+        sys.meta_path.insert(0, _FirmwareFinder)
+    reset_firmware()
+
+    runtime.clock = VirtualClock(epoch)
+    runtime.board = Board()
+    if runtime.loop is not None:
+        runtime.loop.close()
+    runtime.loop = VirtualTimeLoop(runtime.clock, speed)
+    asyncio.set_event_loop(runtime.loop)
+
+    import utime
+    import ugc
+    import usocket
+    sys.modules.update(_ALIASES)
+    sys.modules["time"] = utime
+    sys.modules["gc"] = ugc
+    sys.modules["socket"] = usocket
+    return runtime
+
+
+def reset_firmware() -> None:
+    """Forget the imported firmware modules, with their singletons and caches"""
+    names = [name for name, module in list(sys.modules.items())
+             if _is_firmware(getattr(module, "__file__", None) or next(iter(getattr(module, "__path__", ())), ""))]
+    for name in names:
+        del sys.modules[name]
+
+
+def drain(timeout_s: float = 5.0) -> None:
+    """Cancel every task left on the loop and let them finish"""
+    loop = runtime.loop
+    tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        loop.run_until_complete(asyncio.wait(tasks, timeout=timeout_s))
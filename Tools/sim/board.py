@@ -0,0 +1,135 @@
+# The simulated Pico W: what the firmware sees through the port modules.
+#
+# Inputs are driven by the outside world (a trace, a test scenario), outputs
+# by the firmware. Every output change is kept in `actions` with its time.
+from sim import runtime
+
+GPIO_COUNT = 30
+
+# rp2 Pin constants
+IN = 0
+OUT = 1
+PULL_UP = 1
+PULL_DOWN = 2
+IRQ_FALLING = 4
+IRQ_RISING = 8
+
+
+def crc8(data) -> int:
+    """Dallas/Maxim 1-Wire CRC"""
+    crc = 0
+    for byte in data:
+        for _ in range(8):
+            mix = (crc ^ byte) & 1
+            crc >>= 1
+            if mix:
+                crc ^= 0x8C
+            byte >>= 1
+    return crc
+
+
+def make_rom(serial: int) -> bytes:
+    """DS18B20 ROM code: family 0x28, 48-bit serial, CRC"""
+    rom = bytes([0x28]) + serial.to_bytes(6, "little")
+    return rom + bytes([crc8(rom)])
+
+
+class OneWireDevice:
+    """A DS18B20 on a simulated bus"""
+
+    def __init__(self, rom: bytes, temp: float = 20.0):
+        self.rom = rom
+        self.temp = temp            # Temperature the sensor is exposed to
+        self.resolution = 12
+        self.th = 0x4B
+        self.tl = 0x46
+        self.converted = None       # Last converted reading, None after power-on
+        self.present = True
+        self.eeprom = (self.th, self.tl, self.resolution)  # Loaded at power-on
+
+    def power_on(self) -> None:
+        """Power-on reset: the scratchpad comes back from EEPROM"""
+        self.th, self.tl, self.resolution = self.eeprom
+        self.converted = None
+
+
+class Board:
+
+    def __init__(self):
+        self.inputs = {}     # gpio -> level driven from outside
+        self.outputs = {}    # gpio -> level driven by the firmware
+        self.modes = {}      # gpio -> IN / OUT
+        self.pulls = {}      # gpio -> PULL_UP / PULL_DOWN / None
+        self.irqs = {}       # gpio -> (handler, trigger, hard, pin)
+        self.adc = {}        # gpio -> 16-bit reading
+        self.onewire = {}    # gpio -> [OneWireDevice]
+        self.i2c = {}        # 7-bit address -> device with readfrom_mem/writeto_mem
+        self.pwm = {}        # gpio -> (freq, duty_u16)
+        self.actions = []    # (ticks_ms, gpio, level)
+        self.output_listeners = []  # callback(gpio, level)
+        # WiFi access point (reachable, association time, signal) and the
+        # station: powered, tick the association completes at, connect() calls
+        self.http_port = 8080  # Host port the web server's port 80 is mapped to
+        self.wifi = {"ssid": "home", "available": True, "connect_ms": 1500, "rssi": -60, "ip": "192.168.1.50",
+                     "active": False, "connected_at": None, "connects": []}
+
+    # MARK: GPIO
+    def level(self, gpio: int) -> int:
+        if self.modes.get(gpio) == OUT:
+            return self.outputs.get(gpio, 0)
+        if gpio in self.inputs:
+            return self.inputs[gpio]
+        return 1 if self.pulls.get(gpio) == PULL_UP else 0
+
+    def read_levels(self) -> int:
+        levels = 0
+        for gpio in range(GPIO_COUNT):
+            if self.level(gpio):
+                levels |= 1 << gpio
+        return levels
+
+    def set_input(self, gpio: int, level: int) -> None:
+        """Drive an input from outside, firing the pin IRQ on a change"""
+        old = self.level(gpio)
+        self.inputs[gpio] = 1 if level else 0
+        new = self.level(gpio)
+        if new != old:
+            self._fire_irq(gpio, new)
+
+    def write_output(self, gpio: int, level: int) -> None:
+        """Firmware output write, recorded when the level changes (outputs start low)"""
+        level = 1 if level else 0
+        changed = self.outputs.get(gpio, 0) != level
+        self.outputs[gpio] = level
+        if not changed:
+            return
+        self.actions.append((runtime.clock.ticks_ms(), gpio, level))
+        for listener in self.output_listeners:
+            listener(gpio, level)
+
+    def _fire_irq(self, gpio: int, level: int) -> None:
+        irq = self.irqs.get(gpio)
+        if irq is None:
+            return
+        handler, trigger, hard, pin = irq
+        if not trigger & (IRQ_RISING if level else IRQ_FALLING):
+            return
+        if hard:
+            handler(pin)
+        else:
+            runtime.loop.call_soon(handler, pin)
+
+    def set_wifi(self, available: bool) -> None:
+        """Access point up or down; the station loses its association when it goes"""
+        self.wifi["available"] = available
+        if not available:
+            self.wifi["connected_at"] = None
+
+    # MARK: OneWire
+    def add_ds18b20(self, gpio: int, temp: float = 20.0, serial: int = None) -> OneWireDevice:
+        devices = self.onewire.setdefault(gpio, [])
+        if serial is None:
+            serial = (gpio << 8) | (len(devices) + 1)
+        device = OneWireDevice(make_rom(serial), temp)
+        devices.append(device)
+        return device
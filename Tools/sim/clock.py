@@ -0,0 +1,136 @@
+# Virtual time for the host simulator.
+#
+# The clock only moves when the event loop has nothing to run: instead of
+# waiting for the next timer, the selector jumps the clock forward to it.
+# Hours of firmware time then replay in seconds of wall time.
+import asyncio
+import heapq
+import math
+import selectors
+import time as _time
+
+# 2026-01-01 00:00:00 UTC, the wall clock of the board at boot
+DEFAULT_EPOCH = 1767225600
+
+# Clock step when the loop waits without any timer
+_IDLE_STEP_S = 1.0
+
+
+class VirtualClock:
+    """Microsecond clock of the simulated board"""
+
+    def __init__(self, epoch: int = DEFAULT_EPOCH):
+        self.epoch = epoch        # Wall time of the board at ticks 0
+        self.world_epoch = epoch  # True wall time at ticks 0 (what NTP serves)
+        self.now_us = 0
+        self._interrupts = []  # Heap of (due us, sequence, [callback]): hard timer IRQs
+        self._sequence = 0
+
+    def advance_us(self, us) -> None:
+        if us <= 0:
+            return
+        target = self.now_us + int(math.ceil(us))
+        # Hard IRQs fire on time, even in the middle of a blocking stall
+        while self._interrupts and self._interrupts[0][0] <= target:
+            due_us, _, entry = heapq.heappop(self._interrupts)
+            self.now_us = max(self.now_us, due_us)
+            if entry[0] is not None:
+                entry[0]()
+        self.now_us = target
+
+    def interrupt_at(self, due_us: int, callback) -> list:
+        """Run callback when the clock reaches due_us, the returned entry cancels it: entry[0] = None"""
+        entry = [callback]
+        self._sequence += 1
+        heapq.heappush(self._interrupts, (due_us, self._sequence, entry))
+        return entry
+
+    def next_interrupt_s(self):
+        """Seconds to the next pending hard IRQ, None without any"""
+        while self._interrupts and self._interrupts[0][2][0] is None:
+            heapq.heappop(self._interrupts)
+        if not self._interrupts:
+            return None
+        return max(self._interrupts[0][0] - self.now_us, 0) / 1000000
+
+    def monotonic(self) -> float:
+        return self.now_us / 1000000
+
+    def ticks_ms(self) -> int:
+        return self.now_us // 1000
+
+    def ticks_us(self) -> int:
+        return self.now_us
+
+    def time(self) -> int:
+        return self.epoch + self.now_us // 1000000
+
+    def world_time(self) -> int:
+        return self.world_epoch + self.now_us // 1000000
+
+    def set_time(self, seconds: int) -> None:
+        """Set the wall clock (RTC, NTP) without moving the ticks"""
+        self.epoch = seconds - self.now_us // 1000000
+
+
+class _VirtualSelector(selectors.BaseSelector):
+    """Real selector for sockets, virtual clock for the timeouts"""
+
+    def __init__(self, clock: VirtualClock, speed: float):
+        self._clock = clock
+        self._speed = speed
+        self._anchor = None  # (real time, virtual us) pacing started at
+        self._real = selectors.DefaultSelector()
+
+    def register(self, fileobj, events, data=None):
+        return self._real.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._real.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self._real.modify(fileobj, events, data)
+
+    def get_map(self):
+        return self._real.get_map()
+
+    def close(self):
+        self._real.close()
+
+    def select(self, timeout=None):
+        if timeout == 0:
+            return self._real.select(0)
+        step = _IDLE_STEP_S if timeout is None else timeout
+        interrupt_s = self._clock.next_interrupt_s()
+        if interrupt_s is not None:
+            # Wake the loop after a hard IRQ, for the work it scheduled
+            step = min(step, interrupt_s)
+        if self._speed:
+            # Paced against the real clock, sockets can wake the loop early
+            if self._anchor is None:
+                self._anchor = (_time.monotonic(), self._clock.now_us)
+            real_start, virtual_start = self._anchor
+            deadline_us = self._clock.now_us + step * 1000000
+            wait = real_start + (deadline_us - virtual_start) / 1000000 / self._speed - _time.monotonic()
+            events = self._real.select(max(wait, 0))
+            reached_us = virtual_start + (_time.monotonic() - real_start) * self._speed * 1000000
+            self._clock.advance_us(min(deadline_us, reached_us) - self._clock.now_us)
+            return events
+        events = self._real.select(0)
+        if not events:
+            self._clock.advance_us(step * 1000000)
+        return events
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """asyncio loop whose time() is the virtual clock.
+
+    speed 0 runs as fast as possible, 1 at real time, 10 ten times faster.
+    """
+
+    def __init__(self, clock: VirtualClock, speed: float = 0.0):
+        super().__init__(_VirtualSelector(clock, speed))
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.monotonic()
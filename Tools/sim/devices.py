@@ -0,0 +1,237 @@
+# I2C devices of the board: the DS3231 real-time clock and the Waveshare
+# LCD1602 RGB module (AiP31068 character controller, PCA9633 backlight).
+import calendar
+import datetime
+
+from sim import runtime
+
+
+def _utc(seconds: int):
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+
+
+def _bcd(value: int) -> int:
+    return (value // 10) << 4 | (value % 10)
+
+
+def _dec(bcd: int) -> int:
+    return (bcd >> 4) * 10 + (bcd & 0x0F)
+
+
+class RegisterDevice:
+    """I2C device with a register pointer that auto-increments"""
+
+    def __init__(self, size: int):
+        self.regs = bytearray(size)
+        self.pointer = 0
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.pointer = data[0]
+        for value in data[1:]:
+            self.write_register(self.pointer % len(self.regs), value)
+            self.pointer += 1
+        if len(data) > 1:
+            self.after_write()
+
+    def read(self, nbytes: int) -> bytes:
+        out = bytearray()
+        for _ in range(nbytes):
+            out.append(self.read_register(self.pointer % len(self.regs)))
+            self.pointer += 1
+        return bytes(out)
+
+    def write_register(self, reg: int, value: int) -> None:
+        self.regs[reg] = value
+
+    def read_register(self, reg: int) -> int:
+        return self.regs[reg]
+
+    def after_write(self) -> None:
+        pass
+
+
+class DS3231(RegisterDevice):
+    """DS3231 with its own time base, alarm 1/2 matching and the INT pin.
+
+    The chip keeps the true wall time unless `osf` says the battery ran out.
+    """
+    ADDRESS = 0x68
+
+    def __init__(self, int_pin: int = None, osf: bool = False, temperature: float = 25.0):
+        super().__init__(0x13)
+        clock = runtime.clock
+        self._offset_s = clock.world_time() - clock.ticks_ms() // 1000
+        if osf:
+            self._offset_s = 946684800 - clock.ticks_ms() // 1000  # 2000-01-01
+        self.regs[0x0E] = 0x1C             # INTCN, RS2, RS1 (power-on value)
+        self.regs[0x0F] = 0x80 if osf else 0x00
+        self.regs[0x11] = int(temperature) & 0xFF
+        self.regs[0x12] = int((temperature % 1) * 4) << 6
+        self.int_pin = int_pin
+        self._last_second = None
+        if int_pin is not None:
+            runtime.board.set_input(int_pin, 1)  # Open drain with pull-up
+        self._schedule()
+
+    def now(self) -> int:
+        return self._offset_s + runtime.clock.ticks_ms() // 1000
+
+    # MARK: Registers
+    def read_register(self, reg: int) -> int:
+        if reg < 7:
+            t = _utc(self.now())
+            return (_bcd(t.second), _bcd(t.minute), _bcd(t.hour), t.isoweekday(),
+                    _bcd(t.day), _bcd(t.month), _bcd(t.year % 100))[reg]
+        return self.regs[reg]
+
+    def write_register(self, reg: int, value: int) -> None:
+        if reg < 7:
+            self._time_written = True
+        if reg == 0x0F:
+            value = (self.regs[0x0F] & value & 0x83) | (value & 0x08)  # Flags can only be cleared
+        self.regs[reg] = value
+
+    def after_write(self) -> None:
+        if getattr(self, "_time_written", False):
+            self._time_written = False
+            r = self.regs
+            seconds = calendar.timegm((2000 + _dec(r[6]), _dec(r[5] & 0x1F), _dec(r[4]),
+                                       _dec(r[2] & 0x3F), _dec(r[1]), _dec(r[0]), 0, 0, 0))
+            self._offset_s = seconds - runtime.clock.ticks_ms() // 1000
+        self._update_int_pin()
+
+    # MARK: Alarms
+    def _schedule(self) -> None:
+        runtime.loop.call_later(1.0 - (runtime.clock.ticks_ms() % 1000) / 1000, self._tick)
+
+    def _tick(self) -> None:
+        now = self.now()
+        if now != self._last_second:
+            self._last_second = now
+            t = _utc(now)
+            if self._alarm_matches(self.regs[7:11], t, with_seconds=True):
+                self.regs[0x0F] |= 0x01
+            if t.second == 0 and self._alarm_matches(bytes([0x80]) + self.regs[11:14], t, with_seconds=False):
+                self.regs[0x0F] |= 0x02
+            self._update_int_pin()
+        self._schedule()
+
+    @staticmethod
+    def _alarm_matches(regs, t, with_seconds: bool) -> bool:
+        second, minute, hour, day = regs
+        if with_seconds and not second & 0x80 and _dec(second & 0x7F) != t.second:
+            return False
+        if not minute & 0x80 and _dec(minute & 0x7F) != t.minute:
+            return False
+        if not hour & 0x80 and _dec(hour & 0x3F) != t.hour:
+            return False
+        if not day & 0x80:
+            if day & 0x40:
+                return _dec(day & 0x0F) == t.isoweekday()
+            return _dec(day & 0x3F) == t.day
+        return True
+
+    def _update_int_pin(self) -> None:
+        if self.int_pin is None:
+            return
+        control, status = self.regs[0x0E], self.regs[0x0F]
+        active = control & 0x04 and status & control & 0x03
+        runtime.board.set_input(self.int_pin, 0 if active else 1)
+
+
+class LCD1602:
+    """HD44780-compatible 16x2 controller behind an I2C control byte.
+
+    Control byte 0x80 is followed by a command, 0x40 by display data.
+    Every transfer and byte is counted so screen updates can be measured.
+    """
+    ADDRESS = 0x3E
+    COLS = 16
+
+    def __init__(self):
+        self.ddram = bytearray(b" " * 0x68)
+        self.cgram = bytearray(64)
+        self.address = 0
+        self.cgram_mode = False
+        self.display_on = False
+        self.transfers = 0
+        self.bytes = 0
+
+    def write(self, data: bytes) -> None:
+        self.transfers += 1
+        self.bytes += len(data)
+        if not data:
+            return
+        rs = data[0] & 0x40
+        for value in data[1:]:
+            if rs:
+                self._data(value)
+            else:
+                self._command(value)
+
+    def read(self, nbytes: int) -> bytes:
+        return bytes(nbytes)
+
+    def _command(self, cmd: int) -> None:
+        if cmd & 0x80:
+            self.address, self.cgram_mode = cmd & 0x7F, False
+        elif cmd & 0x40:
+            self.address, self.cgram_mode = cmd & 0x3F, True
+        elif cmd & 0x08 and not cmd & 0x30:
+            self.display_on = bool(cmd & 0x04)
+        elif cmd == 0x01:
+            self.ddram[:] = b" " * len(self.ddram)
+            self.address, self.cgram_mode = 0, False
+        elif cmd & 0xFE == 0x02:
+            self.address, self.cgram_mode = 0, False
+
+    def _data(self, value: int) -> None:
+        if self.cgram_mode:
+            self.cgram[self.address & 0x3F] = value
+            self.address = (self.address + 1) & 0x3F
+        else:
+            if self.address < len(self.ddram):
+                self.ddram[self.address] = value
+            self.address = (self.address + 1) & 0x7F
+
+    def lines(self) -> list:
+        """Visible text, custom characters shown as their CGRAM slot digit"""
+        return ["".join(chr(c) if 32 <= c < 127 else str(c) if c < 8 else "?" for c in self.ddram[base:base + self.COLS])
+                for base in (0x00, 0x40)]
+
+
+class PCA9633(RegisterDevice):
+    """RGB backlight: PWM per colour and the group PWM used as brightness"""
+    ADDRESS = 0x60
+
+    def __init__(self):
+        super().__init__(0x0D)
+        self.brightness_changes = []  # (ticks_ms, GRPPWM value)
+        self.transfers = 0
+        self.bytes = 0
+
+    def write(self, data: bytes) -> None:
+        self.transfers += 1
+        self.bytes += len(data)
+        super().write(data)
+
+    def write_register(self, reg: int, value: int) -> None:
+        if reg == 0x06 and value != self.regs[reg]:
+            self.brightness_changes.append((runtime.clock.ticks_ms(), value))
+        self.regs[reg] = value
+
+    def rgb(self) -> tuple:
+        return self.regs[0x04], self.regs[0x03], self.regs[0x02]
+
+
+def attach(Settings, rtc_lost: bool = False) -> None:
+    """Add the I2C devices of the board to runtime.board.
+
+    rtc_lost: the DS3231 lost its backup battery (OSF set, time at 2000-01-01).
+    """
+    i2c = runtime.board.i2c
+    i2c[DS3231.ADDRESS] = DS3231(getattr(Settings, 'DSDTC_ALARM_PIN', None), osf=rtc_lost)
+    i2c[LCD1602.ADDRESS] = LCD1602()
+    i2c[PCA9633.ADDRESS] = PCA9633()
@@ -0,0 +1,42 @@
+# Drives the inputs of the simulated board: trace events, button presses.
+from sim import runtime
+from sim import trace as tracefile
+
+
+def add_temp_probes(configs) -> list:
+    """One DS18B20 per TEMP_SENSORS entry, in order, pinned ROMs kept"""
+    probes = []
+    for config in configs:
+        probe = runtime.board.add_ds18b20(config["pin"])
+        if config["rom"]:
+            probe.rom = bytes.fromhex(config["rom"])
+        probes.append(probe)
+    return probes
+
+
+def apply_event(event, probes) -> None:
+    _, kind, channel, value = event
+    if kind == tracefile.PIN:
+        runtime.board.set_input(channel, value)
+    elif kind == tracefile.TEMP:
+        probes[channel].temp = value
+    else:
+        runtime.board.adc[channel] = value
+
+
+def schedule_trace(events, probes) -> None:
+    """Apply the t=0 events (inputs at power-on) now, schedule the others"""
+    loop = runtime.loop
+    start_s = loop.time()
+    for event in events:
+        if event[0] <= 0:
+            apply_event(event, probes)
+        else:
+            loop.call_at(start_s + event[0] / 1000, apply_event, event, probes)
+
+
+def press(gpio: int, at_s: float, hold_ms: int = 200) -> None:
+    """Pull an active-low button to ground for hold_ms"""
+    loop = runtime.loop
+    loop.call_at(at_s, runtime.board.set_input, gpio, 0)
+    loop.call_at(at_s + hold_ms / 1000, runtime.board.set_input, gpio, 1)
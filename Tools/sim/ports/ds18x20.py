@@ -0,0 +1,39 @@
+# Host port of the MicroPython `ds18x20` driver.
+import onewire
+
+
+class DS18X20:
+    def __init__(self, onewire_bus):
+        self.ow = onewire_bus
+
+    def _device(self, rom):
+        for device in self.ow.devices():
+            if device.rom == bytes(rom):
+                return device
+        raise onewire.OneWireError("CRC error")  # No answer reads as 0xFF bytes
+
+    def scan(self):
+        return [rom for rom in self.ow.scan() if rom[0] in (0x10, 0x22, 0x28)]
+
+    def convert_temp(self):
+        # Skip-ROM: every device on the bus converts. The reading is the
+        # exposure quantized to the configured resolution.
+        self.ow.reset(True)
+        for device in self.ow.devices():
+            step = 0.5 / (1 << (device.resolution - 9))
+            device.converted = round(device.temp / step) * step
+
+    def read_scratch(self, rom):
+        device = self._device(rom)
+        raw = int(self.read_temp(rom) * 16) & 0xFFFF
+        config = ((device.resolution - 9) << 5) | 0x1F
+        return bytearray((raw & 0xFF, raw >> 8, device.th, device.tl, config, 0xFF, 0, 0x10, 0))
+
+    def write_scratch(self, rom, buf):
+        device = self._device(rom)
+        device.th, device.tl = buf[0], buf[1]
+        device.resolution = ((buf[2] >> 5) & 3) + 9
+
+    def read_temp(self, rom):
+        device = self._device(rom)
+        return 85.0 if device.converted is None else device.converted
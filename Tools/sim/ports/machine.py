@@ -0,0 +1,248 @@
+# Host port of the MicroPython `machine` module, backed by sim.runtime.board.
+from sim import runtime
+import sim.board as _board
+
+
+class Pin:
+    IN = _board.IN
+    OUT = _board.OUT
+    PULL_UP = _board.PULL_UP
+    PULL_DOWN = _board.PULL_DOWN
+    IRQ_FALLING = _board.IRQ_FALLING
+    IRQ_RISING = _board.IRQ_RISING
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        board = runtime.board
+        if mode != -1:
+            board.modes[self.id] = mode
+        if pull != -1:
+            board.pulls[self.id] = pull
+        if value is not None:
+            self.value(value)
+
+    def value(self, value=None):
+        if value is None:
+            return runtime.board.level(self.id)
+        runtime.board.write_output(self.id, value)
+
+    def __call__(self, value=None):
+        return self.value(value)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+    def toggle(self):
+        self.value(1 - self.value())
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+        if handler is None:
+            runtime.board.irqs.pop(self.id, None)
+        else:
+            runtime.board.irqs[self.id] = (handler, trigger, hard, self)
+
+    def __repr__(self):
+        return "Pin(GPIO%d)" % self.id
+
+
+class Signal:
+    def __init__(self, pin, invert=False):
+        self._pin = pin
+        self._invert = invert
+
+    def value(self, value=None):
+        if value is None:
+            return self._pin.value() ^ self._invert
+        self._pin.value(bool(value) ^ self._invert)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self._handle = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, freq=-1, period=-1, callback=None, hard=True):
+        self.deinit()
+        if freq > 0:
+            period = 1000 / freq
+        self._mode = mode
+        self._period_s = max(period, 0) / 1000
+        self._callback = callback
+        self._hard = hard
+        self._arm()
+
+    def deinit(self):
+        if self._handle is None:
+            return
+        if self._hard:
+            self._handle[0] = None
+        else:
+            self._handle.cancel()
+        self._handle = None
+
+    def _arm(self):
+        # Hard timers are interrupts: they fire on time even while the loop is stalled
+        if self._hard:
+            self._handle = runtime.clock.interrupt_at(runtime.clock.now_us + int(self._period_s * 1000000), self._fire)
+        else:
+            self._handle = runtime.loop.call_later(self._period_s, self._fire)
+
+    def _fire(self):
+        if self._mode == Timer.PERIODIC:
+            self._arm()
+        else:
+            self._handle = None
+        if self._callback:
+            self._callback(self)
+
+
+class ADC:
+    CORE_TEMP = 4
+
+    def __init__(self, pin):
+        # ADC(26) / ADC(Pin(26)) / ADC(0) all mean GPIO26
+        self.gpio = pin.id if isinstance(pin, Pin) else (pin + 26 if pin < 4 else pin)
+
+    def read_u16(self):
+        return runtime.board.adc.get(self.gpio, 0)
+
+
+class PWM:
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.gpio = pin.id
+        self._freq = 0
+        self._duty = 0
+        if freq is not None:
+            self.freq(freq)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = value
+        runtime.board.pwm[self.gpio] = (self._freq, self._duty)
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty
+        self._duty = value
+        runtime.board.pwm[self.gpio] = (self._freq, self._duty)
+
+    def deinit(self):
+        runtime.board.pwm.pop(self.gpio, None)
+
+
+def _buffer(buf) -> bytes:
+    # MicroPython passes str as its UTF-8 bytes
+    return buf.encode() if isinstance(buf, str) else bytes(buf)
+
+
+class I2C:
+    """I2C controller: transfers go to the devices in board.i2c by address"""
+
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, timeout=50000):
+        self.freq = freq
+
+    def _device(self, addr):
+        device = runtime.board.i2c.get(addr)
+        if device is None:
+            raise OSError(5)  # EIO: no ACK, as on the board
+        return device
+
+    def scan(self):
+        return sorted(runtime.board.i2c)
+
+    def writeto(self, addr, buf, stop=True):
+        self._device(addr).write(_buffer(buf))
+        return 1
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return self._device(addr).read(nbytes)
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        self._device(addr).write(bytes([memaddr]) + _buffer(buf))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        device = self._device(addr)
+        device.write(bytes([memaddr]))
+        return device.read(nbytes)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        buf[:] = self.readfrom_mem(addr, memaddr, len(buf))
+
+
+SoftI2C = I2C
+
+
+class RTC:
+    def datetime(self, datetimetuple=None):
+        import utime
+        if datetimetuple is None:
+            year, month, mday, hour, minute, second, weekday, _ = utime.localtime()
+            return (year, month, mday, weekday, hour, minute, second, 0)
+        year, month, mday, _, hour, minute, second, _ = datetimetuple
+        runtime.clock.set_time(utime.mktime((year, month, mday, hour, minute, second, 0, 0)))
+
+
+class _Mem:
+    def __getitem__(self, addr):
+        if addr == 0xd0000004:  # SIO GPIO_IN
+            return runtime.board.read_levels()
+        return 0
+
+    def __setitem__(self, addr, value):
+        pass
+
+
+mem8 = mem16 = mem32 = _Mem()
+
+
+class SimulatedReset(SystemExit):
+    """Raised by machine.reset(), the simulator decides what a reboot means"""
+
+
+def reset():
+    raise SimulatedReset("machine.reset()")
+
+
+soft_reset = reset
+
+
+def freq(hz=None):
+    return 125000000 if hz is None else None
+
+
+def unique_id():
+    return b"\xe6\x61\x41\x04\x03\x5b\x2a\x2f"
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+def idle():
+    pass
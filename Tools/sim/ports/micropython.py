@@ -0,0 +1,25 @@
+# Host port of the `micropython` module.
+from sim import runtime
+
+
+def const(value):
+    return value
+
+
+def native(f):
+    return f
+
+
+viper = native
+
+
+def schedule(func, arg):
+    runtime.loop.call_soon(func, arg)
+
+
+def mem_info(verbose=None):
+    pass
+
+
+def opt_level(level=None):
+    return 0 if level is None else None
@@ -0,0 +1,71 @@
+# Host port of the MicroPython `network` module: the station interface of
+# board.wifi, associated with its access point while that is available.
+from sim import runtime
+
+STA_IF = 0
+AP_IF = 1
+
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_WRONG_PASSWORD = -3
+STAT_NO_AP_FOUND = -2
+STAT_CONNECT_FAIL = -1
+STAT_GOT_IP = 3
+
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        self._wifi = runtime.board.wifi
+
+    def active(self, is_active=None):
+        if is_active is None:
+            return self._wifi["active"]
+        self._wifi["active"] = bool(is_active)
+        if not is_active:
+            self._wifi["connected_at"] = None
+
+    def connect(self, ssid=None, key=None, **kwargs):
+        wifi = self._wifi
+        if not wifi["active"]:
+            raise OSError("STA not active")
+        now = runtime.clock.ticks_ms()
+        wifi["connects"].append(now)
+        wifi["connected_at"] = now + wifi["connect_ms"] if wifi["available"] else None
+
+    def disconnect(self):
+        self._wifi["connected_at"] = None
+
+    def isconnected(self):
+        wifi = self._wifi
+        return (wifi["active"] and wifi["available"] and wifi["connected_at"] is not None
+                and runtime.clock.ticks_ms() >= wifi["connected_at"])
+
+    def status(self, param=None):
+        if param == "rssi":
+            return self._wifi["rssi"]
+        if self.isconnected():
+            return STAT_GOT_IP
+        if self._wifi["connected_at"] is not None:
+            return STAT_CONNECTING
+        return STAT_NO_AP_FOUND if self._wifi["active"] and not self._wifi["available"] else STAT_IDLE
+
+    def ifconfig(self, config=None):
+        ip = self._wifi["ip"] if self.isconnected() else "0.0.0.0"
+        return (ip, "255.255.255.0", "192.168.1.1", "192.168.1.1")
+
+    def scan(self):
+        if not self._wifi["active"] or not self._wifi["available"]:
+            return []
+        return [(self._wifi["ssid"].encode(), b"\x00\x11\x22\x33\x44\x55", 6, self._wifi["rssi"], 3, False)]
+
+    def config(self, *args, **kwargs):
+        if args:
+            return {"mac": b"\x28\xcd\xc1\x00\x00\x01", "essid": self._wifi["ssid"], "txpower": 31}.get(args[0])
+
+
+def hostname(name=None):
+    return "waterleak" if name is None else None
+
+
+def country(code=None):
+    return "XX" if code is None else None
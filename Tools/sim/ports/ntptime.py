@@ -0,0 +1,17 @@
+# Host port of the MicroPython `ntptime` module: serves the true time of the
+# simulation while the station is associated.
+import network
+from sim import runtime
+
+host = "pool.ntp.org"
+timeout = 1
+
+
+def time():
+    if not network.WLAN(network.STA_IF).isconnected():
+        raise OSError(110)  # ETIMEDOUT
+    return runtime.clock.world_time()
+
+
+def settime():
+    runtime.clock.set_time(time())
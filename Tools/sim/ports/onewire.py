@@ -0,0 +1,36 @@
+# Host port of the MicroPython `onewire` module.
+from sim import runtime
+
+
+class OneWireError(Exception):
+    pass
+
+
+# Function commands the port acts on after select_rom()
+_COPY_SCRATCH = 0x48
+
+
+class OneWire:
+    def __init__(self, pin):
+        self.pin = pin
+        self._selected = None
+
+    def devices(self):
+        return [device for device in runtime.board.onewire.get(self.pin.id, []) if device.present]
+
+    def reset(self, required=False):
+        present = bool(self.devices())
+        if required and not present:
+            raise OneWireError
+        return present
+
+    def select_rom(self, rom):
+        self._selected = bytes(rom)
+
+    def writebyte(self, value):
+        for device in self.devices():
+            if device.rom == self._selected and value == _COPY_SCRATCH:
+                device.eeprom = (device.th, device.tl, device.resolution)
+
+    def scan(self):
+        return [bytearray(device.rom) for device in self.devices()]
@@ -0,0 +1,28 @@
+# Host port of MicroPython `uasyncio` on top of asyncio and the virtual-time loop.
+from asyncio import *  # noqa: F401,F403
+import asyncio as _asyncio
+from sim import runtime
+
+
+async def sleep_ms(ms):
+    await _asyncio.sleep(ms / 1000)
+
+
+async def wait_for_ms(aw, timeout):
+    return await _asyncio.wait_for(aw, timeout / 1000)
+
+
+def get_event_loop():
+    return runtime.loop
+
+
+def new_event_loop():
+    return runtime.loop
+
+
+def create_task(coro):
+    return runtime.loop.create_task(coro)
+
+
+def run(coro):
+    return runtime.loop.run_until_complete(coro)
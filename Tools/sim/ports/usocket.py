@@ -0,0 +1,31 @@
+# Host port of `socket`/`usocket`: host sockets with the MicroPython stream
+# methods, and the web server port 80 mapped to board.http_port so no
+# privileges are needed.
+import socket as _socket
+from socket import *  # noqa: F401,F403
+from sim import runtime
+
+
+class socket(_socket.socket):
+
+    def accept(self):
+        fd, address = self._accept()
+        client = socket(self.family, self.type, self.proto, fileno=fd)
+        if self.gettimeout() is None:
+            client.setblocking(True)
+        return client, address
+
+    def write(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        self.sendall(data)
+        return len(data)
+
+    def read(self, size=4096):
+        return self.recv(size)
+
+
+def getaddrinfo(host, port, *args, **kwargs):
+    if port == 80:
+        port = runtime.board.http_port
+    return _socket.getaddrinfo(host, port, *args, **kwargs)
@@ -0,0 +1,64 @@
+# Host port of MicroPython `time`/`utime` on the virtual clock.
+# Blocking sleeps move the clock too: the firmware really did stall for them.
+import time as _time
+from sim import runtime
+
+
+def time():
+    return runtime.clock.time()
+
+
+def time_ns():
+    return runtime.clock.time() * 1000000000 + runtime.clock.now_us % 1000000 * 1000
+
+
+def ticks_ms():
+    return runtime.clock.ticks_ms()
+
+
+def ticks_us():
+    return runtime.clock.ticks_us()
+
+
+def ticks_cpu():
+    return runtime.clock.ticks_us()
+
+
+def ticks_add(ticks, delta):
+    return ticks + delta
+
+
+def ticks_diff(ticks1, ticks2):
+    return ticks1 - ticks2
+
+
+def sleep(seconds):
+    runtime.clock.advance_us(seconds * 1000000)
+
+
+def sleep_ms(ms):
+    runtime.clock.advance_us(ms * 1000)
+
+
+def sleep_us(us):
+    runtime.clock.advance_us(us)
+
+
+def gmtime(secs=None):
+    if secs is None:
+        secs = time()
+    t = _time.gmtime(secs)
+    return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec, t.tm_wday, t.tm_yday)
+
+
+localtime = gmtime  # The board has no time zone
+
+
+def mktime(t):
+    import calendar
+    return calendar.timegm((t[0], t[1], t[2], t[3], t[4], t[5], 0, 0, 0))
+
+
+def __getattr__(name):
+    # strftime, monotonic etc. for host code that imported `time` after install()
+    return getattr(_time, name)
@@ -0,0 +1,4 @@
+# The simulation the port modules talk to, set by sim.install().
+clock = None  # sim.clock.VirtualClock
+loop = None   # sim.clock.VirtualTimeLoop
+board = None  # sim.board.Board
@@ -0,0 +1,88 @@
+# Sensor traces: timestamped input levels and temperature samples.
+#
+# Binary file (.wlt): magic b"WLT1", then 8-byte records
+#   t_ms:u32 kind:u8 channel:u8 value:i16   (little endian)
+# kind PIN:  channel = GPIO, value = level (0/1)
+# kind TEMP: channel = index in TEMP_SENSORS, value = 1/16 °C (DS18B20 units)
+# kind ADC:  channel = GPIO, value = 16-bit reading >> 1
+#
+# Text file, one event per line, '#' starts a comment:
+#   <t_ms> pin <gpio> <level>
+#   <t_ms> temp <sensor index or name> <°C>
+#   <t_ms> adc <gpio> <read_u16 value>
+import struct
+
+MAGIC = b"WLT1"
+RECORD = struct.Struct("<IBBh")
+
+PIN = 0
+TEMP = 1
+ADC = 2
+KINDS = {"pin": PIN, "temp": TEMP, "adc": ADC}
+KIND_NAMES = {kind: name for name, kind in KINDS.items()}
+
+
+class TraceError(ValueError):
+    pass
+
+
+def load(path: str, sensor_names=()) -> list:
+    """Events of a text or binary trace as sorted (t_ms, kind, channel, value).
+
+    Temperatures are °C floats, ADC values full 16-bit readings.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] == MAGIC:
+        events = _decode(data)
+    else:
+        events = _parse_text(data.decode("utf-8"), list(sensor_names), path)
+    events.sort(key=lambda event: event[0])
+    return events
+
+
+def save(path: str, events) -> None:
+    """Write events in the binary format"""
+    out = bytearray(MAGIC)
+    for t_ms, kind, channel, value in sorted(events, key=lambda event: event[0]):
+        if kind == TEMP:
+            value = int(round(value * 16))
+        elif kind == ADC:
+            value = int(value) >> 1
+        out += RECORD.pack(t_ms, kind, channel, value)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def _decode(data: bytes) -> list:
+    if (len(data) - len(MAGIC)) % RECORD.size:
+        raise TraceError("truncated trace")
+    events = []
+    for t_ms, kind, channel, value in RECORD.iter_unpack(memoryview(data)[len(MAGIC):]):
+        if kind == TEMP:
+            value = value / 16
+        elif kind == ADC:
+            value = (value & 0x7FFF) << 1
+        events.append((t_ms, kind, channel, value))
+    return events
+
+
+def _parse_text(text: str, sensor_names: list, path: str) -> list:
+    events = []
+    for number, line in enumerate(text.splitlines(), 1):
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            continue
+        try:
+            t_ms, kind, channel, value = fields
+            kind = KINDS[kind]
+            if kind == TEMP:
+                channel = sensor_names.index(channel) if channel in sensor_names else int(channel)
+                value = float(value)
+            else:
+                channel = int(channel)
+                value = int(value)
+            events.append((int(t_ms), kind, channel, value))
+        except (ValueError, KeyError):
+            raise TraceError("%s:%d: cannot parse %r" % (path, number, line.strip()))
+    return events
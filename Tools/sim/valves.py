@@ -0,0 +1,101 @@
+# Motorised ball valves: travel follows the open/close motor outputs, the
+# end position shows on the limit switch input and the motor current ADC.
+from sim import runtime
+
+# Travel (%) before the limit switch of the starting stop opens
+LIMIT_TRAVEL = 2.0
+
+# Motor current (read_u16) while moving, stalled against a stop, jammed
+RUN_CURRENT = 15000
+STALL_CURRENT = 40000
+JAM_CURRENT = 60000
+
+
+class ValveActuator:
+    """internal_limits: the actuator cuts its own motor at the stops, so the
+    current drops to zero there instead of stalling."""
+
+    def __init__(self, name: str, open_pin: int, close_pin: int, limit_pin: int = None, current_pin: int = None,
+                 travel_s: float = 12.0, position: float = 100.0, internal_limits: bool = True):
+        self.name = name
+        self.open_pin = open_pin
+        self.close_pin = close_pin
+        self.limit_pin = limit_pin
+        self.current_pin = current_pin
+        self.travel_s = travel_s
+        self.position = position  # % open
+        self.internal_limits = internal_limits
+        self.jammed = False
+        self.direction = 0
+        self._since_us = runtime.clock.now_us
+        self._stop_handle = None
+        runtime.board.output_listeners.append(self._on_output)
+        self._update_inputs()
+
+    def percent_open(self) -> float:
+        self._integrate()
+        return self.position
+
+    def _on_output(self, gpio: int, level: int) -> None:
+        if gpio != self.open_pin and gpio != self.close_pin:
+            return
+        self._integrate()
+        outputs = runtime.board.outputs
+        self.direction = outputs.get(self.open_pin, 0) - outputs.get(self.close_pin, 0)
+        if self._stop_handle is not None:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+        if self.direction and not self._at_stop() and not self.jammed:
+            remaining = (100 - self.position) if self.direction > 0 else self.position
+            self._stop_handle = runtime.loop.call_later(remaining * self.travel_s / 100, self._reach_stop)
+            if self.position <= 0 or self.position >= 100:
+                runtime.loop.call_later(LIMIT_TRAVEL * self.travel_s / 100, self._leave_stop)
+        self._update_inputs()
+
+    def _leave_stop(self) -> None:
+        self._integrate()
+        self._update_inputs()
+
+    def _integrate(self) -> None:
+        now = runtime.clock.now_us
+        if self.direction and not self.jammed:
+            moved = self.direction * (now - self._since_us) / 1000000 * 100 / self.travel_s
+            self.position = min(100.0, max(0.0, self.position + moved))
+        self._since_us = now
+
+    def _reach_stop(self) -> None:
+        self._integrate()
+        self.position = 100.0 if self.direction > 0 else 0.0
+        self._stop_handle = None
+        self._update_inputs()
+
+    def _at_stop(self) -> bool:
+        return (self.direction > 0 and self.position >= 100) or (self.direction < 0 and self.position <= 0)
+
+    def _update_inputs(self) -> None:
+        board = runtime.board
+        if self.limit_pin is not None:
+            at_end = self.position < LIMIT_TRAVEL or self.position > 100 - LIMIT_TRAVEL
+            board.set_input(self.limit_pin, 0 if at_end else 1)
+        if self.current_pin is not None:
+            if not self.direction:
+                current = 0
+            elif self.jammed:
+                current = JAM_CURRENT
+            elif self._at_stop():
+                current = 0 if self.internal_limits else STALL_CURRENT
+            else:
+                current = RUN_CURRENT
+            board.adc[self.current_pin] = current
+
+
+def attach(Settings, travel_s: float = 12.0) -> list:
+    """The hot and cold water valves of the board, fully open"""
+    import Helpers.DeviceNames as DeviceNames
+    current_pins = getattr(Settings, 'VALVES_CURRENT_PINS', {})
+    return [
+        ValveActuator(DeviceNames.HOT_WATER_VALVE_KEY, Settings.OPEN_HOT_W_PIN, Settings.CLOSE_HOT_W_PIN,
+                      Settings.ERROR_HOT_W_PIN, current_pins.get(DeviceNames.HOT_WATER_VALVE_KEY), travel_s),
+        ValveActuator(DeviceNames.COLD_WATER_VALVE_KEY, Settings.OPEN_COLD_W_PIN, Settings.CLOSE_COLD_W_PIN,
+                      Settings.ERROR_COLD_W_PIN, current_pins.get(DeviceNames.COLD_WATER_VALVE_KEY), travel_s),
+    ]
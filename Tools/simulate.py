@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# Runs the whole controller (main.py) on the host in virtual time.
+#
+# Runs on the host (CPython 3.8+) from the repository root:
+#   python3 Tools/simulate.py --hours 24
+#   python3 Tools/simulate.py --hours 6 --wifi-outage 3600-7200 --trace Tools/traces/flood_zone1.txt
+#   python3 Tools/simulate.py --hours 0.1 --speed 1 --port 8080   # web UI on localhost:8080
+#
+# Every hardware module is replaced by the ports of Tools/sim: pins, I2C LCD
+# and DS3231, DS18B20 probes, WiFi station, NTP. Hours of operation run in
+# seconds. The report covers state file writes, display dimming, WiFi
+# connection attempts, valve and heater actions and the log volume.
+# Settings can be overridden for a run: --set 'VALVES_FEEDBACK="limit"'.
+import argparse
+import ast
+import asyncio
+import os
+import sys
+import tempfile
+import time as _time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sim
+from sim import devices, inputs, runtime, valves
+from sim import trace as tracefile
+
+_LEVEL_NAMES = {10: "debug", 20: "info", 30: "warning", 40: "error", 50: "critical"}
+
+
+def _console_handler(Handler, level: int, counts: dict):
+    """Log handler with virtual timestamps that counts records per level"""
+
+    class VirtualTimeHandler(Handler):
+        def emit(self, record):
+            counts[record.levelno] = counts.get(record.levelno, 0) + 1
+            if record.levelno >= level:
+                sys.stderr.write("[%10.3f] %s\n" % (runtime.clock.ticks_ms() / 1000, self.format(record)))
+
+    return VirtualTimeHandler()
+
+
+def _parse_range(text: str) -> tuple:
+    start, end = text.split("-")
+    return float(start), float(end)
+
+
+def _parse_press(text: str) -> tuple:
+    # GPIO@SECONDS[:HOLD_MS]
+    gpio, when = text.split("@")
+    at_s, _, hold_ms = when.partition(":")
+    return int(gpio), float(at_s), int(hold_ms or 200)
+
+
+def simulate(args) -> None:
+    trace_path = os.path.abspath(args.trace) if args.trace else None
+    sim.install(args.speed)
+    board = runtime.board
+    loop = runtime.loop
+    board.http_port = args.port
+    cwd = os.getcwd()
+    workdir = tempfile.TemporaryDirectory(prefix="simulate_")
+    os.chdir(workdir.name)
+    os.makedirs("State")
+    try:
+        import Resources.Settings as Settings
+        from Helpers.TempSensorConfig import get_temp_sensors
+        from Logging.AppLogger import AppLogger
+        from Logging.Logger import Handler, Formatter
+
+        for override in args.set:
+            name, _, value = override.partition("=")
+            setattr(Settings, name, ast.literal_eval(value))
+        devices.attach(Settings, args.rtc_lost)
+        actuators = valves.attach(Settings, args.valve_travel)
+        board.wifi["ssid"] = Settings.WIFI_SSID
+        configs = get_temp_sensors()
+        probes = inputs.add_temp_probes(configs)
+        for probe in probes:
+            probe.temp = args.temp
+        if trace_path:
+            inputs.schedule_trace(tracefile.load(trace_path, [config["name"] for config in configs]), probes)
+        for outage in args.wifi_outage:
+            start_s, end_s = _parse_range(outage)
+            loop.call_at(start_s, board.set_wifi, False)
+            loop.call_at(end_s, board.set_wifi, True)
+        for press in args.press:
+            gpio, at_s, hold_ms = _parse_press(press)
+            inputs.press(gpio, at_s, hold_ms)
+
+        logger = AppLogger()
+        logger.setLevel(min(args.log_level, 20))
+        log_counts = {}
+        handler = _console_handler(Handler, args.log_level, log_counts)
+        handler.setFormatter(Formatter("%(levelname)s: %(message)s"))
+        logger.log.handlers[0] = handler
+
+        from main import Main
+        app = Main()
+        state_writes = []
+        write_file = app.states._write_file
+
+        def record_write(data):
+            state_writes.append(runtime.clock.ticks_ms())
+            return write_file(data)
+
+        app.states._write_file = record_write
+
+        wall_start = _time.monotonic()
+        end_s = args.hours * 3600
+        reset_at = None
+        task = loop.create_task(app.run())
+        try:
+            loop.run_until_complete(asyncio.wait_for(asyncio.shield(task), end_s))
+        except asyncio.TimeoutError:
+            pass
+        except SystemExit as e:
+            reset_at = runtime.clock.ticks_ms()
+            logger.critical("SIMULATOR: %s", e)
+        wall_s = _time.monotonic() - wall_start
+        if reset_at is None:
+            loop.run_until_complete(app.cleanup())
+        sim.drain()
+
+        _report(args, Settings, board, actuators, state_writes, log_counts, reset_at, wall_s)
+    finally:
+        os.chdir(cwd)
+        workdir.cleanup()
+
+
+def _report(args, Settings, board, actuators, state_writes, log_counts, reset_at, wall_s):
+    virtual_s = runtime.clock.ticks_ms() / 1000
+    print("== %.2f h virtual in %.1f s (x%d)" % (virtual_s / 3600, wall_s, virtual_s / max(wall_s, 0.001)))
+    if reset_at is not None:
+        print("machine.reset() at %.1f s" % (reset_at / 1000))
+
+    intervals = [b - a for a, b in zip(state_writes, state_writes[1:])]
+    print("state file: %d writes%s" % (len(state_writes), ", interval min %.0f s, mean %.0f s" % (
+        min(intervals) / 1000, sum(intervals) / len(intervals) / 1000) if intervals else ""))
+
+    backlight = board.i2c[devices.PCA9633.ADDRESS]
+    lcd = board.i2c[devices.LCD1602.ADDRESS]
+    changes = backlight.brightness_changes
+    print("display: %d brightness changes%s, %d I2C transfers (%d bytes)" % (
+        len(changes), ", dimmed after %.0f s" % (changes[1][0] / 1000) if len(changes) > 1 else "",
+        lcd.transfers, lcd.bytes))
+    for line in lcd.lines():
+        print("  |%s|" % line)
+
+    connects = board.wifi["connects"]
+    gaps = ", ".join("%.0f" % ((b - a) / 1000) for a, b in list(zip(connects, connects[1:]))[:12]) if len(connects) > 1 else ""
+    print("wifi: %d connect() calls%s" % (len(connects), " (gaps s: %s)" % gaps if gaps else ""))
+
+    names = {
+        getattr(Settings, "OPEN_HOT_W_PIN", None): "hot valve open",
+        getattr(Settings, "CLOSE_HOT_W_PIN", None): "hot valve close",
+        getattr(Settings, "OPEN_COLD_W_PIN", None): "cold valve open",
+        getattr(Settings, "CLOSE_COLD_W_PIN", None): "cold valve close",
+        getattr(Settings, "POWER_HEATER_PIN", None): "heater power",
+    }
+    started = {}
+    print("actuators:")
+    for at_ms, gpio, level in board.actions:
+        name = names.get(gpio)
+        if name is None:
+            continue
+        if name.startswith("heater"):
+            print("  %10.1f s  %-16s %s" % (at_ms / 1000, name, "on" if level else "off"))
+        elif level:
+            started[gpio] = at_ms
+        elif gpio in started:
+            print("  %10.1f s  %-16s ran %.1f s" % (started[gpio] / 1000, name, (at_ms - started.pop(gpio)) / 1000))
+    for gpio, at_ms in started.items():
+        print("  %10.1f s  %-16s still running" % (at_ms / 1000, names[gpio]))
+
+    print("valves: " + ", ".join("%s %.0f%% open" % (actuator.name, actuator.percent_open()) for actuator in actuators))
+
+    print("log: " + ", ".join("%s %d" % (_LEVEL_NAMES.get(level, level), count) for level, count in sorted(log_counts.items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the controller on the host in virtual time")
+    parser.add_argument("--hours", type=float, default=1.0, help="virtual run time")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible (default), 1 = real time")
+    parser.add_argument("--port", type=int, default=8080, help="host port of the web server")
+    parser.add_argument("--temp", type=float, default=22.0, help="temperature of every probe without a trace")
+    parser.add_argument("--trace", help="sensor trace to replay (see Tools/trace_replay.py)")
+    parser.add_argument("--wifi-outage", action="append", default=[], metavar="START-END",
+                        help="access point down between these seconds (repeatable)")
+    parser.add_argument("--press", action="append", default=[], metavar="GPIO@SECONDS[:HOLD_MS]",
+                        help="press a button (repeatable)")
+    parser.add_argument("--valve-travel", type=float, default=12.0, help="seconds the valves take from stop to stop")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a setting, VALUE is a Python literal (repeatable)")
+    parser.add_argument("--rtc-lost", action="store_true", help="DS3231 without backup battery: time comes from NTP")
+    parser.add_argument("--log-level", type=int, default=30, help="firmware log level printed (10 = debug)")
+    simulate(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# Replays sensor traces through the leak and temperature logic on the host.
+#
+# Runs on the host (CPython 3.8+) from the repository root:
+#   python3 Tools/trace_replay.py Tools/traces/flood_zone1.txt [more traces]
+#   python3 Tools/trace_replay.py --speed 1 field.wlt      # at real speed
+#   python3 Tools/trace_replay.py --compile field.txt field.wlt
+#   python3 Tools/trace_replay.py --max-latency 100 Tools/traces/*.txt   # exit 1 on a slow closure
+#
+# The real LeakSensors, TempSensors, WaterLineValves and HeaterPowerSwith run
+# on the simulated board of Tools/sim: leak pin levels and DS18B20 readings
+# come from the trace (format in Tools/sim/trace.py), time is virtual.
+# For every trace it prints the valve, heater and alarm actions, the
+# latency from every leak edge to the first ValvePort.start_valve closing a
+# valve, and what reached the temperature states. With --max-latency a leak
+# held beyond LEAK_DEBOUNCE_MS must start closing within that many ms, and
+# a shorter glitch must close nothing.
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time as _time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sim
+from sim import inputs
+from sim import trace as tracefile
+
+
+def _actuators(Settings) -> dict:
+    names = (
+        ("OPEN_HOT_W_PIN", "hot valve open"),
+        ("CLOSE_HOT_W_PIN", "hot valve close"),
+        ("OPEN_COLD_W_PIN", "cold valve open"),
+        ("CLOSE_COLD_W_PIN", "cold valve close"),
+        ("POWER_HEATER_PIN", "heater power"),
+    )
+    return {getattr(Settings, key): name for key, name in names if getattr(Settings, key, None) is not None}
+
+
+# A zone pin back at the leak level within this time after leaving it is
+# contact bounce of the same leak, not a new one
+_BOUNCE_MS = 1000
+
+
+def _leak_edges(events, zones) -> list:
+    """[t_ms, zone, longest ms at the leak level] of the first edge of every leak of a digital zone.
+
+    The longest stretch covers the bounces of the same leak, None when the
+    pin is still at the leak level at the end of the trace.
+    """
+    digital = {zone["pin"]: zone for zone in zones if zone.get("mode", "digital") == "digital"}
+    levels = {}
+    dry_since = {}
+    wet_since = {}
+    current = {}  # channel -> edge of the leak in progress
+    edges = []
+    for t_ms, kind, channel, value in events:
+        zone = digital.get(channel) if kind == tracefile.PIN else None
+        if zone is None or levels.get(channel) == value:
+            continue
+        levels[channel] = value
+        if value != zone["leak_level"]:
+            dry_since[channel] = t_ms
+            edge = current.get(channel)
+            if edge is not None and channel in wet_since:
+                edge[2] = max(edge[2], t_ms - wet_since.pop(channel))
+            continue
+        wet_since[channel] = t_ms
+        since = dry_since.get(channel)
+        if t_ms > 0 and (since is None or t_ms - since >= _BOUNCE_MS):
+            current[channel] = [t_ms, zone, 0]
+            edges.append(current[channel])
+    for channel in wet_since:
+        if channel in current:
+            current[channel][2] = None
+    return edges
+
+
+def _first_after(actions, t_ms, pins, level):
+    for at_ms, gpio, value in actions:
+        if at_ms >= t_ms and gpio in pins and value == level:
+            return at_ms - t_ms
+    return None
+
+
+def replay(path: str, speed: float, tail_s: float, heater_on: bool, log_level: int, max_latency_ms=None) -> bool:
+    """Run one trace and print its report; False when a --max-latency check failed"""
+    trace_path = os.path.abspath(path)
+    runtime = sim.install(speed)
+    board = runtime.board
+    loop = runtime.loop
+    cwd = os.getcwd()
+    workdir = tempfile.TemporaryDirectory(prefix="trace_replay_")
+    os.chdir(workdir.name)
+    os.makedirs("State")
+    try:
+        import Resources.Settings as Settings
+        from Helpers.LeakZones import get_leak_zones
+        from Helpers.TempSensorConfig import get_temp_sensors
+        from Logging.AppLogger import AppLogger
+        from sim import devices
+
+        devices.attach(Settings)
+        configs = get_temp_sensors()
+        events = tracefile.load(trace_path, [config["name"] for config in configs])
+        probes = inputs.add_temp_probes(configs)
+        inputs.schedule_trace(events, probes)
+
+        AppLogger().setLevel(log_level)
+        from State.States import States
+        from Valves.WaterLineValves import WaterLineValves
+        from Heater.HeaterPowerSwith import HeaterPowerSwith
+        from Sensors.LeakSensors import LeakSensors
+        from Sensors.TempSensors import TempSensors
+        from Valves.Valve.ValvePort import ValvePort
+
+        # (ticks_ms, device, direction) of every motor start, the end of the closure latency
+        starts = []
+        start_valve = ValvePort.start_valve
+
+        def record_start(port):
+            starts.append((runtime.clock.ticks_ms(), port.device_name, port._direction))
+            return start_valve(port)
+
+        ValvePort.start_valve = record_start
+
+        states = States()
+        temp_updates = {config["name"]: [] for config in configs}
+        update_temperature = states.update_temperature
+
+        def record_temperature(name, value):
+            temp_updates.setdefault(name, []).append((runtime.clock.ticks_ms(), value))
+            update_temperature(name, value)
+
+        states.update_temperature = record_temperature
+        valves = WaterLineValves(states)
+        heater = HeaterPowerSwith(states)
+        if heater_on:
+            if not heater.is_enabled():
+                heater.toggle()
+            heater.power_on()  # No thermostat runs here: the relay is on as while heating
+        leak_sensors = LeakSensors(states, valves, heater)
+        temp_sensors = TempSensors(states)
+        leak_sensors.start()
+        temp_sensors.start()
+
+        end_ms = (events[-1][0] if events else 0) + int(tail_s * 1000)
+
+        wall_start = _time.monotonic()
+        loop.run_until_complete(asyncio.sleep(end_ms / 1000))
+        wall_s = _time.monotonic() - wall_start
+        leak_sensors.stop()
+        sim.drain()
+
+        return _report(path, events, board.actions, starts, get_leak_zones(), _actuators(Settings), Settings, configs,
+                       temp_sensors, temp_updates, end_ms, wall_s, max_latency_ms)
+    finally:
+        os.chdir(cwd)
+        workdir.cleanup()
+
+
+def _report(path, events, actions, starts, zones, actuators, Settings, configs, temp_sensors, temp_updates, end_ms, wall_s,
+            max_latency_ms):
+    print("== %s: %d events, %.1f s virtual in %.2f s" % (path, len(events), end_ms / 1000, wall_s))
+
+    print("actions:")
+    lines = [(at_ms, actuators[gpio], "on" if level else "off") for at_ms, gpio, level in actions if gpio in actuators]
+    alarm_pin = getattr(Settings, "BUZZ_ALARM_PIN", None)
+    alarm = [action for action in actions if action[1] == alarm_pin]
+    if alarm:
+        lines.append((alarm[0][0], "alarm buzzer", "on (%d toggles)" % len(alarm)))
+    for line in sorted(lines, key=lambda line: line[0]):
+        print("  %8d ms  %-16s %s" % line)
+    if not lines:
+        print("  none")
+
+    heater_pin = getattr(Settings, "POWER_HEATER_PIN", None)
+    debounce_ms = getattr(Settings, "LEAK_DEBOUNCE_MS", 30)
+    closes = [(at_ms, 0, 1) for at_ms, _, direction in starts if direction < 0]
+    edges = _leak_edges(events, zones)
+    passed = True
+    if edges:
+        print("leak edges:")
+    for index, (t_ms, zone, held_ms) in enumerate(edges):
+        closing = _first_after(closes, t_ms, {0}, 1)
+        next_ms = edges[index + 1][0] if index + 1 < len(edges) else None
+        heater_off = _first_after(actions, t_ms, {heater_pin}, 0)
+        check = ""
+        if max_latency_ms is not None:
+            if held_ms is None or held_ms >= debounce_ms:
+                ok = closing is not None and closing <= max_latency_ms
+            else:
+                # A glitch closes nothing: a later closure belongs to a later leak
+                ok = closing is None or (next_ms is not None and t_ms + closing >= next_ms)
+            passed = passed and ok
+            check = "  [%s]" % ("ok" if ok else "FAIL")
+        print("  %8d ms  %-16s %s, valves %s, heater %s%s" % (
+            t_ms, zone["title"], "held" if held_ms is None else "%d ms" % held_ms,
+            "closing after %d ms" % closing if closing is not None else "not closed",
+            "off after %d ms" % heater_off if heater_off is not None else "not switched", check))
+
+    print("temperatures:")
+    for index, config in enumerate(configs):
+        name = config["name"]
+        samples = sum(1 for event in events if event[1] == tracefile.TEMP and event[2] == index)
+        updates = temp_updates.get(name, [])
+        filt = temp_sensors.filters.get(name)
+        print("  %-16s %3d samples, %3d state updates, %d rejected, last %s" % (
+            name, samples, len(updates), filt.rejected if filt else 0,
+            updates[-1][1] if updates else "-"))
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay sensor traces through the leak and temperature logic")
+    parser.add_argument("traces", nargs="*", help="text or binary trace files")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible (default), 1 = real time")
+    parser.add_argument("--tail", type=float, default=30.0, help="seconds to keep running after the last event")
+    parser.add_argument("--heater-off", action="store_true", help="start with the heater powered off")
+    parser.add_argument("--log-level", type=int, default=40, help="firmware log level (10 = debug)")
+    parser.add_argument("--max-latency", type=int, metavar="MS",
+                        help="fail unless every leak starts closing a valve within MS of its edge")
+    parser.add_argument("--compile", nargs=2, metavar=("TEXT", "BINARY"), help="convert a text trace to binary")
+    args = parser.parse_args()
+
+    if args.compile:
+        sim.install()
+        from Helpers.TempSensorConfig import get_temp_sensor_names
+        source, target = args.compile
+        events = tracefile.load(source, get_temp_sensor_names())
+        tracefile.save(target, events)
+        print("%s: %d events, %d bytes" % (target, len(events), os.path.getsize(target)))
+        return
+    if not args.traces:
+        parser.error("no trace given")
+    passed = True
+    for path in args.traces:
+        passed = replay(path, args.speed, args.tail, not args.heater_off, args.log_level, args.max_latency) and passed
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Measures how long the valve motors really run while the event loop lags.
+#
+# Runs on the host (CPython 3.8+) from the repository root:
+#   python3 Tools/valve_timing.py
+#   python3 Tools/valve_timing.py --cycles 10 --lag 0 50 250 --render 120
+#
+# The real HotWaterValve runs on the simulated board of Tools/sim, in virtual
+# time. A background task blocks the loop for --lag ms at random moments (a
+# flash flush, a web page render, a GC pass) and every progress update blocks
+# it for --render ms like an LCD redraw. For every lag the motor-on time of
+# each open and close is compared with VALVES_OPERATION_TIME.
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import sim
+
+
+def _motor_runs(actions, pins) -> list:
+    """Motor-on times in ms from the recorded output changes"""
+    started = {}
+    runs = []
+    for at_ms, gpio, level in actions:
+        if gpio not in pins:
+            continue
+        if level:
+            started[gpio] = at_ms
+        elif gpio in started:
+            runs.append(at_ms - started.pop(gpio))
+    return runs
+
+
+def measure(lag_ms: int, render_ms: int, cycles: int, seed: int) -> tuple:
+    """(motor-on times in ms, progress updates) for open/close cycles under lag_ms stalls"""
+    runtime = sim.install()
+    loop = runtime.loop
+    cwd = os.getcwd()
+    workdir = tempfile.TemporaryDirectory(prefix="valve_timing_")
+    os.chdir(workdir.name)
+    os.makedirs("State")
+    try:
+        import Resources.Settings as Settings
+        from Logging.AppLogger import AppLogger
+        from sim import devices
+        import uasyncio as asyncio
+        import utime
+
+        devices.attach(Settings)
+        AppLogger().setLevel(40)
+        from State.States import States
+        from Valves.HotWaterValve import HotWaterValve
+
+        updates = []
+
+        class RenderingValve(HotWaterValve):
+            def open_progress(self, device_name, progress):
+                updates.append(progress)
+                utime.sleep_ms(render_ms)
+
+            close_progress = open_progress
+
+        valve = RenderingValve(States())
+        rng = random.Random(seed)
+
+        async def stalls():
+            while lag_ms:
+                await asyncio.sleep_ms(rng.randint(50, 1500))
+                utime.sleep_ms(rng.randint(lag_ms // 2, lag_ms))
+
+        async def cycle():
+            run_s = Settings.VALVES_OPERATION_TIME + 3
+            for _ in range(cycles):
+                valve.open()
+                await asyncio.sleep(run_s)
+                valve.close()
+                await asyncio.sleep(run_s)
+
+        stall_task = loop.create_task(stalls())
+        loop.run_until_complete(cycle())
+        stall_task.cancel()
+        sim.drain()
+        pins = {Settings.OPEN_HOT_W_PIN, Settings.CLOSE_HOT_W_PIN}
+        return _motor_runs(runtime.board.actions, pins), len(updates)
+    finally:
+        os.chdir(cwd)
+        workdir.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valve motor-on time under event loop lag")
+    parser.add_argument("--cycles", type=int, default=5, help="open/close cycles per lag")
+    parser.add_argument("--lag", type=int, nargs="+", default=[0, 50, 250], help="longest loop stall in ms")
+    parser.add_argument("--render", type=int, default=80, help="ms every progress update blocks the loop")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    sim.install()
+    import Resources.Settings as Settings
+    target_ms = Settings.VALVES_OPERATION_TIME * 1000
+    print("target %d ms, progress render %d ms" % (target_ms, args.render))
+    print("%8s %5s %10s %10s %10s %8s" % ("lag ms", "runs", "min ms", "max ms", "max err", "updates"))
+    for lag_ms in args.lag:
+        runs, updates = measure(lag_ms, args.render, args.cycles, args.seed)
+        if not runs:
+            print("%8d %5d  no motor runs" % (lag_ms, 0))
+            continue
+        error = max(abs(run - target_ms) for run in runs)
+        print("%8d %5d %10d %10d %10d %8d" % (lag_ms, len(runs), min(runs), max(runs), error, updates))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,41 @@
 import uasyncio as asyncio
-from machine import Pin
+import utime
+from machine import Pin, Timer
 from State.States import States
 from Logging.AppLogger import AppLogger
+import Helpers.DeviceStates as DeviceStates
 import Resources.Settings as Settings
+from .ValvesFeedback import RUNNING, END_OF_TRAVEL, OVERCURRENT
+
+# _run_motor() result when the full operation time ran out
+TIMEOUT = -1
 
 class ValvePort:
 
     _task = None 
+    _direction = 0  # 1 opens, -1 closes
 
-    def __init__(self, device_name: str, pin_id:int, state:States):
+    def __init__(self, device_name: str, pin_id:int, state:States, feedback=None, position=None):
         self.pin = Pin(pin_id, Pin.OUT)
         self.device_name = device_name
         self.state = state
+        self.feedback = feedback  # ValvesFeedback or None for fixed-time runs
+        self.position = position  # ValvePosition shared by both directions, or None
+        self._tracking = False    # The position follows the current motor run
+        self._integrated_ms = 0
+        self._deadline = 0
+        self._exercising = False
+        self._exercise_task = None
         self.operation_time_left: int = 0 
         self.operating_time  = Settings.VALVES_OPERATION_TIME
+        self._run_ms = self.operating_time * 1000  # Length of the current run
+        self._feedback_poll_ms = getattr(Settings, 'VALVES_FEEDBACK_POLL_MS', 20)
+        self._progress_interval_ms = getattr(Settings, 'VALVES_PROGRESS_INTERVAL_MS', 2000)
+        self._started_ms = utime.ticks_ms()  # When the motor was energised
+        self._last_notify_ms = None
+        # One-shot hardware timer that cuts the motor at the deadline, however late the loop runs
+        self._cutoff_timer = Timer()
+        self._cutoff_cb = self._cutoff  # Bound once: the IRQ must not allocate
         self.progress_observers = [] 
         self.logger = AppLogger()
 
@@ -32,15 +54,13 @@ class ValvePort:
                 self.logger.error(f"VALVE: Error canceling task for valve '{self.device_name}': {e}")
         self._task = None
         self.stop_valve()
+        self._end_position()
 
     def clear_task(self):
         self._task = None
 
     def get_progress(self) -> int:
         return self.operation_time_left
-    
-    def step_of_progress(self) -> None:
-        self.operation_time_left -= 1
 
     def reset_progress(self) -> None:
         self.operation_time_left = Settings.VALVES_OPERATION_TIME
@@ -52,20 +72,188 @@ class ValvePort:
             self.logger.info(f"VALVE: Task for work width valve: '{self.device_name}' in stoped")
         
     def stop_valve(self) -> None:
+        self._cutoff_timer.deinit()
         self.pin.low() 
     
     def start_valve(self) -> None:
+        # The run is timed from the first energising (an emergency close starts the motor before its task)
+        if not self.is_active():
+            self._started_ms = utime.ticks_ms()
         self.pin.high() 
 
     def is_active(self) -> bool:
         return self.pin.value() == 1
+
+    def is_running(self) -> bool:
+        """Motor powered or its task started (the anti-seize exercise does not count)"""
+        if self._exercising:
+            return False
+        return self._task is not None or self.is_active()
     
     async def _operating_valve(self, width_progress:bool) -> None:
         raise NotImplementedError("Subclass must implement abstract method set_state")
 
-    def notify_progress_observers(self):
-        progress = self.get_progress()
-        for observer_fn in self.progress_observers:
-            progress_float = (1 - progress / self.operating_time)
-            observer_fn(self.device_name, progress_float)
+    # MARK: Motor run
+    async def _run_motor(self, width_progress: bool) -> int:
+        """Power the motor until the end stop is detected or the operation time ran out.
+
+        Returns END_OF_TRAVEL, OVERCURRENT or TIMEOUT, RUNNING if the task was canceled.
+        Without feedback the full operation time is the normal end (END_OF_TRAVEL).
+        The run ends at a ticks_ms deadline: loop lag delays the wake-ups, not the
+        motor cut, which the hardware timer does on time.
+        """
+        run_ms = self.operating_time * 1000
+        if self.position and not self.feedback:
+            # Fixed-time runs cover only the remaining travel (feedback runs end at the stop anyway)
+            run_ms = self.position.run_ms(self._direction)
+        self._run_ms = run_ms
+        self.start_valve()
+        deadline = utime.ticks_add(self._started_ms, run_ms)
+        self._deadline = deadline
+        left = utime.ticks_diff(deadline, utime.ticks_ms())
+        if self.position:
+            self.position.start(self._direction)
+            self._integrated_ms = self._started_ms
+            self._tracking = True
+        self._cutoff_timer.init(mode=Timer.ONE_SHOT, period=max(left, 1), callback=self._cutoff_cb)
+        if self.feedback:
+            self.feedback.start()
+        self._last_notify_ms = None
+
+        result = TIMEOUT if self.feedback else END_OF_TRAVEL
+        step_ms = self._feedback_poll_ms if self.feedback else self._progress_interval_ms
+        while left > 0:
+            self.operation_time_left = (left + 999) // 1000
+            if width_progress:
+                self._notify_progress(1 - left / run_ms)
+            await asyncio.sleep_ms(min(left, step_ms))
+
+            # If the task is cancelled, we terminate the work gracefully
+            if self._task is None:
+                return RUNNING
+            left = utime.ticks_diff(deadline, utime.ticks_ms())
+            self._track_position()
+            if self.feedback and left > 0:
+                polled = self.feedback.poll()
+                if polled != RUNNING:
+                    result = polled
+                    break
+
+        self.stop_valve()
+        self._end_position(result == END_OF_TRAVEL)
+        self.operation_time_left = 0
+        if width_progress:
+            self.notify_progress_observers(1.0)
+        return result
+
+    def _cutoff(self, timer) -> None:
+        # Hard IRQ: only the pin write
+        self.pin.low()
 
+    # MARK: Exercise
+    def start_exercise(self, run_ms: int, to_stop: bool):
+        """Quiet motor run for the anti-seize exercise, the task to await (see _exercise)"""
+        self._task = asyncio.create_task(self._exercise(run_ms, to_stop))
+        self._exercise_task = self._task
+        return self._task
+
+    async def _exercise(self, run_ms: int, to_stop: bool) -> tuple:
+        """Motor run without state or progress updates.
+
+        run_ms None runs to the end stop like a normal command, to_stop then
+        expects the stop within the run. Returns (result, leave_ms, peak):
+        the _run_motor result, the ms until the limit switch released the
+        starting stop (0 without one) and the peak motor current (0 without).
+        """
+        self._exercising = True
+        try:
+            if run_ms is None:
+                run_ms = self.operating_time * 1000
+                if self.position and not self.feedback:
+                    run_ms = self.position.run_ms(self._direction)
+            self._run_ms = run_ms
+            self.start_valve()
+            deadline = utime.ticks_add(self._started_ms, run_ms)
+            self._deadline = deadline
+            left = utime.ticks_diff(deadline, utime.ticks_ms())
+            self._cutoff_timer.init(mode=Timer.ONE_SHOT, period=max(left, 1), callback=self._cutoff_cb)
+            if self.position:
+                self.position.start(self._direction)
+                self._integrated_ms = self._started_ms
+                self._tracking = True
+            if self.feedback:
+                self.feedback.start()
+
+            result = TIMEOUT if self.feedback and to_stop else END_OF_TRAVEL
+            leave_ms = 0
+            peak = 0
+            while left > 0:
+                await asyncio.sleep_ms(min(left, self._feedback_poll_ms))
+                left = utime.ticks_diff(deadline, utime.ticks_ms())
+                self._track_position()
+                if not self.feedback or left <= 0:
+                    continue
+                level = self.feedback.sample()
+                if self.feedback.mode == "current":
+                    peak = max(peak, level)
+                elif not leave_ms and level:
+                    leave_ms = self.feedback.elapsed_ms()
+                polled = self.feedback.poll()
+                if polled == OVERCURRENT or (to_stop and polled == END_OF_TRAVEL):
+                    result = polled
+                    break
+
+            self.stop_valve()
+            self._end_position(to_stop and result == END_OF_TRAVEL)
+            return result, leave_ms, peak
+        finally:
+            self._exercising = False
+            # A command that canceled the exercise may own the port by now
+            if self._task is self._exercise_task:
+                self._task = None
+
+    # MARK: Position
+    def _track_position(self) -> None:
+        """Add the motor-on time since the last call to the position estimate"""
+        if not self._tracking:
+            return
+        now = utime.ticks_ms()
+        if utime.ticks_diff(now, self._deadline) > 0:
+            now = self._deadline  # The timer cut the motor at the deadline
+        self.position.advance(self._direction, utime.ticks_diff(now, self._integrated_ms))
+        self._integrated_ms = now
+
+    def _end_position(self, at_end_stop: bool = False) -> None:
+        if not self._tracking:
+            return
+        self._track_position()
+        self._tracking = False
+        if at_end_stop:
+            self.position.stop(100 if self._direction > 0 else 0)
+        else:
+            self.position.stop()
+
+    def _notify_progress(self, progress: float) -> None:
+        """Progress to the observers, at most every VALVES_PROGRESS_INTERVAL_MS"""
+        now = utime.ticks_ms()
+        if self._last_notify_ms is not None and utime.ticks_diff(now, self._last_notify_ms) < self._progress_interval_ms:
+            return
+        self._last_notify_ms = now
+        self.notify_progress_observers(progress)
+
+    def _check_result(self, result: int, action: str) -> bool:
+        """Log the end of the motor run, True when the valve reached its end position"""
+        if result == END_OF_TRAVEL:
+            if self.feedback:
+                self.logger.info("VALVE: '%s' reached the end stop after %d ms %s", self.device_name, self.feedback.elapsed_ms(), action)
+            return True
+        if result == OVERCURRENT:
+            self.logger.error("VALVE: '%s' overcurrent while %s (level %d), motor cut", self.device_name, action, self.feedback.level)
+        else:
+            self.logger.error("VALVE: '%s' did not reach the end stop within %d s while %s", self.device_name, self._run_ms // 1000, action)
+        self.state.update_valve_state(self.device_name, DeviceStates.ERROR)
+        return False
+
+    def notify_progress_observers(self, progress: float):
+        for observer_fn in self.progress_observers:
+            observer_fn(self.device_name, progress)
@@ -0,0 +1,97 @@
+import Resources.Settings as Settings
+from Logging.AppLogger import AppLogger
+
+# Motion byte of the position file
+IDLE = 0
+OPENING = 1
+CLOSING = 2
+
+# Position byte of a valve never seen at an end stop
+_UNKNOWN = 255
+
+
+class ValvePosition:
+    """Estimated opening of one valve in percent, from the motor-on time.
+
+    Full travel takes VALVES_OPERATION_TIME. The estimate and the direction
+    of the run in progress are kept in a 2-byte file (position, motion),
+    rewritten when a run starts, every VALVES_POSITION_STEP percent and when
+    it ends: after a power loss mid-travel the file still shows the
+    interrupted run and about where the valve stopped.
+    """
+
+    def __init__(self, device_name: str):
+        self.logger = AppLogger()
+        self.filename = "State/" + device_name + ".pos"
+        self._travel_ms = Settings.VALVES_OPERATION_TIME * 1000
+        self._step = getattr(Settings, 'VALVES_POSITION_STEP', 10)
+        self._margin = getattr(Settings, 'VALVES_POSITION_MARGIN', 20)
+        self.percent = None  # None until the valve reached an end stop once
+        self.motion = IDLE
+        self._saved_step = None
+        self.loaded = self._load()
+
+    # MARK: Public
+    def is_interrupted(self) -> bool:
+        """A run was in progress when the file was last written"""
+        return self.motion != IDLE
+
+    def run_ms(self, direction: int) -> int:
+        """Motor time to the end stop in this direction (1 open, -1 close).
+
+        The remaining travel plus VALVES_POSITION_MARGIN percent, so the
+        estimate errors are absorbed, and the full travel while unknown.
+        """
+        if self.percent is None:
+            return self._travel_ms
+        remaining = 100 - self.percent if direction > 0 else self.percent
+        return min(self._travel_ms, int((remaining + self._margin) * self._travel_ms / 100))
+
+    def get_percent(self):
+        """Whole percent open, None while unknown"""
+        return None if self.percent is None else int(self.percent + 0.5)
+
+    def start(self, direction: int) -> None:
+        self.motion = OPENING if direction > 0 else CLOSING
+        self._save()
+
+    def advance(self, direction: int, ms: int) -> None:
+        if self.percent is None or ms <= 0:
+            return
+        self.percent = min(100.0, max(0.0, self.percent + direction * ms * 100 / self._travel_ms))
+        if int(self.percent // self._step) != self._saved_step:
+            self._save()
+
+    def stop(self, end_percent=None) -> None:
+        """End of a run, at the end stop when end_percent (0 or 100) is given"""
+        if end_percent is not None:
+            self.percent = float(end_percent)
+        self.motion = IDLE
+        self._save()
+
+    def seed(self, percent: float) -> None:
+        """Position taken from elsewhere (the last state) when there was no file yet"""
+        self.percent = float(percent)
+
+    # MARK: Helpers
+    def _load(self) -> bool:
+        try:
+            with open(self.filename, "rb") as f:
+                data = f.read()
+        except OSError:
+            return False
+        if len(data) != 2:
+            return False
+        self.percent = None if data[0] == _UNKNOWN else float(data[0])
+        self.motion = data[1]
+        return True
+
+    def _save(self) -> None:
+        position = _UNKNOWN if self.percent is None else self.get_percent()
+        if self.percent is not None:
+            self._saved_step = int(self.percent // self._step)
+        try:
+            with open(self.filename, "wb") as f:
+                f.write(bytes((position, self.motion)))
+        except OSError as e:
+            self.logger.error("VALVE: Failed to write %s: %s", self.filename, e)
@@ -1,16 +1,67 @@
-# from machine import Pin
-
-# class ValvesFeedback:
-    
-#     def __init__(self, pin_number, error_handler):
-#         self.pin = Pin(pin_number, Pin.IN, Pin.PULL_UP)
-#         self.error_handler = error_handler
-#         self.pin.irq(trigger=Pin.IRQ_FALLING, handler=self._pin_callback)
-    
-#     def _pin_callback(self, pin) -> None:
-#         if self.is_detected_error():
-#             self.error_handler()
-
-#     def is_detected_error(self) -> bool:
-#         return self.pin.value() == 0
+from machine import Pin, ADC
+import time
+import Resources.Settings as Settings
 
+# poll() results
+RUNNING = 0
+END_OF_TRAVEL = 1
+OVERCURRENT = 2
+
+# Consecutive samples at the stop before the end of travel is accepted
+_CONFIRM_SAMPLES = 3
+
+
+class ValvesFeedback:
+    """End-of-travel detection for one valve motor.
+
+    "limit": limit switch on the feedback pin, pulled low at either end stop.
+    "current": motor current on an ADC pin. The stop is reached when the
+    current drops to idle (the actuator's own limit switch opened) or stays
+    at stall level; above VALVES_OVERCURRENT the motor is jammed or shorted.
+    Stop signals are ignored for VALVES_MIN_TRAVEL_MS after the motor starts
+    (inrush current, limit switch still closed at the starting stop).
+    """
+
+    def __init__(self, mode: str, pin_id: int):
+        self.mode = mode
+        self.pin_id = pin_id
+        if mode == "current":
+            self._adc = ADC(pin_id)
+        else:
+            self._pin = Pin(pin_id, Pin.IN, Pin.PULL_UP)
+        self._min_travel_ms = getattr(Settings, 'VALVES_MIN_TRAVEL_MS', 2000)
+        self._idle_level = getattr(Settings, 'VALVES_IDLE_CURRENT', 2000)
+        self._stall_level = getattr(Settings, 'VALVES_STALL_CURRENT', 30000)
+        self._overcurrent_level = getattr(Settings, 'VALVES_OVERCURRENT', 55000)
+        self._started = time.ticks_ms()
+        self._hits = 0
+        self.level = 0  # Last current reading (ADC units)
+
+    def start(self) -> None:
+        self._started = time.ticks_ms()
+        self._hits = 0
+
+    def poll(self) -> int:
+        if time.ticks_diff(time.ticks_ms(), self._started) < self._min_travel_ms:
+            return RUNNING
+
+        if self.mode == "current":
+            self.level = self._adc.read_u16()
+            if self.level >= self._overcurrent_level:
+                return OVERCURRENT
+            at_stop = self.level <= self._idle_level or self.level >= self._stall_level
+        else:
+            at_stop = self._pin.value() == 0
+
+        self._hits = self._hits + 1 if at_stop else 0
+        return END_OF_TRAVEL if self._hits >= _CONFIRM_SAMPLES else RUNNING
+
+    def sample(self) -> int:
+        """Raw reading without the confirmation: motor current, or the limit pin (0 = at a stop)"""
+        if self.mode == "current":
+            self.level = self._adc.read_u16()
+            return self.level
+        return self._pin.value()
+
+    def elapsed_ms(self) -> int:
+        return time.ticks_diff(time.ticks_ms(), self._started)
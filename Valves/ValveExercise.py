@@ -0,0 +1,198 @@
+import uasyncio as asyncio
+import ustruct
+import utime
+import Resources.Settings as Settings
+from Logging.AppLogger import AppLogger
+from Logging.BlackBox import BlackBox, EVENT_INFO
+from Valves.Valve.ValvesFeedback import END_OF_TRAVEL, OVERCURRENT
+
+# Result byte of a history record
+EXERCISE_OK = 0
+EXERCISE_NO_STOP = 1
+EXERCISE_OVERCURRENT = 2
+EXERCISE_ABORTED = 3
+FLAGGED = 0x80  # Set on the result of a run that flagged the valve
+
+RESULT_NAMES = ("ok", "no end stop", "overcurrent", "aborted")
+
+# File layout: magic(4) slots:u8 next:u8 count:u8 pad:u8 last run:u32, then the slots.
+# Slot layout: time:u32 valve:u8 result:u8 leave ms:u16 peak current:u16
+_MAGIC = b"VEX1"
+_HEADER_SIZE = 12
+_SLOT_SIZE = 10
+_SLOTS = 32
+
+# Earlier good runs of a valve its new run is compared with
+_BASELINE_RUNS = 4
+
+
+class ValveExercise:
+    """Periodic anti-seize exercise of the open valves.
+
+    A daily DS3231 alarm at VALVES_EXERCISE_TIME checks whether
+    VALVES_EXERCISE_DAYS have passed since the last exercise. Each open valve
+    is then closed by VALVES_EXERCISE_TRAVEL percent and reopened to its stop,
+    one after the other; not while a leak is active, water flows or a valve
+    moves. Every run is kept in a small ring file. A failed run, or a
+    breakaway time or peak current above VALVES_EXERCISE_DEGRADED percent of
+    the valve's earlier runs, flags the valve before it seizes for good.
+    """
+
+    def __init__(self, valves, leak_sensors=None, flow_meter=None):
+        self.logger = AppLogger()
+        self.valves = valves
+        self.leak_sensors = leak_sensors
+        self.flow_meter = flow_meter
+        self.filename = getattr(Settings, 'VALVES_EXERCISE_FILE', 'valve_exercise.bin')
+        self._interval_s = getattr(Settings, 'VALVES_EXERCISE_DAYS', 7) * 86400
+        self._time = getattr(Settings, 'VALVES_EXERCISE_TIME', (3, 30))
+        self._travel_pct = getattr(Settings, 'VALVES_EXERCISE_TRAVEL', 25)
+        self._degraded_pct = getattr(Settings, 'VALVES_EXERCISE_DEGRADED', 150)
+        self._image = bytearray(_HEADER_SIZE + _SLOTS * _SLOT_SIZE)
+        self._task = None
+        self.degraded = set()  # Names of the valves flagged by their last run
+        self._load()
+
+    # MARK: Public
+    def start(self) -> None:
+        if not self._interval_s:
+            return
+        from RTC.DsRTC import DsRTC
+        DsRTC().set_every_day_alarm(self._time[0], self._time[1], 0, self._on_alarm)
+
+    def run(self, force: bool = False) -> None:
+        """Exercise now if due (or forced), in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(force))
+
+    def get_status(self) -> dict:
+        return {"last": self._last_run(), "degraded": sorted(self.degraded)}
+
+    def get_history(self) -> list:
+        """[time, valve name, result, leave ms, peak, flagged], oldest first"""
+        history = []
+        count = self._image[6]
+        for i in range(count):
+            slot = (self._image[5] - count + i) % _SLOTS
+            t, index, result, leave_ms, peak = ustruct.unpack_from("<IBBHH", self._image, _HEADER_SIZE + slot * _SLOT_SIZE)
+            name = self.valves.valves[index].device_name if index < len(self.valves.valves) else str(index)
+            history.append([t, name, RESULT_NAMES[result & 0x7F], leave_ms, peak, bool(result & FLAGGED)])
+        return history
+
+    # MARK: Helpers
+    def _on_alarm(self) -> None:
+        # Called from the RTC alarm pin IRQ (scheduled), the work runs in a task
+        self.run()
+
+    async def _run(self, force: bool):
+        try:
+            if not force and utime.time() - self._last_run() < self._interval_s:
+                return
+            reason = self._skip_reason()
+            if reason:
+                self.logger.info("VALVES: Exercise skipped, %s", reason)
+                return
+            self.logger.info("VALVES: Exercise started")
+            for index, valve in enumerate(self.valves.valves):
+                if not valve.is_open():
+                    continue  # Only open valves seize in place, a closed one must stay closed
+                reason = self._skip_reason()
+                if reason:
+                    self.logger.info("VALVES: Exercise stopped, %s", reason)
+                    return
+                try:
+                    result, leave_ms, peak = await valve.exercise(self._travel_pct)
+                    result = EXERCISE_OK if result == END_OF_TRAVEL else (EXERCISE_OVERCURRENT if result == OVERCURRENT else EXERCISE_NO_STOP)
+                except asyncio.CancelledError:
+                    result, leave_ms, peak = EXERCISE_ABORTED, 0, 0
+                self._record(index, valve.device_name, result, leave_ms, peak)
+                if result == EXERCISE_ABORTED:
+                    return
+            ustruct.pack_into("<I", self._image, 8, utime.time() & 0xFFFFFFFF)
+            self._save()
+        except Exception as e:
+            self.logger.error("VALVES: Exercise failed: %s", e)
+        finally:
+            self._task = None
+
+    def _skip_reason(self):
+        if self.leak_sensors and self.leak_sensors.is_detected_leaks():
+            return "leak active"
+        if self.flow_meter and self.flow_meter.flow_lpm > 0:
+            return "water in use"
+        for valve in self.valves.valves:
+            if valve.is_in_progress():
+                return "valve moving"
+        return None
+
+    def _record(self, index: int, name: str, result: int, leave_ms: int, peak: int) -> None:
+        degraded = result != EXERCISE_OK and result != EXERCISE_ABORTED
+        if result == EXERCISE_OK:
+            leave_base, peak_base = self._baseline(index)
+            limit = self._degraded_pct / 100
+            degraded = bool((leave_base and leave_ms > leave_base * limit) or (peak_base and peak > peak_base * limit))
+
+        slot = self._image[5]
+        ustruct.pack_into("<IBBHH", self._image, _HEADER_SIZE + slot * _SLOT_SIZE,
+                          utime.time() & 0xFFFFFFFF, index, result | (FLAGGED if degraded else 0),
+                          min(leave_ms, 0xFFFF), min(peak, 0xFFFF))
+        self._image[5] = (slot + 1) % _SLOTS
+        self._image[6] = min(self._image[6] + 1, _SLOTS)
+        self._save()
+
+        self.logger.info("VALVES: '%s' exercise %s, breakaway %d ms, peak current %d", name, RESULT_NAMES[result], leave_ms, peak)
+        if degraded:
+            self.degraded.add(name)
+            self.logger.warning("VALVES: '%s' flagged: exercise %s, breakaway %d ms, peak current %d", name, RESULT_NAMES[result], leave_ms, peak)
+            BlackBox().record(EVENT_INFO, "exercise " + name + " " + RESULT_NAMES[result])
+        elif result == EXERCISE_OK:
+            self.degraded.discard(name)
+
+    def _baseline(self, index: int) -> tuple:
+        """Mean leave ms and peak current of the last good runs of the valve, before the one being added"""
+        leave_total = peak_total = runs = 0
+        count = self._image[6]
+        for i in range(count):
+            slot = (self._image[5] - 1 - i) % _SLOTS
+            _, valve, result, leave_ms, peak = ustruct.unpack_from("<IBBHH", self._image, _HEADER_SIZE + slot * _SLOT_SIZE)
+            if valve == index and result == EXERCISE_OK:
+                leave_total += leave_ms
+                peak_total += peak
+                runs += 1
+                if runs == _BASELINE_RUNS:
+                    break
+        if not runs:
+            return 0, 0
+        return leave_total // runs, peak_total // runs
+
+    def _last_run(self) -> int:
+        return ustruct.unpack_from("<I", self._image, 8)[0]
+
+    def _load(self) -> None:
+        try:
+            with open(self.filename, "rb") as f:
+                image = f.read()
+            if len(image) == len(self._image) and image[0:4] == _MAGIC and image[4] == _SLOTS:
+                self._image[:] = image
+                self._load_flags()
+                return
+            self.logger.warning("VALVES: Unknown exercise history layout, starting over")
+        except OSError:
+            pass
+        self._image[0:4] = _MAGIC
+        self._image[4] = _SLOTS
+
+    def _load_flags(self) -> None:
+        # A valve stays flagged until its next good run
+        last = {}
+        for t, name, result, leave_ms, peak, flagged in self.get_history():
+            if result != RESULT_NAMES[EXERCISE_ABORTED]:
+                last[name] = flagged
+        self.degraded = {name for name, flagged in last.items() if flagged}
+
+    def _save(self) -> None:
+        try:
+            with open(self.filename, "wb") as f:
+                f.write(self._image)
+        except OSError as e:
+            self.logger.error("VALVES: Failed to write %s: %s", self.filename, e)
@@ -0,0 +1,146 @@
+import uasyncio as asyncio
+import time
+import Resources.Settings as Settings
+from Helpers.Singleton import Singleton
+from Logging.AppLogger import AppLogger
+
+# Commands
+OPEN = "open"
+CLOSE = "close"
+
+
+class ValveScheduler(Singleton):
+    """Start queue for every valve motor.
+
+    Each valve has its own queue of pending commands, a single task starts
+    them oldest first with at least VALVES_START_STAGGER_MS between two motor
+    starts, so the inrush currents never add up on the supply. A command
+    equal to the pending one (or to the running motor) is dropped, a command
+    in the other direction replaces the pending one: only the latest intent
+    of rapid button presses reaches the motor. Emergency closes drop what is
+    pending for their valve and go before every queued command.
+    """
+
+    def __init__(self):
+        if hasattr(self, '_queues'):
+            return
+
+        self.logger = AppLogger()
+        self._stagger_ms = getattr(Settings, 'VALVES_START_STAGGER_MS', 200)
+        self._queues = {}   # device name -> [[command, valve, queued at ms], ...]
+        self._urgent = []   # Emergency closes waiting for the stagger gap
+        self._last_start = None
+        self._task = None
+        self.stats = {"queued": 0, "max_queued": 0, "coalesced": 0, "started": 0, "latency_ms": 0, "max_latency_ms": 0}
+
+    # MARK: Public
+    def submit(self, valve, command: str) -> bool:
+        """Queue OPEN or CLOSE for the valve, False when it was coalesced away"""
+        queue = self._queues.setdefault(valve.device_name, [])
+        if queue:
+            if queue[-1][0] == command:
+                return self._coalesced(valve, command)
+            # The opposite command never started: the new one supersedes it
+            queue.pop()
+            self.stats["coalesced"] += 1
+        if not queue and valve.is_running(command):
+            return self._coalesced(valve, command)
+
+        queue.append([command, valve, time.ticks_ms()])
+        self._update_depth()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return True
+
+    def emergency_close(self, valve) -> None:
+        """Close the valve ahead of everything queued, at once if no motor started within the stagger gap"""
+        queue = self._queues.get(valve.device_name)
+        if queue:
+            self.logger.warning("VALVES: Emergency close of '%s' dropped %d queued command(s)", valve.device_name, len(queue))
+            queue.clear()
+        for entry in self._urgent:
+            if entry[1] is valve:
+                self._update_depth()
+                return  # Already waiting for its start
+
+        if self._stagger_left() <= 0:
+            self._start(valve, None, time.ticks_ms())
+        else:
+            self._urgent.append([CLOSE, valve, time.ticks_ms()])
+            if self._task is None:
+                self._task = asyncio.create_task(self._run())
+        self._update_depth()
+
+    def clear(self) -> None:
+        """Drop every pending command"""
+        for queue in self._queues.values():
+            queue.clear()
+        self._urgent.clear()
+        self._update_depth()
+
+    # MARK: Helpers
+    async def _run(self):
+        try:
+            while True:
+                entry = self._next()
+                if entry is None:
+                    break
+                wait_ms = self._stagger_left()
+                if wait_ms > 0:
+                    await asyncio.sleep_ms(wait_ms)
+                    continue  # An emergency may have come in meanwhile
+                urgent = bool(self._urgent) and self._urgent[0] is entry
+                self._remove(entry)
+                self._start(entry[1], None if urgent else entry[0], entry[2])
+        finally:
+            self._task = None
+
+    def _next(self):
+        """Oldest pending entry, emergency closes first"""
+        if self._urgent:
+            return self._urgent[0]
+        oldest = None
+        for queue in self._queues.values():
+            if queue and (oldest is None or time.ticks_diff(queue[0][2], oldest[2]) < 0):
+                oldest = queue[0]
+        return oldest
+
+    def _remove(self, entry) -> None:
+        if self._urgent and self._urgent[0] is entry:
+            self._urgent.pop(0)
+        else:
+            self._queues[entry[1].device_name].remove(entry)
+        self._update_depth()
+
+    def _start(self, valve, command, queued_at: int) -> None:
+        now = time.ticks_ms()
+        self._last_start = now
+        latency = time.ticks_diff(now, queued_at)
+        stats = self.stats
+        stats["started"] += 1
+        stats["latency_ms"] = latency
+        stats["max_latency_ms"] = max(stats["max_latency_ms"], latency)
+        try:
+            if command is None:
+                valve.start_emergency_close()
+            else:
+                valve.start_command(command)
+        except Exception as e:
+            self.logger.error("VALVES: Failed to %s '%s': %s", command or "emergency close", valve.device_name, e)
+
+    def _stagger_left(self) -> int:
+        if self._last_start is None:
+            return 0
+        return self._stagger_ms - time.ticks_diff(time.ticks_ms(), self._last_start)
+
+    def _coalesced(self, valve, command: str) -> bool:
+        self.stats["coalesced"] += 1
+        self.logger.debug("VALVES: '%s' %s coalesced", valve.device_name, command)
+        return False
+
+    def _update_depth(self) -> None:
+        depth = len(self._urgent)
+        for queue in self._queues.values():
+            depth += len(queue)
+        self.stats["queued"] = depth
+        self.stats["max_queued"] = max(self.stats["max_queued"], depth)
@@ -1,16 +1,24 @@
 import Helpers.DeviceStates as DeviceStates
+import Resources.Settings as Settings
 from State.States import States
+from .ValveScheduler import ValveScheduler, OPEN, CLOSE
+from .Valve.ValvesFeedback import END_OF_TRAVEL
 
 class ValvesInterface:
     
     def __init__(self, device_name, open_pin, close_pin, feedback_pin, state: States):
         from .Valve.OpenValve import OpenValve
         from .Valve.CloseValve import CloseValve
+        from .Valve.ValvePosition import ValvePosition
         self.state = state
         self.device_name = device_name
-        self.open_valve = OpenValve(self.device_name, open_pin, state)
-        self.close_valve = CloseValve(self.device_name, close_pin, state)
-        # self.feedback = ValvesFeedback(feedback_pin, self.valves_error_handler)
+        # One end-of-travel sensor and one position estimate serve both directions
+        self.feedback = self._make_feedback(feedback_pin)
+        self.position = ValvePosition(device_name)
+        if not self.position.loaded:
+            self._seed_position()
+        self.open_valve = OpenValve(self.device_name, open_pin, state, self.feedback, self.position)
+        self.close_valve = CloseValve(self.device_name, close_pin, state, self.feedback, self.position)
         self.open_valve.add_progress_observers(self.open_progress)
         self.close_valve.add_progress_observers(self.close_progress)
         
@@ -23,32 +31,95 @@ class ValvesInterface:
     def is_close(self) -> bool:
         return self.state.get_valve_state(self.device_name) == DeviceStates.CLOSED
     
-    def open(self):
-        if self.close_valve.is_active():
-            raise ValueError("VALVES: The current state of the open valve does not allow the task to be completed")
-        self.open_valve.start(width_progress = True)
+    # Commands go through the scheduler: staggered motor starts, repeated presses coalesced
+    def open(self) -> bool:
+        return ValveScheduler().submit(self, OPEN)
 
-    def close(self):
-        if self.open_valve.is_active():
-            raise ValueError("VALVES: The current state of the open valve does not allow the task to be completed")
-        self.close_valve.start(width_progress = True)
+    def close(self) -> bool:
+        return ValveScheduler().submit(self, CLOSE)
 
     def leak_detected(self):
+        ValveScheduler().emergency_close(self)
+
+    def is_running(self, command: str) -> bool:
+        port = self.open_valve if command == OPEN else self.close_valve
+        return port.is_running()
+
+    # MARK: Scheduler callbacks
+    def start_command(self, command: str) -> None:
+        # Reversing: the motor running the other way stops first
+        self.force_stop()
+        if command == OPEN:
+            self.open_valve.start(width_progress = True)
+        else:
+            self.close_valve.start(width_progress = True)
+
+    def start_emergency_close(self) -> None:
         from Logging.AppLogger import AppLogger
         self.force_stop()
         self.close_valve.start(width_progress = False)
+        # Energise the motor now instead of when the task first runs
+        self.close_valve.start_valve()
         self.logger = AppLogger()
         self.logger.debug("VALVES: Activated emergency valve closure")
 
+    def resume_interrupted(self) -> bool:
+        """Close a valve whose run was cut by a reset, over the remaining travel only"""
+        state = self.state.get_valve_state(self.device_name)
+        if self.position.loaded:
+            # The position file is written at every start and stop, the state file is batched
+            interrupted = self.position.is_interrupted()
+        else:
+            interrupted = state == DeviceStates.OPENING or state == DeviceStates.CLOSING
+        if not interrupted:
+            return False
+        from Logging.AppLogger import AppLogger
+        percent = self.position.get_percent()
+        AppLogger().warning("VALVES: '%s' was interrupted while %s (about %s%% open), closing",
+                            self.device_name, state, "?" if percent is None else percent)
+        return self.close()
+
+    async def exercise(self, travel_pct: int) -> tuple:
+        """Anti-seize exercise: close by travel_pct percent, then reopen to the stop.
+
+        Returns (result, leave_ms, peak) of the closing run, result being the
+        first failure of the two runs. Raises CancelledError when a command or
+        an emergency close took over the valve.
+        """
+        run_ms = self.close_valve.operating_time * 10 * travel_pct
+        result, leave_ms, peak = await self.close_valve.start_exercise(run_ms, False)
+        if result != END_OF_TRAVEL:
+            self.close_valve._check_result(result, "exercising")
+            return result, leave_ms, peak
+        result, _, reopen_peak = await self.open_valve.start_exercise(None, True)
+        self.open_valve._check_result(result, "reopening after the exercise")
+        return result, leave_ms, max(peak, reopen_peak)
+
     def force_stop(self):
         self.open_valve.stop()
         self.close_valve.stop()
 
-    # """Returns the reason why stub is being used"""
-    #     self.logger.critical(f"An error was detected when working with the valve  '{self.valve_type}': Overload, short circuit, or overheating. Turn off the valve.")
-    #     self.state.update_valve_state(self.valve_type, ValveState.ERROR)
-    #     self.open_valve.stop()
-    #     self.close_valve.stop()
+    def _seed_position(self) -> None:
+        # No position file yet: a valve last seen at a stop is there
+        state = self.state.get_valve_state(self.device_name)
+        if state == DeviceStates.OPENED:
+            self.position.seed(100)
+        elif state == DeviceStates.CLOSED:
+            self.position.seed(0)
+
+    def _make_feedback(self, feedback_pin):
+        """ValvesFeedback for VALVES_FEEDBACK "limit" or "current", None for fixed-time runs"""
+        mode = getattr(Settings, 'VALVES_FEEDBACK', None)
+        if mode == "limit":
+            pin_id = feedback_pin
+        elif mode == "current":
+            pin_id = getattr(Settings, 'VALVES_CURRENT_PINS', {}).get(self.device_name)
+        else:
+            return None
+        if pin_id is None:
+            return None
+        from .Valve.ValvesFeedback import ValvesFeedback
+        return ValvesFeedback(mode, pin_id)
 
     def open_progress(self, device_name, progress):
         raise NotImplementedError("VALVES: Subclass must implement abstract method open_progress")
@@ -2,16 +2,30 @@ from State.States import States
 from LCD.Display import Display
 from Valves.ColdWaterValve import ColdWaterValve
 from Valves.HotWaterValve import HotWaterValve
+from Valves.ValveScheduler import ValveScheduler
 
 class WaterLineValves:
     def __init__(self, state: States, display = None):
         self.hot_water_valve = HotWaterValve(state, display)
         self.cold_water_valve = ColdWaterValve(state, display)
+        self.valves = (self.hot_water_valve, self.cold_water_valve)
+        # Runs cut by a power loss end in the safe direction
+        for valve in self.valves:
+            valve.resume_interrupted()
 
-    def leak_detected(self):
-        self.hot_water_valve.leak_detected()
-        self.cold_water_valve.leak_detected()
+    def get_valve(self, device_name):
+        for valve in self.valves:
+            if valve.device_name == device_name:
+                return valve
+        return None
+
+    def leak_detected(self, valve_names=None):
+        # Close only the given valves (all of them by default), the scheduler staggers the motor starts
+        for valve in self.valves:
+            if valve_names is None or valve.device_name in valve_names:
+                valve.leak_detected()
 
     def fircse_stop(self):
+        ValveScheduler().clear()
         self.hot_water_valve.force_stop()
         self.cold_water_valve.force_stop()
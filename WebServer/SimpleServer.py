@@ -1,12 +1,18 @@
 import socket
 import json
 import gc
+import time
 import uasyncio as asyncio
 from RTC.DsRTC import DsRTC
+from Logging.BlackBox import BlackBox
 import Resources.Settings as Settings
+from Helpers.LeakZones import get_leak_zones, get_leak_zone_names
+from Helpers.InputScanner import InputScanner
+from Valves.ValveScheduler import ValveScheduler
+from Helpers.TempSensorConfig import get_temp_sensors, get_temp_sensor_names
 
 class SimpleServer:
-    def __init__(self, states, valves, leak_sensors, heater_switch):
+    def __init__(self, states, valves, leak_sensors, heater_switch, flow_meter=None, valve_exercise=None, thermostat=None):
         from Logging.AppLogger import AppLogger
         from Helpers.WiFiManager import WiFiManager
         self.logger = AppLogger()
@@ -14,6 +20,9 @@ class SimpleServer:
         self.valves = valves
         self.leak_sensors = leak_sensors
         self.heater_switch = heater_switch
+        self.flow_meter = flow_meter
+        self.valve_exercise = valve_exercise
+        self.thermostat = thermostat
         
         self.wifi_manager = WiFiManager()
         self.server_socket = None
@@ -75,7 +84,7 @@ class SimpleServer:
                 gc.collect()  # Collect on error
     
     async def handle_client(self, client, addr):
-        self.logger.debug("SERVER: Client from " + str(addr))
+        self.logger.debug("SERVER: Client from %s", addr)
         try:
             # Force garbage collection before handling request
             gc.collect()
@@ -101,6 +110,10 @@ class SimpleServer:
                     await self.handle_root_chunked(client)  # Use chunked response
                 elif path == '/api/status':
                     self.handle_status(client)
+                elif path == '/api/consumption':
+                    self.handle_consumption(client)
+                elif path == '/api/blackbox':
+                    self.handle_black_box(client)
                 elif path == '/api/control' and method == 'POST':
                     self.handle_control(client, params)
                 else:
@@ -145,11 +158,9 @@ class SimpleServer:
             await self._send_valve_card(client, 'cold_water_valve', 'Cold Water Valve')
             gc.collect()
             
-            await self._send_leak_card(client, 'zone_1', 'Leak Sensors (Zone 1)')
-            gc.collect()
-            
-            await self._send_leak_card(client, 'zone_2', 'Leak Sensors (Zone 2)')
-            gc.collect()
+            for zone in get_leak_zones():
+                await self._send_leak_card(client, zone["name"], 'Leak Sensors (' + zone["title"] + ')')
+                gc.collect()
             
             await self._send_heater_card(client)
             gc.collect()
@@ -159,6 +170,9 @@ class SimpleServer:
             
             await self._send_system_info(client)
             gc.collect()
+
+            await self._send_black_box_card(client)
+            gc.collect()
             
             # Send HTML footer
             await self._send_html_footer(client)
@@ -184,6 +198,7 @@ class SimpleServer:
         .card { background: #f0f0f0; padding: 15px; margin: 10px 0; border-radius: 5px; }
         .leak { color: red; font-weight: bold; }
         .no_leak { color: green; }
+        .fault { color: orange; font-weight: bold; }
         .opened, .On { color: green; font-weight: bold; }
         .closed, .Off { color: red; font-weight: bold; }
         button { padding: 5px 10px; margin: 5px; cursor: pointer; }
@@ -264,11 +279,16 @@ class SimpleServer:
         """Send heater card"""
         heater_state = self.states.get_heater_state('heater_power_swith') or "Not installed"
         heater_time = self.states.get_heater_action_time('heater_power_swith')
+        thermostat = ""
+        if self.thermostat:
+            setpoint = self.thermostat.get_setpoint()
+            thermostat = "<p>Thermostat: " + self.thermostat.mode + (", setpoint " + str(setpoint) + "&deg;C" if setpoint is not None else "") + "</p>"
         
         html = """<div class="card">
         <h2>Heater</h2>
         <p>Heater state: <span class=\"""" + heater_state + """\">""" + heater_state + """</span></p>
         <p>State changed: """ + heater_time + """</p>
+        """ + thermostat + """
         <button onclick="fetch('/api/control?action=toggle_heater&device=heater_power_swith', {method: 'POST'}).then(() => location.reload())">Toggle Power</button>
     </div>
 """
@@ -277,35 +297,20 @@ class SimpleServer:
     
     async def _send_temperature_cards(self, client):
         """Send temperature cards"""
-        # Hot water temperature
-        hot_water_temp = self.states.get_temperature('hot_water_temp')
-        temp_hot_time = self.states.get_temperature_action_time('hot_water_temp')
-        
-        hot_display = self._format_temp(hot_water_temp)
-        
-        html = """<div class="card">
-        <h2>Hot Water line Temperature</h2>
-        <p>Current temp: """ + hot_display + """</p>
-        <p>State changed: """ + temp_hot_time + """</p>
-    </div>
-"""
-        client.write(html.encode())
-        await asyncio.sleep_ms(10)
-        
-        # Heater temperature
-        heater_temp = self.states.get_temperature('heater_temp')
-        temp_heater_time = self.states.get_temperature_action_time('heater_temp')
-        
-        heater_display = self._format_temp(heater_temp)
-        
-        html = """<div class="card">
-        <h2>Heater Temperature</h2>
-        <p>Current temp: """ + heater_display + """</p>
-        <p>State changed: """ + temp_heater_time + """</p>
+        for sensor in get_temp_sensors():
+            temp = self.states.get_temperature(sensor["name"])
+            temp_time = self.states.get_temperature_action_time(sensor["name"])
+            
+            temp_display = self._format_temp(temp)
+            
+            html = """<div class="card">
+        <h2>""" + sensor["title"] + """ Temperature</h2>
+        <p>Current temp: """ + temp_display + """</p>
+        <p>State changed: """ + temp_time + """</p>
     </div>
 """
-        client.write(html.encode())
-        await asyncio.sleep_ms(10)
+            client.write(html.encode())
+            await asyncio.sleep_ms(10)
     
     def _format_temp(self, temp):
         """Format temperature for display"""
@@ -331,6 +336,27 @@ class SimpleServer:
         client.write(html.encode())
         await asyncio.sleep_ms(10)
     
+    async def _send_black_box_card(self, client):
+        """Send the events committed before the last reset, if any"""
+        events = BlackBox().previous
+        if not events:
+            return
+
+        client.write("""<div class="card">
+        <h2>Before last reset</h2>
+        <pre>""".encode())
+        for timestamp, kind, text in events:
+            line = self._format_event_time(timestamp) + " " + kind + " " + text + "\n"
+            client.write(line.replace("&", "&amp;").replace("<", "&lt;").encode())
+        client.write("""</pre>
+    </div>
+""".encode())
+        await asyncio.sleep_ms(10)
+
+    def _format_event_time(self, timestamp):
+        dt = time.localtime(timestamp + Settings.TIME_ZONE_OFFSET * 60 * 60)
+        return "{:02d}.{:02d} {:02d}:{:02d}:{:02d}".format(dt[2], dt[1], dt[3], dt[4], dt[5])
+
     async def _send_html_footer(self, client):
         """Send HTML footer"""
         html = """<div class="footer">
@@ -348,6 +374,10 @@ class SimpleServer:
     async def _reboot_device(self):
         self.logger.info("SERVER: Rebooting device by user request")
         await asyncio.sleep(1)
+        if self.flow_meter:
+            self.flow_meter.consumption.save()
+        self.logger.flush()
+        BlackBox().commit("web reboot")
         import machine
         machine.reset()
         
@@ -362,21 +392,54 @@ class SimpleServer:
                 "hot": self.states.get_valve_state('hot_water_valve'),
                 "cold": self.states.get_valve_state('cold_water_valve')
             },
-            "leak": {
-                "z1": self.states.get_leak_sensor_state('zone_1'),
-                "z2": self.states.get_leak_sensor_state('zone_2')
-            },
+            "leak": {name: self.states.get_leak_sensor_state(name) for name in get_leak_zone_names()},
             "heater": self.states.get_heater_state('heater_power_swith'),
-            "temp": {
-                "hot": str(self.states.get_temperature('hot_water_temp')),
-                "heater": str(self.states.get_temperature('heater_temp'))
+            "temp": {name: str(self.states.get_temperature(name)) for name in get_temp_sensor_names()},
+            "inputs": InputScanner().stats,
+            "valve_position": {
+                "hot": self.valves.hot_water_valve.position.get_percent(),
+                "cold": self.valves.cold_water_valve.position.get_percent()
             },
+            "valve_queue": ValveScheduler().stats,
             "mem_free": gc.mem_free()
         }
+        if self.valve_exercise:
+            status["exercise"] = self.valve_exercise.get_status()
+        if self.thermostat:
+            status["thermostat"] = self.thermostat.get_status()
+        if self.flow_meter:
+            status["flow"] = {
+                "lpm": round(self.flow_meter.flow_lpm, 2),
+                "liters": round(self.flow_meter.get_total_liters(), 1)
+            }
         
         response = json.dumps(status)
         self.send_response(client, 200, "OK", response, "application/json")
         
+    def handle_consumption(self, client):
+        """Water consumption per hour, day and month in liters"""
+        gc.collect()
+        if not self.flow_meter:
+            self.send_response(client, 404, "Not Found", json.dumps({"error": "No flow meter"}), "application/json")
+            return
+        consumption = self.flow_meter.consumption
+        data = {
+            "today": round(consumption.get_liters("day"), 1),
+            "month": round(consumption.get_liters("month"), 1),
+            "history": consumption.get_history()
+        }
+        self.send_response(client, 200, "OK", json.dumps(data), "application/json")
+        
+    def handle_black_box(self, client):
+        """Black box events: committed before the last reset and recorded so far"""
+        gc.collect()
+        black_box = BlackBox()
+        result = {
+            "previous": [[self._format_event_time(t), k, m] for t, k, m in black_box.previous],
+            "current": [[self._format_event_time(t), k, m] for t, k, m in black_box.get_events()]
+        }
+        self.send_response(client, 200, "OK", json.dumps(result), "application/json")
+
     def handle_control(self, client, params):
         gc.collect()
         
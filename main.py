@@ -1,6 +1,7 @@
 import gc
 import uasyncio as asyncio
 from Logging.AppLogger import AppLogger
+from Logging.BlackBox import BlackBox, EVENT_HEAP, EVENT_TASK
 import WebServer.SimpleServer as WebServer
 import sys
 import time
@@ -10,6 +11,8 @@ class Main:
     def __init__(self):
         self.logger = AppLogger()
         self.logger.info("Main: Initializing core components...")
+        self.black_box = BlackBox()
+        self._report_black_box()
     
         self._initializeBase()
         self._initializeOther()
@@ -105,6 +108,41 @@ class Main:
         except Exception as e:
             self.logger.error(f"Main: Failed to initialize Leak Sensors: {e}")
             self._handle_initialization_error("Leak Err", "Check Sensors!")    
+
+        self.heater_thermostat = None
+        try:
+            # Heater thermostat (optional)
+            import Resources.Settings as Settings
+            if getattr(Settings, 'HEATER_THERMOSTAT', False) and hasattr(self, 'heater_swith'):
+                from Heater.HeaterThermostat import HeaterThermostat
+                self.heater_thermostat = HeaterThermostat(self.states, self.heater_swith, getattr(self, 'leak_sensors', None))
+                gc.collect()
+        except Exception as e:
+            self.logger.error("Main: Failed to initialize Heater Thermostat: %s", e)
+            self._handle_initialization_error("Err Thermostat", "Check!")
+
+        self.flow_meter = None
+        try:
+            # Flow meter (optional)
+            import Resources.Settings as Settings
+            if getattr(Settings, 'FLOW_METER_PIN', None) is not None:
+                self._update_init_status("Init flow meter...")
+                from Sensors.FlowMeter import FlowMeter
+                self.flow_meter = FlowMeter(getattr(self, 'leak_sensors', None))
+                gc.collect()
+        except Exception as e:
+            self.logger.error("Main: Failed to initialize Flow Meter: %s", e)
+            self._handle_initialization_error("Flow Err", "Check Flow meter!")
+
+        self.valve_exercise = None
+        try:
+            # Valve anti-seize exercise
+            if hasattr(self, 'water_line_valves'):
+                from Valves.ValveExercise import ValveExercise
+                self.valve_exercise = ValveExercise(self.water_line_valves, getattr(self, 'leak_sensors', None), self.flow_meter)
+                gc.collect()
+        except Exception as e:
+            self.logger.error("Main: Failed to initialize Valve Exercise: %s", e)
     
         try:
              # Valve control buttons
@@ -130,6 +168,14 @@ class Main:
         self._web_server_initialized = False
         self._update_init_status("Init completed!")
 
+    def _report_black_box(self):
+        """Log the events committed by the previous session before its reset"""
+        if not self.black_box.previous:
+            return
+        self.logger.warning("Main: Black box of the previous session (%d events):", len(self.black_box.previous))
+        for timestamp, kind, text in self.black_box.previous:
+            self.logger.warning("BLACKBOX: %s %s %s", timestamp, kind, text)
+
     def _update_init_status(self, status: str):
         """Update initialization status on display if available"""
         if hasattr(self, 'display') and self.display:
@@ -162,6 +208,15 @@ class Main:
             self.leak_sensors.start()
             # Give leak sensors time to stabilize and handle startup leaks
             await asyncio.sleep(3)
+
+        if self.flow_meter:
+            self.flow_meter.start()
+
+        if self.valve_exercise:
+            try:
+                self.valve_exercise.start()
+            except Exception as e:
+                self.logger.error("Main: Failed to schedule the valve exercise: %s", e)
         
         # Launch temperature sensors if initialized
         if hasattr(self, 'temp_sensors') and self.temp_sensors:
@@ -169,6 +224,10 @@ class Main:
             self.logger.info("Main: Starting temperature sensors...")
             self.temp_sensors.start()
             await asyncio.sleep(1)
+
+        # The thermostat works on the readings of the temperature sensors
+        if self.heater_thermostat:
+            self.heater_thermostat.start()
             
         # Launch the valve control buttons if initialized
         if hasattr(self, 'valve_buttons'):
@@ -192,7 +251,10 @@ class Main:
                         states=self.states,
                         valves=self.water_line_valves,
                         leak_sensors=self.leak_sensors,
-                        heater_switch=self.heater_swith
+                        heater_switch=self.heater_swith,
+                        flow_meter=self.flow_meter,
+                        valve_exercise=self.valve_exercise,
+                        thermostat=self.heater_thermostat
                     )
                     
                     gc.collect()
@@ -264,10 +326,14 @@ class Main:
             self.buzzers.control.off()
         if hasattr(self, 'leak_sensors'):
             self.leak_sensors.stop()
+        if getattr(self, 'flow_meter', None):
+            self.flow_meter.stop()
         if hasattr(self, 'valve_buttons'):
             self.valve_buttons.stop()
         if hasattr(self, 'heater_button'):
             self.heater_button.stop()
+        if getattr(self, 'heater_thermostat', None):
+            self.heater_thermostat.stop()
         if hasattr(self, 'water_line_valves'):
             self.water_line_valves.fircse_stop()
         
@@ -275,11 +341,15 @@ class Main:
             self.display.lcd.set_brightness(15)
         
         self.logger.warning(f"Main: Leak controller stopped. Date: {self.ds_rtc.get_datetime_ddmmyy()}")
+        self.logger.flush()
 
     async def run(self):
         await self.startOperating()
         self.logger.info(f"Leak controller Started. Date: {self.ds_rtc.get_datetime_ddmmyy()}")
         
+        # Uncaught exceptions in tasks end up in the black box
+        asyncio.get_event_loop().set_exception_handler(self._handle_task_exception)
+
         # Create tasks with error handling
         tasks = []
         
@@ -310,6 +380,7 @@ class Main:
                 await self._main_loop()
             except Exception as e:
                 self.logger.error(f"Main loop crashed: {e}, restarting in 5 seconds...")
+                self.black_box.record(EVENT_TASK, "main loop restart: " + str(e))
                 if hasattr(self, 'buzzers'):
                     self.buzzers.control.play_error()
                 await asyncio.sleep(5)
@@ -321,8 +392,15 @@ class Main:
                 await self._web_server.run() # type: ignore
             except Exception as e:
                 self.logger.error(f"Web server crashed: {e}, restarting in 10 seconds...")
+                self.black_box.record(EVENT_TASK, "web server restart: " + str(e))
                 await asyncio.sleep(10)
 
+    def _handle_task_exception(self, loop, context):
+        e = context.get("exception")
+        self.logger.error("Main: Uncaught task exception: %s", e)
+        self.black_box.record_exception("task", e)
+        self.black_box.commit()
+
     async def _wifi_monitor(self):
         """WiFi connection monitoring with auto-reconnection"""
         while True:
@@ -365,6 +443,7 @@ class Main:
                 # Critical memory - more aggressive collection
                 if free_mem < 10000:  # Less than 10KB
                     self.logger.warning("Critical memory, aggressive GC")
+                    self.black_box.record(EVENT_HEAP, "critical " + str(free_mem))
                     # Multiple collection passes can help
                     for _ in range(3):
                         gc.collect()
@@ -378,8 +457,12 @@ class Main:
                         await self.states.force_write()
                     except:
                         pass
+                    if self.flow_meter:
+                        self.flow_meter.consumption.save()
                     
                     await asyncio.sleep(2)
+                    self.logger.flush()
+                    self.black_box.commit("memory watchdog")
                     machine.reset()
                     
                 # Regular check interval
@@ -424,6 +507,7 @@ if __name__ == "__main__":
             asyncio.run(main.cleanup())
     except MemoryError:
         print("Memory error, attempting cleanup and rebooting...")
+        BlackBox().commit("MemoryError")
         if main:
             try:
                 asyncio.run(main.cleanup())
@@ -432,6 +516,8 @@ if __name__ == "__main__":
         machine.reset()
     except Exception as e:
         print(f"Fatal error: {e}")
+        BlackBox().record_exception("fatal", e)
+        BlackBox().commit("fatal error")
         if main:
             try:
                 asyncio.run(main.cleanup())